@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the component-extraction hot path.
+
+Run a suite and save the results::
+
+    python benchmarks/bench_core.py --size 100000 --output before.json
+
+Compare two saved runs, exiting non-zero on throughput regressions::
+
+    python benchmarks/bench_core.py --compare before.json after.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_corpus  # noqa: E402
+from particular_purl_parse import __version__, ps_component_from_purl, ps_components_from_purls  # noqa: E402
+from particular_purl_parse.columnar import ps_component_columns_from_purls  # noqa: E402
+from particular_purl_parse.index import ps_component_index_from_purls  # noqa: E402
+from particular_purl_parse.status import ps_component_batch_from_purls, ps_purl_statuses  # noqa: E402
+
+
+DEFAULT_SIZE = 50000
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.10
+
+
+def _run_single(corpus: Sequence[str]) -> None:
+    resolve = ps_component_from_purl
+    for purl in corpus:
+        try:
+            resolve(purl)
+        except ValueError:
+            pass
+
+
+def _run_batch(corpus: Sequence[str]) -> None:
+    ps_components_from_purls(corpus, errors="return")
+
+
+def _run_columnar(corpus: Sequence[str]) -> None:
+    ps_component_columns_from_purls(corpus)
+
+
+def _run_index(corpus: Sequence[str]) -> None:
+    ps_component_index_from_purls(corpus, errors="skip")
+
+
+def _run_collect(corpus: Sequence[str]) -> None:
+    ps_component_batch_from_purls(corpus)
+
+
+def _run_status(corpus: Sequence[str]) -> None:
+    ps_purl_statuses(corpus)
+
+
+# Benchmarks run over the whole corpus; names are stable keys in the results
+BENCHMARKS: Dict[str, Callable[[Sequence[str]], None]] = {
+    "single": _run_single,
+    "batch": _run_batch,
+    "columnar": _run_columnar,
+    "index": _run_index,
+    "status": _run_status,
+    "collect": _run_collect,
+    "status_oci": _run_status,
+}
+
+# Corpus mixes of benchmarks that do not run over the default corpus;
+# status_oci covers the inline handling of the built-in oci rule in status
+CORPUS_MIXES: Dict[str, Dict[str, float]] = {
+    "status_oci": {"oci": 0.5, "oci_invalid": 0.5},
+}
+
+
+def _percentile(sorted_values: List[int], fraction: float) -> int:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure_latency(corpus: Sequence[str]) -> Dict[str, int]:
+    """Time each single call and return latency percentiles in nanoseconds."""
+    resolve = ps_component_from_purl
+    clock = time.perf_counter_ns
+    samples = []
+    append = samples.append
+    for purl in corpus:
+        start = clock()
+        try:
+            resolve(purl)
+        except ValueError:
+            pass
+        append(clock() - start)
+    samples.sort()
+    return {
+        "p50": _percentile(samples, 0.50),
+        "p90": _percentile(samples, 0.90),
+        "p99": _percentile(samples, 0.99),
+        "max": samples[-1],
+    }
+
+
+def measure_peak_memory(func: Callable[[Sequence[str]], None], corpus: Sequence[str]) -> int:
+    """Return the peak traced allocation size in bytes while running func."""
+    tracemalloc.start()
+    try:
+        func(corpus)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(func: Callable[[Sequence[str]], None], corpus: Sequence[str], repeat: int) -> Dict[str, Any]:
+    """Run one benchmark and return throughput and memory figures."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(corpus)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {
+        "best_seconds": best,
+        "mean_seconds": sum(timings) / len(timings),
+        "throughput_per_second": len(corpus) / best if best else float("inf"),
+        "peak_memory_bytes": measure_peak_memory(func, corpus),
+    }
+
+
+def run_suite(size: int, seed: int, repeat: int, names: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Run the selected benchmarks over a generated corpus.
+
+    Args:
+        size: Number of PURLs in the corpus
+        seed: Corpus random seed
+        repeat: Timed runs per benchmark; the best run is reported
+        names: Benchmarks to run, defaulting to all of ``BENCHMARKS``
+
+    Returns:
+        JSON-serializable results document
+    """
+    import packageurl
+
+    corpus = generate_corpus(size, seed=seed)
+    results: Dict[str, Any] = {}
+    for name in names or list(BENCHMARKS):
+        mix = CORPUS_MIXES.get(name)
+        bench_corpus = corpus if mix is None else generate_corpus(size, seed=seed, mix=mix)
+        results[name] = run_benchmark(BENCHMARKS[name], bench_corpus, repeat)
+    if "single" in results:
+        results["single"]["latency_ns"] = measure_latency(corpus)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "particular_purl_parse": __version__,
+            "packageurl": getattr(packageurl, "__version__", "unknown"),
+            "size": size,
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "benchmarks": results,
+    }
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any], threshold: float) -> List[str]:
+    """Compare two results documents.
+
+    Args:
+        base: Baseline results
+        new: Results to check
+        threshold: Allowed relative throughput drop, e.g. 0.10 for 10%
+
+    Returns:
+        Report lines; lines for regressions start with ``REGRESSION``
+    """
+    lines = []
+    for name, new_result in new["benchmarks"].items():
+        base_result = base["benchmarks"].get(name)
+        if base_result is None:
+            lines.append(f"{name}: no baseline")
+            continue
+        ratio = new_result["throughput_per_second"] / base_result["throughput_per_second"]
+        memory_ratio = new_result["peak_memory_bytes"] / max(base_result["peak_memory_bytes"], 1)
+        status = "REGRESSION" if ratio < 1 - threshold else "ok"
+        lines.append(
+            f"{status} {name}: {base_result['throughput_per_second']:,.0f}/s -> "
+            f"{new_result['throughput_per_second']:,.0f}/s ({ratio:.2f}x), "
+            f"peak memory {memory_ratio:.2f}x"
+        )
+    return lines
+
+
+def _format_results(results: Dict[str, Any]) -> List[str]:
+    lines = []
+    for name, result in results["benchmarks"].items():
+        line = (
+            f"{name:>10}: {result['throughput_per_second']:>12,.0f} PURLs/s, "
+            f"peak {result['peak_memory_bytes'] / 1024:,.0f} KiB"
+        )
+        latency = result.get("latency_ns")
+        if latency:
+            line += f", p50 {latency['p50']:,} ns, p99 {latency['p99']:,} ns"
+        lines.append(line)
+    return lines
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="corpus size")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per benchmark")
+    parser.add_argument("--benchmark", action="append", choices=sorted(BENCHMARKS), help="benchmark to run (repeatable)")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two JSON result files")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed throughput drop for --compare")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as f:
+            base = json.load(f)
+        with open(args.compare[1], encoding="utf-8") as f:
+            new = json.load(f)
+        lines = compare(base, new, args.threshold)
+        print("\n".join(lines))
+        return 1 if any(line.startswith("REGRESSION") for line in lines) else 0
+
+    results = run_suite(args.size, args.seed, args.repeat, args.benchmark)
+    print("\n".join(_format_results(results)))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for batch resolution of duplicate-heavy corpora.
+
+The corpus repeats a set of unique PURLs in equivalent spellings (qualifier
+order, type case, percent-encoding, empty qualifiers). Resolvers compared:
+
+- ``plain``: every input is parsed
+- ``exact``: memoized on the exact PURL string
+- ``canonical``: deduplicated on ``canonical_purl_key`` (``dedupe=True``)
+
+::
+
+    python benchmarks/bench_dedupe.py --size 200000 --unique 5000
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_respelled_corpus  # noqa: E402
+from particular_purl_parse import ComponentCache, ps_components_from_purls  # noqa: E402
+from particular_purl_parse.canonical import canonical_purl_key  # noqa: E402
+
+
+DEFAULT_SIZE = 100000
+DEFAULT_UNIQUE = 5000
+DEFAULT_REPEAT = 3
+
+
+def _run_plain(corpus: Sequence[str]) -> List[Any]:
+    return ps_components_from_purls(corpus, errors="return")
+
+
+def _run_exact(corpus: Sequence[str]) -> List[Any]:
+    return ps_components_from_purls(corpus, errors="return", resolver=ComponentCache(maxsize=None))
+
+
+def _run_canonical(corpus: Sequence[str]) -> List[Any]:
+    return ps_components_from_purls(corpus, errors="return", dedupe=True)
+
+
+# Resolvers compared; names are stable keys in the results
+RESOLVERS: Dict[str, Callable[[Sequence[str]], List[Any]]] = {
+    "plain": _run_plain,
+    "exact": _run_exact,
+    "canonical": _run_canonical,
+}
+
+
+def run_suite(size: int, unique: int, seed: int, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """Run every resolver over a generated duplicate-heavy corpus.
+
+    Args:
+        size: Number of PURLs in the corpus
+        unique: Number of distinct underlying PURLs
+        seed: Corpus random seed
+        repeat: Timed runs per resolver; the best run is reported
+
+    Returns:
+        JSON-serializable results document
+    """
+    corpus = generate_respelled_corpus(size, unique, seed=seed)
+    results: Dict[str, Any] = {}
+    for name, run in RESOLVERS.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(corpus)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        results[name] = {
+            "best_seconds": best,
+            "throughput_per_second": size / best if best else float("inf"),
+        }
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "size": size,
+            "unique": unique,
+            "distinct_strings": len(set(corpus)),
+            "distinct_keys": len(set(map(canonical_purl_key, corpus))),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "resolvers": results,
+    }
+
+
+def _format_results(results: Dict[str, Any]) -> List[str]:
+    meta = results["meta"]
+    lines = [
+        f"{meta['size']:,} PURLs, {meta['distinct_strings']:,} distinct strings, "
+        f"{meta['distinct_keys']:,} distinct canonical keys"
+    ]
+    base = results["resolvers"]["plain"]["throughput_per_second"]
+    for name, result in results["resolvers"].items():
+        throughput = result["throughput_per_second"]
+        lines.append(f"{name:>9}: {throughput:>12,.0f} PURLs/s ({throughput / base:.2f}x)")
+    return lines
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="number of PURLs in the corpus")
+    parser.add_argument("--unique", type=int, default=DEFAULT_UNIQUE, help="number of distinct underlying PURLs")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per resolver")
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.size, args.unique, args.seed, args.repeat)
+    print("\n".join(_format_results(results)))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for reading newline-delimited PURL files: line by line vs mmap.
+
+Each reader runs in a fresh subprocess so that its peak RSS is measured in
+isolation::
+
+    python benchmarks/bench_input.py --size 1000000
+    python benchmarks/bench_input.py --size 1000000 --resolve --output input.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_corpus  # noqa: E402
+
+
+DEFAULT_SIZE = 200000
+BATCH_SIZE = 1024
+
+READERS = ("lines", "mmap")
+
+
+def write_corpus(path: str, size: int, seed: int) -> None:
+    """Write a generated corpus to path, one PURL per line."""
+    with open(path, "w", encoding="utf-8") as f:
+        for purl in generate_corpus(size, seed=seed):
+            f.write(purl)
+            f.write("\n")
+
+
+def _open_reader(reader: str, path: str) -> Iterator[str]:
+    from particular_purl_parse.cli import _iter_input_purls
+
+    return _iter_input_purls([path], use_mmap=reader == "mmap")
+
+
+def _max_rss_kib() -> Optional[int]:
+    # VmHWM starts afresh at exec; ru_maxrss would include the parent's peak
+    # inherited through fork
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def run_reader(reader: str, path: str, resolve: bool) -> Dict[str, Any]:
+    """Read (and optionally resolve) a file in this process and report figures."""
+    from particular_purl_parse import ps_components_from_purls
+
+    baseline_rss = _max_rss_kib()
+    start = time.perf_counter()
+    purls = _open_reader(reader, path)
+    count = 0
+    while True:
+        batch = list(islice(purls, BATCH_SIZE))
+        if not batch:
+            break
+        count += len(batch)
+        if resolve:
+            ps_components_from_purls(batch, errors="return")
+    seconds = time.perf_counter() - start
+    return {
+        "count": count,
+        "seconds": seconds,
+        "throughput_per_second": count / seconds if seconds else float("inf"),
+        "baseline_rss_kib": baseline_rss,
+        "max_rss_kib": _max_rss_kib(),
+    }
+
+
+def run_suite(size: int, seed: int, resolve: bool, directory: Optional[str] = None) -> Dict[str, Any]:
+    """Write a corpus file and run every reader over it in a subprocess.
+
+    Args:
+        size: Number of PURLs in the file
+        seed: Corpus random seed
+        resolve: Also resolve the PURLs, in batches of BATCH_SIZE
+        directory: Where to write the corpus file, defaulting to a temp dir
+
+    Returns:
+        JSON-serializable results document
+    """
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        path = os.path.join(tmp, "purls.txt")
+        write_corpus(path, size, seed)
+        file_size = os.path.getsize(path)
+        results = {}
+        for reader in READERS:
+            command = [sys.executable, os.path.abspath(__file__), "--worker", reader, path]
+            if resolve:
+                command.append("--resolve")
+            output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+            results[reader] = json.loads(output)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "size": size,
+            "seed": seed,
+            "file_bytes": file_size,
+            "resolve": resolve,
+        },
+        "readers": results,
+    }
+
+
+def _format_results(results: Dict[str, Any]) -> List[str]:
+    lines = []
+    for reader, result in results["readers"].items():
+        line = f"{reader:>6}: {result['throughput_per_second']:>12,.0f} PURLs/s"
+        if result["max_rss_kib"] is not None:
+            line += f", max RSS {result['max_rss_kib'] / 1024:,.1f} MiB"
+            line += f" (+{(result['max_rss_kib'] - result['baseline_rss_kib']) / 1024:,.1f} MiB while reading)"
+        lines.append(line)
+    return lines
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="number of PURLs in the file")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--resolve", action="store_true", help="also resolve the PURLs")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--worker", nargs=2, metavar=("READER", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_reader(args.worker[0], args.worker[1], args.resolve)))
+        return 0
+
+    results = run_suite(args.size, args.seed, args.resolve)
+    print("\n".join(_format_results(results)))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for resolving from many threads sharing one resolver.
+
+Every thread resolves its own copy of the corpus through the shared
+resolver, so aggregate throughput shows how lookups scale with the thread
+count. Scaling beyond one thread needs free-threaded CPython; with the GIL
+the figures show the cost of locking instead::
+
+    python benchmarks/bench_threads.py --size 50000 --threads 1 2 4 8
+    python benchmarks/bench_threads.py --output threads.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import generate_corpus  # noqa: E402
+from particular_purl_parse import ps_component_from_purl  # noqa: E402
+from particular_purl_parse.cache import ComponentCache, SharedComponentCache  # noqa: E402
+
+
+DEFAULT_SIZE = 20000
+DEFAULT_THREADS = (1, 2, 4, 8)
+DEFAULT_REPEAT = 3
+
+
+def _locked_cache() -> Callable[[str], str]:
+    # The non-thread-safe cache behind a single global lock, for comparison
+    cache = ComponentCache(maxsize=None)
+    lock = threading.Lock()
+
+    def resolve(purl: str) -> str:
+        with lock:
+            return cache.resolve(purl)
+
+    return resolve
+
+
+# Factories for a fresh resolver shared by all threads of one run
+RESOLVERS: Dict[str, Callable[[], Callable[[str], str]]] = {
+    "uncached": lambda: ps_component_from_purl,
+    "locked": _locked_cache,
+    "shared": lambda: SharedComponentCache(maxsize=None).resolve,
+}
+
+
+def _worker(resolve: Callable[[str], str], corpus: Sequence[str], barrier: threading.Barrier) -> None:
+    barrier.wait()
+    for purl in corpus:
+        try:
+            resolve(purl)
+        except ValueError:
+            pass
+
+
+def run_threads(factory: Callable[[], Callable[[str], str]], corpus: Sequence[str], threads: int) -> float:
+    """Resolve the corpus once per thread through one shared resolver.
+
+    The resolver is warmed with one untimed pass first, so cached resolvers
+    are measured on hits whatever the thread count.
+
+    Returns:
+        Wall-clock seconds from releasing the threads until all are done
+    """
+    resolve = factory()
+    _worker(resolve, corpus, threading.Barrier(1))
+    # The main thread joins the barrier too, so the clock starts once every
+    # worker is ready
+    barrier = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=_worker, args=(resolve, corpus, barrier)) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def run_suite(
+    size: int,
+    seed: int,
+    threads: Sequence[int] = DEFAULT_THREADS,
+    repeat: int = DEFAULT_REPEAT,
+    names: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    """Run each resolver over the corpus at each thread count.
+
+    Args:
+        size: Number of PURLs in the corpus
+        seed: Corpus random seed
+        threads: Thread counts to run
+        repeat: Timed runs per configuration; the best run is reported
+        names: Resolvers to run, defaulting to all of ``RESOLVERS``
+
+    Returns:
+        JSON-serializable results document
+    """
+    corpus = generate_corpus(size, seed=seed)
+    results: Dict[str, Any] = {}
+    for name in names or list(RESOLVERS):
+        runs = {}
+        for count in threads:
+            best = min(run_threads(RESOLVERS[name], corpus, count) for _ in range(repeat))
+            runs[str(count)] = {
+                "best_seconds": best,
+                "throughput_per_second": count * len(corpus) / best if best else float("inf"),
+            }
+        base = runs[str(threads[0])]["throughput_per_second"]
+        for run in runs.values():
+            run["speedup"] = run["throughput_per_second"] / base if base else 0.0
+        results[name] = runs
+
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "gil_enabled": gil_enabled,
+            "size": size,
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "resolvers": results,
+    }
+
+
+def _format_results(results: Dict[str, Any]) -> List[str]:
+    lines = []
+    for name, runs in results["resolvers"].items():
+        for count, run in runs.items():
+            lines.append(
+                f"{name:>8} x{count:>3}: {run['throughput_per_second']:>12,.0f} PURLs/s"
+                f" ({run['speedup']:.2f}x)"
+            )
+    return lines
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="number of PURLs in the corpus")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per configuration")
+    parser.add_argument("--threads", type=int, nargs="+", default=list(DEFAULT_THREADS), help="thread counts to run")
+    parser.add_argument("--resolver", action="append", choices=sorted(RESOLVERS), help="resolver to run (repeatable)")
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.size, args.seed, args.threads, args.repeat, args.resolver)
+    print(f"GIL enabled: {results['meta']['gil_enabled']}")
+    print("\n".join(_format_results(results)))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
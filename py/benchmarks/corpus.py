@@ -0,0 +1,153 @@
+"""
+Synthetic PURL corpora for benchmarks.
+"""
+
+import random
+from typing import Callable, Dict, List, Optional
+
+
+# Share of each PURL category in a generated corpus
+DEFAULT_MIX = {
+    "oci": 0.25,
+    "rpm_rpmmod": 0.20,
+    "rpm": 0.15,
+    "npm": 0.10,
+    "pypi": 0.10,
+    "maven": 0.10,
+    "malformed": 0.10,
+}
+
+_NAMES = [
+    "nginx", "httpd", "python", "openssl", "glibc", "redis", "postgresql", "curl",
+    "libxml2", "zlib", "systemd", "kernel", "bash", "perl", "nodejs", "golang",
+]
+_REGISTRIES = ["registry.redhat.io", "quay.io", "docker.io", "registry.example.com"]
+_NAMESPACES = ["rhel9", "ubi8", "library", "openshift4", "ansible-automation-platform"]
+_ARCHES = ["x86_64", "aarch64", "s390x", "ppc64le", "noarch"]
+
+
+def _version(rng: random.Random) -> str:
+    return f"{rng.randint(0, 9)}.{rng.randint(0, 30)}.{rng.randint(0, 99)}-{rng.randint(1, 20)}.el9"
+
+
+def _oci(rng: random.Random) -> str:
+    name = rng.choice(_NAMES)
+    digest = "".join(rng.choice("0123456789abcdef") for _ in range(16))
+    return (
+        f"pkg:oci/{name}@sha256%3A{digest}?arch={rng.choice(_ARCHES)}"
+        f"&repository_url={rng.choice(_REGISTRIES)}/{rng.choice(_NAMESPACES)}/{name}"
+        f"&tag={_version(rng)}"
+    )
+
+
+def _rpm_rpmmod(rng: random.Random) -> str:
+    name = rng.choice(_NAMES)
+    return (
+        f"pkg:rpm/redhat/{name}@{_version(rng)}?arch={rng.choice(_ARCHES)}"
+        f"&rpmmod={name}:{rng.randint(1, 3)}:8{rng.randint(0, 9)}0020210101"
+    )
+
+
+def _rpm(rng: random.Random) -> str:
+    return f"pkg:rpm/redhat/{rng.choice(_NAMES)}@{_version(rng)}?arch={rng.choice(_ARCHES)}&epoch=1"
+
+
+def _npm(rng: random.Random) -> str:
+    if rng.random() < 0.3:
+        return f"pkg:npm/%40scope/{rng.choice(_NAMES)}@{_version(rng)}"
+    return f"pkg:npm/{rng.choice(_NAMES)}-js@{_version(rng)}"
+
+
+def _pypi(rng: random.Random) -> str:
+    return f"pkg:pypi/{rng.choice(_NAMES)}_client@{_version(rng)}"
+
+
+def _maven(rng: random.Random) -> str:
+    return f"pkg:maven/org.{rng.choice(_NAMES)}/{rng.choice(_NAMES)}-core@{_version(rng)}?type=jar"
+
+
+def _malformed(rng: random.Random) -> str:
+    name = rng.choice(_NAMES)
+    return rng.choice([
+        f"{name}@{_version(rng)}",
+        f"pkg:oci/{name}@{_version(rng)}",
+        f"pkg:oci/{name}@{_version(rng)}?repository_url={rng.choice(_REGISTRIES)}",
+        f"pkg:npm/{name}@{_version(rng)}?arch",
+        f"pkg:/{name}",
+    ])
+
+
+def _oci_invalid(rng: random.Random) -> str:
+    name = rng.choice(_NAMES)
+    return rng.choice([
+        f"pkg:oci/{name}@{_version(rng)}",
+        f"pkg:oci/{name}@{_version(rng)}?repository_url={rng.choice(_REGISTRIES)}",
+    ])
+
+
+GENERATORS: Dict[str, Callable[[random.Random], str]] = {
+    "oci": _oci,
+    "oci_invalid": _oci_invalid,
+    "rpm_rpmmod": _rpm_rpmmod,
+    "rpm": _rpm,
+    "npm": _npm,
+    "pypi": _pypi,
+    "maven": _maven,
+    "malformed": _malformed,
+}
+
+
+def generate_corpus(size: int, seed: int = 0, mix: Optional[Dict[str, float]] = None) -> List[str]:
+    """Generate a reproducible list of PURLs.
+
+    Args:
+        size: Number of PURLs to generate
+        seed: Random seed; the same seed always yields the same corpus
+        mix: Mapping of category name (see ``GENERATORS``) to relative weight
+
+    Returns:
+        List of PURL strings
+    """
+    mix = DEFAULT_MIX if mix is None else mix
+    rng = random.Random(seed)
+    categories = list(mix)
+    weights = [mix[category] for category in categories]
+    picks = rng.choices(categories, weights=weights, k=size)
+    return [GENERATORS[category](rng) for category in picks]
+
+
+def _respell(rng: random.Random, purl: str) -> str:
+    """Write a PURL differently without changing what it denotes."""
+    head, sep, qualifiers = purl.partition("?")
+    if rng.random() < 0.3:
+        ptype, slash, rest = head[4:].partition("/")
+        head = f"pkg:{ptype.upper()}{slash}{rest}"
+    if sep:
+        pairs = qualifiers.split("&")
+        rng.shuffle(pairs)
+        if rng.random() < 0.3:
+            pairs = [pair.replace("/", rng.choice(["%2F", "%2f"])) for pair in pairs]
+        if rng.random() < 0.2:
+            pairs.append("checksum=")
+        qualifiers = "&".join(pairs)
+    return f"{head}{sep}{qualifiers}"
+
+
+def generate_respelled_corpus(size: int, unique: int, seed: int = 0) -> List[str]:
+    """Generate a duplicate-heavy corpus of equivalent PURL spellings.
+
+    Each entry is one of ``unique`` generated PURLs, written with shuffled
+    qualifiers, an upper-case type, percent-encoded slashes or an empty
+    qualifier at random, as in feeds merged from several tools.
+
+    Args:
+        size: Number of PURLs to generate
+        unique: Number of distinct underlying PURLs
+        seed: Random seed; the same seed always yields the same corpus
+
+    Returns:
+        List of PURL strings
+    """
+    rng = random.Random(seed)
+    base = generate_corpus(unique, seed=seed)
+    return [_respell(rng, rng.choice(base)) for _ in range(size)]
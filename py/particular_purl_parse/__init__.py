@@ -5,7 +5,120 @@ This module provides functionality to extract component information from PURL st
 with special handling for OCI and RPM package types.
 """
 
-from .core import ps_component_from_purl
+from typing import Any, List
+
+from .core import ps_component_from_purl, ps_components_from_purls
 
 __version__ = "1.0.0"
-__all__ = ["ps_component_from_purl"] 
\ No newline at end of file
+__all__ = [
+    "ps_component_from_purl",
+    "ps_components_from_purls",
+    "ComponentCache",
+    "SharedComponentCache",
+    "aiter_components_from_purls",
+    "ps_components_from_purls_async",
+    "ParallelResolver",
+    "PurlComponent",
+    "ps_component_record_from_purl",
+    "ps_component_records_from_purls",
+    "iter_sbom_components",
+    "iter_sbom_purls",
+    "ComponentTable",
+    "ps_component_table_from_purls",
+    "Recorder",
+    "MetricsRecorder",
+    "set_recorder",
+    "get_recorder",
+    "recording",
+    "ComponentColumns",
+    "ps_component_columns_from_purls",
+    "register_rule",
+    "unregister_rule",
+    "get_rule",
+    "namespace_rule",
+    "oci_repository_rule",
+    "RuleError",
+    "MissingRepositoryURLError",
+    "InvalidRepositoryURLError",
+    "ComponentStore",
+    "iter_mmap_purls",
+    "ps_purl_status",
+    "ps_purl_statuses",
+    "ComponentBatch",
+    "ps_component_batch_from_purls",
+    "ComponentIndex",
+    "ps_component_index_from_purls",
+    "canonical_purl_key",
+    "ResolverServer",
+    "Profiler",
+    "ShardWriter",
+    "merge_shards",
+    "shard_of_purl",
+    "ComponentDiff",
+    "diff_components",
+]
+
+# Public names from the other submodules, imported on first attribute access
+# so that ``import particular_purl_parse`` does not pull in asyncio,
+# concurrent.futures or json for callers that only need the core functions
+_LAZY_ATTRIBUTES = {
+    "ComponentCache": ".cache",
+    "SharedComponentCache": ".cache",
+    "aiter_components_from_purls": ".aio",
+    "ps_components_from_purls_async": ".aio",
+    "ParallelResolver": ".parallel",
+    "PurlComponent": ".records",
+    "ps_component_record_from_purl": ".records",
+    "ps_component_records_from_purls": ".records",
+    "iter_sbom_components": ".sbom",
+    "iter_sbom_purls": ".sbom",
+    "ComponentTable": ".table",
+    "ps_component_table_from_purls": ".table",
+    "Recorder": ".instrumentation",
+    "MetricsRecorder": ".instrumentation",
+    "set_recorder": ".instrumentation",
+    "get_recorder": ".instrumentation",
+    "recording": ".instrumentation",
+    "ComponentColumns": ".columnar",
+    "ps_component_columns_from_purls": ".columnar",
+    "register_rule": ".rules",
+    "unregister_rule": ".rules",
+    "get_rule": ".rules",
+    "namespace_rule": ".rules",
+    "oci_repository_rule": ".rules",
+    "RuleError": ".rules",
+    "MissingRepositoryURLError": ".rules",
+    "InvalidRepositoryURLError": ".rules",
+    "ComponentStore": ".store",
+    "iter_mmap_purls": ".reader",
+    "ps_purl_status": ".status",
+    "ps_purl_statuses": ".status",
+    "ComponentBatch": ".status",
+    "ps_component_batch_from_purls": ".status",
+    "ComponentIndex": ".index",
+    "ps_component_index_from_purls": ".index",
+    "canonical_purl_key": ".canonical",
+    "ResolverServer": ".server",
+    "Profiler": ".profiling",
+    "ShardWriter": ".shards",
+    "merge_shards": ".shards",
+    "shard_of_purl": ".shards",
+    "ComponentDiff": ".diff",
+    "diff_components": ".diff",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,11 @@
+"""
+Allow running the command line interface with ``python -m particular_purl_parse``.
+"""
+
+import sys
+
+from .cli import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Asyncio-friendly batch resolution of PURLs to components.
+"""
+
+import asyncio
+import collections.abc
+from collections import deque
+from concurrent.futures import Executor
+from itertools import islice
+from typing import AsyncIterable, AsyncIterator, Deque, Iterable, List, Optional, Union
+
+from .core import ERRORS_RAISE, _check_error_policy, _intern_components, ps_components_from_purls
+from .parallel import _resolve_chunk
+
+
+DEFAULT_ASYNC_CHUNKSIZE = 500
+DEFAULT_MAX_PENDING = 2
+
+AnyPurls = Union[Iterable[str], AsyncIterable[str]]
+Result = Union[str, ValueError]
+
+
+async def aiter_components_from_purls(
+    purls: AnyPurls,
+    errors: str = ERRORS_RAISE,
+    chunksize: int = DEFAULT_ASYNC_CHUNKSIZE,
+    executor: Optional[Executor] = None,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    intern: bool = False,
+) -> AsyncIterator[Result]:
+    """Resolve PURLs cooperatively, yielding results in input order.
+
+    PURLs are resolved ``chunksize`` at a time with ``ps_components_from_purls``.
+    Without an executor, chunks are resolved on the event loop thread and the
+    loop gets control back between chunks. With an executor, chunks run there
+    and at most ``max_pending`` chunks are in flight, so a slow consumer holds
+    back the input. Input that fits in a single chunk is resolved inline.
+
+    Args:
+        purls: Iterable or async iterable of PackageURL strings
+        errors: Error policy, as for ``ps_components_from_purls``
+        chunksize: Number of PURLs resolved between yields to the loop
+        executor: Optional thread or process pool to resolve chunks in
+        max_pending: Maximum number of chunks submitted to the executor
+        intern: Intern component strings, as for ``ps_components_from_purls``
+
+    Yields:
+        Component name strings (and ValueErrors with ``'return'``)
+
+    Raises:
+        ValueError: If the error policy or a size is invalid, or on the first
+            invalid PURL when the policy is ``'raise'``
+    """
+    _check_error_policy(errors)
+    if chunksize <= 0:
+        raise ValueError(f'chunksize must be a positive integer, got {chunksize!r}')
+    if max_pending <= 0:
+        raise ValueError(f'max_pending must be a positive integer, got {max_pending!r}')
+
+    chunks = _achunks(purls, chunksize)
+    chunk = await _anext_chunk(chunks)
+    if chunk is None:
+        return
+    following = await _anext_chunk(chunks)
+    if following is None:
+        for result in ps_components_from_purls(chunk, errors=errors, intern=intern):
+            yield result
+        return
+
+    if executor is None:
+        while chunk is not None:
+            for result in ps_components_from_purls(chunk, errors=errors, intern=intern):
+                yield result
+            chunk = following
+            if chunk is not None:
+                following = await _anext_chunk(chunks)
+                await asyncio.sleep(0)
+        return
+
+    loop = asyncio.get_running_loop()
+    pending: Deque['asyncio.Future[List[Result]]'] = deque()
+    try:
+        while chunk is not None:
+            while len(pending) >= max_pending:
+                for result in _chunk_results(await pending.popleft(), intern):
+                    yield result
+            pending.append(loop.run_in_executor(executor, _resolve_chunk, chunk, errors, intern))
+            chunk = following
+            following = None if chunk is None else await _anext_chunk(chunks)
+        while pending:
+            for result in _chunk_results(await pending.popleft(), intern):
+                yield result
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def ps_components_from_purls_async(
+    purls: AnyPurls,
+    errors: str = ERRORS_RAISE,
+    chunksize: int = DEFAULT_ASYNC_CHUNKSIZE,
+    executor: Optional[Executor] = None,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    intern: bool = False,
+) -> List[Result]:
+    """Resolve PURLs without stalling the event loop and collect the results.
+
+    Sequences no longer than ``chunksize`` are resolved directly with
+    ``ps_components_from_purls``. Larger inputs go through
+    ``aiter_components_from_purls``.
+
+    Args:
+        purls: Iterable or async iterable of PackageURL strings
+        errors: Error policy, as for ``ps_components_from_purls``
+        chunksize: Number of PURLs resolved between yields to the loop
+        executor: Optional thread or process pool to resolve chunks in
+        max_pending: Maximum number of chunks submitted to the executor
+        intern: Intern component strings, as for ``ps_components_from_purls``
+
+    Returns:
+        List of component name strings (and ValueErrors with ``'return'``)
+
+    Raises:
+        ValueError: If the error policy or a size is invalid, or on the first
+            invalid PURL when the policy is ``'raise'``
+    """
+    if isinstance(purls, (list, tuple)) and len(purls) <= chunksize:
+        return ps_components_from_purls(purls, errors=errors, intern=intern)
+
+    return [
+        result
+        async for result in aiter_components_from_purls(
+            purls,
+            errors=errors,
+            chunksize=chunksize,
+            executor=executor,
+            max_pending=max_pending,
+            intern=intern,
+        )
+    ]
+
+
+def _chunk_results(results: List[Result], intern: bool) -> List[Result]:
+    # Results from a process pool are unpickled copies; intern them here too
+    return _intern_components(results) if intern else results
+
+
+async def _achunks(purls: AnyPurls, chunksize: int) -> AsyncIterator[List[str]]:
+    if isinstance(purls, collections.abc.AsyncIterable):
+        chunk: List[str] = []
+        async for purl in purls:
+            chunk.append(purl)
+            if len(chunk) >= chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+        return
+
+    iterator = iter(purls)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+async def _anext_chunk(chunks: AsyncIterator[List[str]]) -> Optional[List[str]]:
+    try:
+        return await chunks.__anext__()
+    except StopAsyncIteration:
+        return None
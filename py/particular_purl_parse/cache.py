@@ -0,0 +1,249 @@
+"""
+Bounded LRU memoization of PURL to component resolution.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Union
+
+from .core import ps_component_from_purl
+
+
+DEFAULT_CACHE_SIZE = 65536
+DEFAULT_SHARDS = 16
+
+
+class CacheInfo(NamedTuple):
+    """Cache statistics, in the spirit of ``functools.lru_cache``."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class ComponentCache:
+    """LRU cache around ``ps_component_from_purl``.
+
+    Failures are cached as negative entries: a PURL that raised ValueError
+    once raises a ValueError with the same message on every later lookup
+    without being parsed again. Instances are not thread-safe.
+
+    Args:
+        maxsize: Maximum number of entries, or None for an unbounded cache
+
+    Raises:
+        ValueError: If maxsize is not a positive integer or None
+    """
+
+    def __init__(self, maxsize: Optional[int] = DEFAULT_CACHE_SIZE) -> None:
+        if maxsize is not None and (not isinstance(maxsize, int) or maxsize <= 0):
+            raise ValueError(f'Cache maxsize must be a positive integer or None, got {maxsize!r}')
+
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[str, Union[str, ValueError]]' = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __call__(self, purl: str) -> str:
+        return self.resolve(purl)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def resolve(self, purl: str) -> str:
+        """Extract component name from PackageURL string, using the cache.
+
+        Args:
+            purl: PackageURL string to parse
+
+        Returns:
+            Component name string
+
+        Raises:
+            ValueError: If the PURL is invalid or missing required qualifiers
+        """
+        entries = self._entries
+        try:
+            entry = entries[purl]
+        except (KeyError, TypeError):
+            return self._resolve_miss(purl)
+
+        self._hits += 1
+        entries.move_to_end(purl)
+        if isinstance(entry, ValueError):
+            raise ValueError(*entry.args)
+        return entry
+
+    def _resolve_miss(self, purl: str) -> str:
+        if not purl or not isinstance(purl, str):
+            # Not cacheable; let the resolver raise its usual error
+            return ps_component_from_purl(purl)
+
+        self._misses += 1
+        try:
+            component = ps_component_from_purl(purl)
+        except ValueError as e:
+            # Store a fresh exception so the cache doesn't pin traceback frames
+            self._store(purl, ValueError(*e.args))
+            raise
+        self._store(purl, component)
+        return component
+
+    def _store(self, purl: str, entry: Union[str, ValueError]) -> None:
+        entries = self._entries
+        entries[purl] = entry
+        if self.maxsize is not None and len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self._evictions += 1
+
+    def cache_info(self) -> CacheInfo:
+        """Return hit, miss and eviction counters and the current size."""
+        return CacheInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self._entries))
+
+    def cache_clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+
+class SharedComponentCache:
+    """Thread-safe LRU cache around ``ps_component_from_purl``.
+
+    Behaves like ``ComponentCache`` (including negative entries) but may be
+    shared by any number of threads, e.g. the request threads of a threaded
+    server or free-threaded CPython. Entries are spread over independent
+    shards by PURL hash, each an LRU with its own lock and counters, so
+    threads looking up different PURLs rarely wait on each other. Parsing
+    on a miss runs outside the lock; two threads missing the same PURL at
+    once may both parse it, with the same result.
+
+    ``maxsize`` is split evenly over the shards, so eviction is LRU per
+    shard rather than across the whole cache.
+
+    Args:
+        maxsize: Maximum number of entries, or None for an unbounded cache
+        shards: Number of shards, rounded up to a power of two
+
+    Raises:
+        ValueError: If maxsize is not a positive integer or None, or shards
+            is not a positive integer
+    """
+
+    def __init__(self, maxsize: Optional[int] = DEFAULT_CACHE_SIZE, shards: int = DEFAULT_SHARDS) -> None:
+        if maxsize is not None and (not isinstance(maxsize, int) or maxsize <= 0):
+            raise ValueError(f'Cache maxsize must be a positive integer or None, got {maxsize!r}')
+        if not isinstance(shards, int) or shards <= 0:
+            raise ValueError(f'Cache shards must be a positive integer, got {shards!r}')
+
+        count = 1 << (shards - 1).bit_length()
+        if maxsize is not None:
+            # Every shard must hold at least one entry
+            count = min(count, 1 << (maxsize.bit_length() - 1))
+        if maxsize is None:
+            sizes: List[Optional[int]] = [None] * count
+        else:
+            size, extra = divmod(maxsize, count)
+            sizes = [size + 1] * extra + [size] * (count - extra)
+        self.maxsize = maxsize
+        self._mask = count - 1
+        self._shards = [_Shard(size) for size in sizes]
+
+    def __call__(self, purl: str) -> str:
+        return self.resolve(purl)
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
+    @property
+    def shards(self) -> int:
+        """Number of shards."""
+        return len(self._shards)
+
+    def resolve(self, purl: str) -> str:
+        """Extract component name from PackageURL string, using the cache.
+
+        Args:
+            purl: PackageURL string to parse
+
+        Returns:
+            Component name string
+
+        Raises:
+            ValueError: If the PURL is invalid or missing required qualifiers
+        """
+        if not purl or not isinstance(purl, str):
+            # Not cacheable; let the resolver raise its usual error
+            return ps_component_from_purl(purl)
+
+        shard = self._shards[hash(purl) & self._mask]
+        with shard.lock:
+            entry = shard.entries.get(purl)
+            if entry is None:
+                shard.misses += 1
+            else:
+                shard.hits += 1
+                shard.entries.move_to_end(purl)
+        if entry is None:
+            return self._resolve_miss(shard, purl)
+
+        if isinstance(entry, ValueError):
+            raise ValueError(*entry.args)
+        return entry
+
+    def _resolve_miss(self, shard: '_Shard', purl: str) -> str:
+        try:
+            component = ps_component_from_purl(purl)
+        except ValueError as e:
+            # Store a fresh exception so the cache doesn't pin traceback frames
+            shard.store(purl, ValueError(*e.args))
+            raise
+        shard.store(purl, component)
+        return component
+
+    def cache_info(self) -> CacheInfo:
+        """Return hit, miss and eviction counters and the current size, summed over shards."""
+        hits = misses = evictions = currsize = 0
+        for shard in self._shards:
+            with shard.lock:
+                hits += shard.hits
+                misses += shard.misses
+                evictions += shard.evictions
+                currsize += len(shard.entries)
+        return CacheInfo(hits, misses, evictions, self.maxsize, currsize)
+
+    def cache_clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.hits = 0
+                shard.misses = 0
+                shard.evictions = 0
+
+
+class _Shard:
+    """One lock-protected LRU partition of a SharedComponentCache."""
+
+    __slots__ = ('lock', 'entries', 'maxsize', 'hits', 'misses', 'evictions')
+
+    def __init__(self, maxsize: Optional[int]) -> None:
+        self.lock = threading.Lock()
+        self.entries: 'OrderedDict[str, Union[str, ValueError]]' = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def store(self, purl: str, entry: Union[str, ValueError]) -> None:
+        with self.lock:
+            entries = self.entries
+            entries[purl] = entry
+            entries.move_to_end(purl)
+            if self.maxsize is not None and len(entries) > self.maxsize:
+                entries.popitem(last=False)
+                self.evictions += 1
@@ -0,0 +1,152 @@
+"""
+Canonical PURL keys, and batch resolution deduplicated on them.
+"""
+
+import string
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple, Union
+
+from .core import ERRORS_RAISE, ERRORS_RETURN, ps_component_from_purl
+
+
+def _escape_table(decoded: str) -> Dict[str, str]:
+    """Map every spelling of every escape to its canonical form.
+
+    Escapes of the decoded characters become the character itself; others
+    keep the escape with upper-case hex digits.
+    """
+    table = {}
+    for code in range(256):
+        upper = f'{code:02X}'
+        canonical = chr(code) if chr(code) in decoded else f'%{upper}'
+        for spelling in {upper, upper.lower(), upper[0] + upper[1].lower(), upper[0].lower() + upper[1]}:
+            table[spelling] = canonical
+    return table
+
+
+# Characters that mean the same escaped or not: unreserved ones everywhere,
+# plus '/' and ':' in qualifier values, which are fully decoded by PackageURL
+_UNRESERVED = string.ascii_letters + string.digits + '-._~'
+_PATH_ESCAPES = _escape_table(_UNRESERVED)
+_VALUE_ESCAPES = _escape_table(_UNRESERVED + '/:')
+
+
+def canonical_purl_key(purl: str) -> str:
+    """Return a key shared by PURLs that differ only in notation.
+
+    PURLs that differ only in the case of the type or of qualifier keys, in
+    the order of their qualifiers, in empty qualifiers or in
+    percent-encoding (e.g. ``%2f`` vs ``%2F``, or ``%2F`` vs ``/`` in a
+    qualifier value) get the same key. Such PURLs parse to the same
+    ``PackageURL`` and resolve to the same component, so the key can
+    replace the PURL string as a cache or deduplication key. Keys err on
+    the side of caution: some equivalent spellings keep distinct keys.
+
+    The key is a PURL string itself, but not necessarily the one
+    ``PackageURL.to_string`` would produce. Strings that are not
+    ``pkg:type/...`` PURLs, or whose qualifiers cannot be split, are their
+    own key.
+
+    Args:
+        purl: PackageURL string
+
+    Returns:
+        Canonical key string
+    """
+    if not purl.startswith('pkg:'):
+        return purl
+
+    remainder, hash_sign, subpath = purl[4:].partition('#')
+    path, question_mark, qualifiers = remainder.partition('?')
+    ptype, sep, path = path.partition('/')
+    if not sep:
+        return purl
+
+    if '%' in path:
+        path = _normalize_escapes(path, _PATH_ESCAPES)
+    if qualifiers:
+        pairs = []
+        for pair in qualifiers.split('&'):
+            key, sep, value = pair.partition('=')
+            if not sep:
+                return purl
+            if not key or not value:
+                # Dropped by PackageURL
+                continue
+            if '%' in value:
+                value = _normalize_escapes(value, _VALUE_ESCAPES)
+            pairs.append((key.lower(), value))
+        # The sort is stable, so among repeated keys the last still wins
+        pairs.sort(key=_pair_key)
+        qualifiers = '&'.join([f'{key}={value}' for key, value in pairs])
+        question_mark = '?' if qualifiers else ''
+
+    return f'pkg:{ptype.lower()}/{path}{question_mark}{qualifiers}{hash_sign}{subpath}'
+
+
+def _resolve_deduped(
+    purls: Iterable[Any],
+    errors: str,
+    resolve: Callable[[str], str] = ps_component_from_purl,
+) -> List[Union[str, ValueError]]:
+    """Resolve each distinct canonical key once and scatter results to inputs.
+
+    Backs ``ps_components_from_purls(..., dedupe=True)``, which checks the
+    error policy first. Inputs that are not strings are resolved one by
+    one, so they fail as usual.
+    """
+    purls = list(purls)
+    by_purl: Dict[Hashable, Union[str, ValueError]] = {}
+    by_key: Dict[str, Union[str, ValueError]] = {}
+    for purl in purls:
+        if purl.__class__ is not str or purl in by_purl:
+            continue
+        key = canonical_purl_key(purl)
+        result = by_key.get(key)
+        if result is None:
+            try:
+                result = resolve(purl)
+            except ValueError as e:
+                result = e
+            by_key[key] = result
+        by_purl[purl] = result
+
+    results: List[Union[str, ValueError]] = []
+    append = results.append
+    raise_errors = errors == ERRORS_RAISE
+    keep_errors = errors == ERRORS_RETURN
+    for purl in purls:
+        if purl.__class__ is str:
+            result = by_purl[purl]
+        else:
+            try:
+                result = resolve(purl)
+            except ValueError as e:
+                result = e
+        if isinstance(result, ValueError):
+            if raise_errors:
+                raise result
+            if keep_errors:
+                append(result)
+        else:
+            append(result)
+    return results
+
+
+def _normalize_escapes(text: str, escapes: Dict[str, str]) -> str:
+    """Rewrite the percent-escapes in text to their canonical form.
+
+    Text with a stray ``%`` is returned unchanged, since decoding next to it
+    could form a new escape.
+    """
+    parts = text.split('%')
+    for index in range(1, len(parts)):
+        part = parts[index]
+        canonical = escapes.get(part[:2])
+        if canonical is None:
+            return text
+        parts[index] = canonical + part[2:]
+    return ''.join(parts)
+
+
+def _pair_key(pair: Tuple[str, str]) -> str:
+    return pair[0]
@@ -0,0 +1,584 @@
+"""
+Command line interface for resolving PURLs to components.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from contextlib import ExitStack
+from functools import partial
+from itertools import islice, tee
+from typing import IO, TYPE_CHECKING, Callable, Deque, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from . import __version__
+from .cache import ComponentCache
+from .core import ERRORS_RETURN, ps_components_from_purls
+from .output import FORMAT_JSONL, FORMAT_TSV, FORMATS, format_line
+
+if TYPE_CHECKING:
+    from .parallel import ParallelResolver
+
+
+DEFAULT_BATCH_SIZE = 1024
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+Resolved = Tuple[str, Union[str, ValueError]]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the ``particular-purl-parse`` command.
+
+    Args:
+        argv: Command line arguments, defaulting to ``sys.argv[1:]``
+
+    Returns:
+        Process exit status
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    # Batch commands (those with --store) only cache in-process
+    if hasattr(args, 'store') and args.cache_size and (args.workers > 1 or args.store is not None):
+        parser.error('--cache-size cannot be combined with --workers above 1 or --store')
+    try:
+        return int(args.func(args))
+    except BrokenPipeError:
+        # Downstream closed the pipe (e.g. ``| head``). As the Python docs
+        # recommend, point stdout at devnull so the interpreter's final flush
+        # does not raise again, and exit with an error status
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='particular-purl-parse',
+        description='Extract component names from PackageURL (PURL) strings.',
+    )
+    parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    subparsers.required = True
+
+    resolve = subparsers.add_parser(
+        'resolve',
+        help='resolve newline-delimited PURLs to components',
+        description='Resolve newline-delimited PURLs from files or stdin, streaming '
+                    'one output record per input line.',
+    )
+    resolve.add_argument(
+        'inputs', nargs='*', metavar='FILE',
+        help='input files with one PURL per line; "-" or nothing reads stdin',
+    )
+    resolve.add_argument(
+        '--mmap', action='store_true',
+        help='memory-map input files instead of reading them line by line; can be '
+             'slightly faster for large files, but uses more resident memory '
+             '(stdin is still read line by line)',
+    )
+    _add_output_arguments(resolve)
+    _add_profile_arguments(resolve)
+    resolve.set_defaults(func=_resolve_command)
+
+    sbom = subparsers.add_parser(
+        'sbom',
+        help='resolve the PURLs referenced by CycloneDX or SPDX JSON documents',
+        description='Stream the PURLs of CycloneDX components and SPDX purl externalRefs '
+                    'from JSON documents and resolve them to components.',
+    )
+    sbom.add_argument(
+        'inputs', nargs='+', metavar='FILE',
+        help='CycloneDX or SPDX JSON documents; "-" reads stdin',
+    )
+    _add_output_arguments(sbom)
+    _add_profile_arguments(sbom)
+    sbom.set_defaults(func=_sbom_command)
+
+    shard = subparsers.add_parser(
+        'shard',
+        help='resolve hash partitions of the input into part files for a later merge',
+        description='Resolve the PURLs of the owned shards of a hash-partitioned job into one '
+                    'part file and manifest per shard. Every process of the job reads the same '
+                    'input; run "merge" once all shards are written.',
+    )
+    shard.add_argument(
+        'inputs', nargs='*', metavar='FILE',
+        help='input files with one PURL per line; "-" or nothing reads stdin',
+    )
+    shard.add_argument(
+        '--mmap', action='store_true',
+        help='memory-map input files, as for resolve (more resident memory)',
+    )
+    shard.add_argument(
+        '-d', '--directory', required=True,
+        help='directory for the part files and manifests, shared by the whole job',
+    )
+    shard.add_argument(
+        '--shards', type=_positive_int, required=True, metavar='N',
+        help='number of shards of the job',
+    )
+    shard.add_argument(
+        '--shard', type=_non_negative_int, action='append', metavar='K', dest='owned',
+        help='write shard K (repeatable; default: all shards)',
+    )
+    shard.add_argument(
+        '-f', '--format', choices=FORMATS, default=FORMAT_TSV,
+        help='output format of the merged result (default: tsv)',
+    )
+    shard.add_argument(
+        '--skip-errors', action='store_true',
+        help='leave failed PURLs out of the parts; manifests still count them',
+    )
+    shard.add_argument(
+        '--batch-size', type=_positive_int, default=DEFAULT_BATCH_SIZE, metavar='N',
+        help=f'number of PURLs resolved and written at a time (default: {DEFAULT_BATCH_SIZE})',
+    )
+    shard.add_argument(
+        '--cache-size', type=_non_negative_int, default=0, metavar='N',
+        help='memoize up to N distinct PURLs in-process (default: 0, no cache; not with --workers above 1)',
+    )
+    shard.add_argument(
+        '--workers', type=_positive_int, default=1, metavar='N',
+        help='resolve in N worker processes (default: 1, in-process)',
+    )
+    shard.set_defaults(func=_shard_command, store=None)
+
+    merge = subparsers.add_parser(
+        'merge',
+        help='merge the part files of a sharded job in input order',
+        description='Stream the part files written by "shard" into one output, in input order, '
+                    'checking each part against its manifest.',
+    )
+    merge.add_argument('directory', help='directory the shards were written to')
+    merge.add_argument(
+        '-o', '--output', metavar='FILE', default='-',
+        help='write results to FILE instead of stdout',
+    )
+    merge.add_argument(
+        '--error-output', metavar='FILE',
+        help='write failed PURLs and their errors to FILE instead of the main output',
+    )
+    merge.add_argument('--skip-errors', action='store_true', help='drop failed PURLs')
+    merge.set_defaults(func=_merge_command)
+
+    diff = subparsers.add_parser(
+        'diff',
+        help='list the components added and removed between two snapshots',
+        description='Stream two snapshots of PURLs (or SBOM documents with --sbom) and list the '
+                    'components only one of them has, and the packages whose components changed. '
+                    'A summary goes to stderr.',
+    )
+    diff.add_argument('old', help='old snapshot: one PURL per line, or an SBOM with --sbom; "-" reads stdin')
+    diff.add_argument('new', help='new snapshot, as for OLD')
+    diff.add_argument(
+        '--sbom', action='store_true',
+        help='read CycloneDX or SPDX JSON documents instead of PURL lists',
+    )
+    diff.add_argument(
+        '-o', '--output', metavar='FILE', default='-',
+        help='write the differences to FILE instead of stdout',
+    )
+    diff.add_argument(
+        '-f', '--format', choices=FORMATS, default=FORMAT_TSV,
+        help='output format (default: tsv): "change<TAB>key<TAB>old count<TAB>new count" lines, '
+             'followed for changed packages by the old and new comma-separated components, '
+             'or JSON lines',
+    )
+    diff.add_argument(
+        '--cache-size', type=_non_negative_int, default=0, metavar='N',
+        help='keep at most N resolutions to cap memory; PURLs evicted from the cache are parsed '
+             'again when they recur (default: 0, unbounded, every distinct PURL parsed once)',
+    )
+    diff.add_argument(
+        '--exit-code', action='store_true',
+        help='exit with 1 if there are differences, 0 otherwise',
+    )
+    diff.set_defaults(func=_diff_command)
+
+    serve = subparsers.add_parser(
+        'serve',
+        help='serve single and batch resolution over HTTP',
+        description='Serve GET /resolve?purl=..., POST /resolve (newline-delimited or JSON '
+                    'array body, streamed JSON lines response), GET /metrics and GET /health.',
+    )
+    serve.add_argument('--host', default='127.0.0.1', help='address to bind (default: 127.0.0.1)')
+    serve.add_argument('--port', type=_non_negative_int, default=8080, help='port to bind (default: 8080)')
+    serve.add_argument(
+        '--workers', type=_positive_int, default=4, metavar='N',
+        help='resolution worker threads (default: 4)',
+    )
+    serve.add_argument(
+        '--max-concurrency', type=_positive_int, default=64, metavar='N',
+        help='resolve requests in progress before answering 503 (default: 64)',
+    )
+    serve.add_argument(
+        '--cache-size', type=_non_negative_int, default=65536, metavar='N',
+        help='entries of the shared component cache, 0 to disable (default: 65536)',
+    )
+    serve.add_argument(
+        '--metrics', action='store_true',
+        help='record resolution metrics (branches, errors, timings) for GET /metrics',
+    )
+    serve.set_defaults(func=_serve_command)
+
+    return parser
+
+
+def _add_output_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '-o', '--output', metavar='FILE', default='-',
+        help='write results to FILE instead of stdout',
+    )
+    parser.add_argument(
+        '-f', '--format', choices=FORMATS, default=FORMAT_TSV,
+        help='output format: "purl<TAB>component" lines or JSON lines (default: tsv); '
+             'in tsv, failed PURLs are written as "purl<TAB><TAB>error"',
+    )
+    parser.add_argument(
+        '--error-output', metavar='FILE',
+        help='write failed PURLs and their errors to FILE instead of the main output',
+    )
+    parser.add_argument(
+        '--skip-errors', action='store_true',
+        help='drop failed PURLs instead of reporting them',
+    )
+    parser.add_argument(
+        '--batch-size', type=_positive_int, default=DEFAULT_BATCH_SIZE, metavar='N',
+        help=f'number of PURLs resolved and written at a time (default: {DEFAULT_BATCH_SIZE})',
+    )
+    parser.add_argument(
+        '--cache-size', type=_non_negative_int, default=0, metavar='N',
+        help='memoize up to N distinct PURLs in-process (default: 0, no cache; '
+             'not with --workers above 1 or --store)',
+    )
+    parser.add_argument(
+        '--workers', type=_positive_int, default=1, metavar='N',
+        help='resolve in N worker processes (default: 1, in-process)',
+    )
+    parser.add_argument(
+        '--store', metavar='FILE',
+        help='reuse and record results in a persistent SQLite store, so that '
+             'reruns only parse new PURLs',
+    )
+
+
+def _add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group(
+        'profiling', 'sample the run and attribute time to the input, parse, rule and output stages'
+    )
+    group.add_argument(
+        '--profile', metavar='FILE',
+        help='write a profile report to FILE ("-" for stderr)',
+    )
+    group.add_argument(
+        '--profile-stacks', metavar='FILE',
+        help='write sampled stacks in collapsed format, for flame graph tools, to FILE',
+    )
+    group.add_argument(
+        '--profile-memory', action='store_true',
+        help='also trace allocations with tracemalloc and report them by stage (slow); '
+             'without other profiling options, the report goes to stderr',
+    )
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f'must be a positive integer: {value!r}')
+    return number
+
+
+def _non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f'must be a non-negative integer: {value!r}')
+    return number
+
+
+def _resolve_command(args: argparse.Namespace) -> int:
+    _run_profiled(lambda: _resolve_and_write(_iter_input_purls(args.inputs, args.mmap), args), args)
+    return 0
+
+
+def _sbom_command(args: argparse.Namespace) -> int:
+    from .sbom import iter_sbom_purls
+
+    purls = (
+        purl
+        for path in args.inputs
+        for purl in iter_sbom_purls(sys.stdin.buffer if path == '-' else path)
+    )
+    _run_profiled(lambda: _resolve_and_write(purls, args), args)
+    return 0
+
+
+def _run_profiled(run: Callable[[], None], args: argparse.Namespace) -> None:
+    if args.profile is None and args.profile_stacks is None and not args.profile_memory:
+        run()
+        return
+
+    from .profiling import Profiler
+
+    with Profiler(memory=args.profile_memory) as profiler:
+        run()
+    if args.profile_stacks is not None:
+        with open(args.profile_stacks, 'w', encoding='utf-8') as stream:
+            profiler.write_collapsed(stream)
+    report = args.profile
+    if report is None and args.profile_stacks is None:
+        # Only --profile-memory was given
+        report = '-'
+    if report == '-':
+        print(profiler.report(), file=sys.stderr)
+    elif report is not None:
+        with open(report, 'w', encoding='utf-8') as stream:
+            stream.write(profiler.report() + '\n')
+
+
+def _shard_command(args: argparse.Namespace) -> int:
+    from .shards import ShardWriter
+
+    try:
+        writer = ShardWriter(args.directory, args.shards, args.owned, args.format, args.skip_errors)
+    except ValueError as e:
+        print(f'particular-purl-parse shard: error: {e}', file=sys.stderr)
+        return 2
+
+    # Input positions of the PURLs being resolved, consumed in order by the writer
+    positions: Deque[int] = deque()
+    owns = writer.owns
+
+    def owned_purls() -> Iterator[str]:
+        for position, purl in enumerate(_iter_input_purls(args.inputs, args.mmap)):
+            if owns(purl):
+                positions.append(position)
+                yield purl
+
+    def write(batches: Iterable[List[Resolved]], args: argparse.Namespace) -> None:
+        pop = positions.popleft
+        for batch in batches:
+            writer.write([(pop(), purl, result) for purl, result in batch])
+
+    with writer:
+        _resolve_and_write(owned_purls(), args, write)
+    return 0
+
+
+def _merge_command(args: argparse.Namespace) -> int:
+    from .shards import merge_shards
+
+    output = _open_output(args.output)
+    error_output = None if args.error_output is None else _open_output(args.error_output)
+    try:
+        merge_shards(args.directory, output, error_output, args.skip_errors)
+    except ValueError as e:
+        print(f'particular-purl-parse merge: error: {e}', file=sys.stderr)
+        return 1
+    finally:
+        _close_output(output)
+        if error_output is not None:
+            _close_output(error_output)
+    return 0
+
+
+def _diff_command(args: argparse.Namespace) -> int:
+    from .diff import diff_components
+
+    diff = diff_components(
+        _iter_snapshot_purls(args.old, args.sbom),
+        _iter_snapshot_purls(args.new, args.sbom),
+        args.cache_size or None,
+    )
+
+    jsonl = args.format == FORMAT_JSONL
+    output = _open_output(args.output)
+    changed = False
+    try:
+        for record in diff.records():
+            changed = True
+            if jsonl:
+                output.write(json.dumps(record._asdict(), ensure_ascii=False) + '\n')
+            else:
+                line = f'{record.change}\t{record.key}\t{record.old_count}\t{record.new_count}'
+                if record.old_components or record.new_components:
+                    line += f"\t{','.join(record.old_components)}\t{','.join(record.new_components)}"
+                output.write(line + '\n')
+    finally:
+        _close_output(output)
+
+    summary = diff.summary()
+    print(
+        f"old: {summary['old_purls']} PURLs ({summary['old_errors']} failed), "
+        f"{summary['old_components']} components; "
+        f"new: {summary['new_purls']} PURLs ({summary['new_errors']} failed), "
+        f"{summary['new_components']} components; "
+        f"{summary['added']} added, {summary['removed']} removed, {summary['changed']} changed packages, "
+        f"{summary['resolutions']} PURLs parsed",
+        file=sys.stderr,
+    )
+    return 1 if args.exit_code and changed else 0
+
+
+def _iter_snapshot_purls(path: str, sbom: bool) -> Iterator[str]:
+    if not sbom:
+        return _iter_input_purls([path])
+
+    from .sbom import iter_sbom_purls
+
+    return iter_sbom_purls(sys.stdin.buffer if path == '-' else path)
+
+
+def _serve_command(args: argparse.Namespace) -> int:
+    from .instrumentation import MetricsRecorder, set_recorder
+    from .server import ResolverServer
+
+    if args.metrics:
+        set_recorder(MetricsRecorder())
+    with ResolverServer(
+        (args.host, args.port),
+        workers=args.workers,
+        max_concurrency=args.max_concurrency,
+        cache_size=args.cache_size,
+    ) as server:
+        print(f'Serving on {server.url}', file=sys.stderr, flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def _resolve_and_write(
+    purls: Iterator[str],
+    args: argparse.Namespace,
+    write: Optional[Callable[[Iterable[List[Resolved]], argparse.Namespace], None]] = None,
+) -> None:
+    write = write or _write_output
+    if args.store is not None:
+        write(_resolve_stored(purls, args), args)
+    elif args.workers > 1:
+        from .parallel import ParallelResolver
+
+        with ParallelResolver(workers=args.workers, chunksize=args.batch_size) as resolver:
+            write(_resolve_parallel(purls, resolver), args)
+    else:
+        write(_resolve_serial(purls, args.batch_size, _make_cache(args)), args)
+
+
+def _make_cache(args: argparse.Namespace) -> Optional[ComponentCache]:
+    return ComponentCache(args.cache_size) if args.cache_size else None
+
+
+def _write_output(batches: Iterable[List[Resolved]], args: argparse.Namespace) -> None:
+    output = _open_output(args.output)
+    error_output = None if args.error_output is None else _open_output(args.error_output)
+    try:
+        _write_results(batches, output, error_output, args)
+    finally:
+        _close_output(output)
+        if error_output is not None:
+            _close_output(error_output)
+
+
+def _iter_input_purls(paths: Sequence[str], use_mmap: bool = False) -> Iterator[str]:
+    """Yield stripped, non-blank lines from the given files or stdin."""
+    for path in paths or ['-']:
+        if path == '-':
+            yield from _purls_from_lines(sys.stdin)
+        elif use_mmap:
+            from .reader import iter_mmap_purls
+
+            yield from iter_mmap_purls(path)
+        else:
+            with open(path, encoding='utf-8', errors='replace') as stream:
+                yield from _purls_from_lines(stream)
+
+
+def _purls_from_lines(lines: Iterable[str]) -> Iterator[str]:
+    for line in lines:
+        purl = line.strip()
+        if purl:
+            yield purl
+
+
+def _resolve_serial(
+    purls: Iterator[str], batch_size: int, cache: Optional[ComponentCache]
+) -> Iterator[List[Resolved]]:
+    while True:
+        batch = list(islice(purls, batch_size))
+        if not batch:
+            return
+        results = ps_components_from_purls(batch, errors=ERRORS_RETURN, resolver=cache)
+        yield list(zip(batch, results))
+
+
+def _resolve_stored(purls: Iterator[str], args: argparse.Namespace) -> Iterator[List[Resolved]]:
+    from .store import ComponentStore
+
+    with ExitStack() as stack:
+        store = stack.enter_context(ComponentStore(args.store))
+        resolve_missing = None
+        if args.workers > 1:
+            from .parallel import ParallelResolver
+
+            # Each batch's misses are split across the workers
+            chunksize = max(1, args.batch_size // args.workers)
+            resolver = stack.enter_context(ParallelResolver(workers=args.workers, chunksize=chunksize))
+            resolve_missing = partial(resolver.resolve, errors=ERRORS_RETURN)
+        while True:
+            batch = list(islice(purls, args.batch_size))
+            if not batch:
+                return
+            results = store.resolve_many(batch, errors=ERRORS_RETURN, resolve_missing=resolve_missing)
+            yield list(zip(batch, results))
+
+
+def _resolve_parallel(purls: Iterable[str], resolver: 'ParallelResolver') -> Iterator[List[Resolved]]:
+    # The tee buffer holds at most the chunks the resolver has in flight
+    inputs, originals = tee(purls)
+    return _batched(zip(originals, resolver.iter_resolve(inputs, errors=ERRORS_RETURN)), resolver.chunksize)
+
+
+def _batched(resolved: Iterable[Resolved], batch_size: int) -> Iterator[List[Resolved]]:
+    resolved = iter(resolved)
+    while True:
+        batch = list(islice(resolved, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _write_results(
+    batches: Iterable[List[Resolved]],
+    output: IO[str],
+    error_output: Optional[IO[str]],
+    args: argparse.Namespace,
+) -> None:
+    jsonl = args.format == FORMAT_JSONL
+    skip_errors = args.skip_errors
+    for batch in batches:
+        lines = []
+        error_lines = [] if error_output is not None else lines
+        for purl, result in batch:
+            if isinstance(result, ValueError):
+                if not skip_errors:
+                    error_lines.append(format_line(purl, result, jsonl))
+            else:
+                lines.append(format_line(purl, result, jsonl))
+        output.writelines(lines)
+        if error_output is not None:
+            error_output.writelines(error_lines)
+
+
+def _open_output(path: str) -> IO[str]:
+    if path == '-':
+        return sys.stdout
+    return open(path, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE)
+
+
+def _close_output(stream: IO[str]) -> None:
+    if stream is sys.stdout:
+        stream.flush()
+    else:
+        stream.close()
@@ -0,0 +1,247 @@
+"""
+Columnar batch output in the Arrow string layout.
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+from .core import (
+    PREFIX_NAMESPACE,
+    PREFIX_NONE,
+    PREFIX_OCI_REPOSITORY,
+    PREFIX_RPMMOD,
+    _prefix_from_fields,
+    _purl_fields,
+)
+from .status import (
+    STATUS_INVALID_FORMAT,
+    STATUS_INVALID_INPUT,
+    STATUS_INVALID_REPOSITORY_URL,
+    STATUS_MISSING_REPOSITORY_URL,
+    STATUS_NAMES,
+    STATUS_OK,
+    STATUS_RULE_FAILED,
+    _error_status,
+)
+
+
+# Error code column values: the status codes of particular_purl_parse.status
+ERROR_NONE = STATUS_OK
+ERROR_INVALID_INPUT = STATUS_INVALID_INPUT
+ERROR_INVALID_FORMAT = STATUS_INVALID_FORMAT
+ERROR_MISSING_REPOSITORY_URL = STATUS_MISSING_REPOSITORY_URL
+ERROR_INVALID_REPOSITORY_URL = STATUS_INVALID_REPOSITORY_URL
+ERROR_RULE_FAILED = STATUS_RULE_FAILED
+
+ERROR_CODE_NAMES = ('none',) + STATUS_NAMES[1:]
+
+# Prefix source codes of the built-in rules; sources returned by registered
+# rules get the following codes in order of first appearance
+PREFIX_SOURCE_NULL = -1
+PREFIX_SOURCE_OCI_REPOSITORY = 0
+PREFIX_SOURCE_RPMMOD = 1
+PREFIX_SOURCE_NONE = 2
+PREFIX_SOURCE_NAMESPACE = 3
+
+PREFIX_SOURCE_NAMES = (PREFIX_OCI_REPOSITORY, PREFIX_RPMMOD, PREFIX_NONE, PREFIX_NAMESPACE)
+
+# Type code of inputs whose type is unknown because they could not be parsed
+TYPE_CODE_NULL = -1
+
+
+class ComponentColumns:
+    """Batch resolution result as fixed-width and variable-width columns.
+
+    Row ``i`` is the input at position ``i``. Every column is an
+    ``array.array`` or ``bytearray`` supporting the buffer protocol, so
+    NumPy and Arrow can wrap it without copying:
+
+    - ``offsets`` (int32, ``len + 1`` entries) and ``data`` (UTF-8 bytes):
+      the component of row ``i`` is ``data[offsets[i]:offsets[i + 1]]``,
+      empty for failed rows, exactly as in an Arrow ``string`` array
+    - ``type_codes`` (int32): index into ``types``, the dictionary of PURL
+      types in order of first appearance, or -1 if the input did not parse
+    - ``prefix_sources`` (int8): index into ``prefix_source_names``, which
+      starts with ``PREFIX_SOURCE_NAMES``, or -1 for failed rows
+    - ``error_codes`` (int8): index into ``ERROR_CODE_NAMES``, 0 on success
+
+    Attributes:
+        offsets: Component start offsets into data, plus the end offset
+        data: Concatenated UTF-8 encoded components
+        types: Distinct PURL types
+        type_codes: Type dictionary index per row
+        prefix_source_names: Prefix sources by code
+        prefix_sources: Prefix source code per row
+        error_codes: Error code per row
+    """
+
+    __slots__ = (
+        'offsets', 'data', 'types', 'type_codes', 'prefix_source_names', 'prefix_sources', 'error_codes'
+    )
+
+    def __init__(self) -> None:
+        self.offsets = array('i', [0])
+        self.data = bytearray()
+        self.types: List[str] = []
+        self.type_codes = array('i')
+        self.prefix_source_names: List[str] = list(PREFIX_SOURCE_NAMES)
+        self.prefix_sources = array('b')
+        self.error_codes = array('b')
+
+    def __len__(self) -> int:
+        return len(self.error_codes)
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        """Decode the component of one row, or None if the row failed."""
+        row = range(len(self))[row]
+        if self.error_codes[row] != ERROR_NONE:
+            return None
+        return self.data[self.offsets[row]:self.offsets[row + 1]].decode('utf-8', 'surrogatepass')
+
+    def __repr__(self) -> str:
+        return f"ComponentColumns(rows={len(self)}, data_bytes={len(self.data)}, types={len(self.types)})"
+
+    def validity_bitmap(self) -> bytes:
+        """Return the Arrow validity bitmap of the component column.
+
+        Bit ``i`` (least significant bit first) is set if row ``i`` resolved.
+        """
+        return _bitmap(code == ERROR_NONE for code in self.error_codes)
+
+    def error_counts(self) -> Dict[str, int]:
+        """Return the number of rows per error code name, including ``'none'``."""
+        counts = [0] * len(ERROR_CODE_NAMES)
+        for code in self.error_codes:
+            counts[code] += 1
+        return dict(zip(ERROR_CODE_NAMES, counts))
+
+    def to_arrow(self) -> Any:
+        """Build a ``pyarrow.RecordBatch`` over the column buffers.
+
+        The component column is a ``string`` array sharing ``offsets`` and
+        ``data``, ``type`` is dictionary encoded over ``types``, and
+        ``prefix_source`` and ``error_code`` are ``int8`` columns.
+
+        Returns:
+            pyarrow.RecordBatch with ``component``, ``type``,
+            ``prefix_source`` and ``error_code`` columns
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError('ComponentColumns.to_arrow requires pyarrow (pip install pyarrow)') from None
+
+        rows = len(self)
+        component = pa.Array.from_buffers(
+            pa.string(),
+            rows,
+            [pa.py_buffer(self.validity_bitmap()), pa.py_buffer(self.offsets), pa.py_buffer(self.data)],
+        )
+        type_valid = _bitmap(code != TYPE_CODE_NULL for code in self.type_codes)
+        type_indices = pa.Array.from_buffers(
+            pa.int32(), rows, [pa.py_buffer(type_valid), pa.py_buffer(self.type_codes)]
+        )
+        ptype = pa.DictionaryArray.from_arrays(type_indices, pa.array(self.types, type=pa.string()))
+        return pa.RecordBatch.from_arrays(
+            [
+                component,
+                ptype,
+                pa.Array.from_buffers(pa.int8(), rows, [None, pa.py_buffer(self.prefix_sources)]),
+                pa.Array.from_buffers(pa.int8(), rows, [None, pa.py_buffer(self.error_codes)]),
+            ],
+            names=['component', 'type', 'prefix_source', 'error_code'],
+        )
+
+
+def ps_component_columns_from_purls(purls: Iterable[str]) -> ComponentColumns:
+    """Resolve many PURLs straight into columnar buffers.
+
+    Uses the same rules as ``ps_component_from_purl``, but never raises for
+    invalid PURLs: failures get an empty component and a non-zero error code
+    instead, and no per-row result objects are kept.
+
+    Args:
+        purls: Iterable of PackageURL strings to parse
+
+    Returns:
+        ComponentColumns with one row per input
+
+    Raises:
+        OverflowError: If the component data exceeds the 2 GiB int32 offsets
+    """
+    columns = ComponentColumns()
+    offsets = columns.offsets
+    data = columns.data
+    types = columns.types
+    type_codes = columns.type_codes
+    prefix_source_names = columns.prefix_source_names
+    prefix_sources = columns.prefix_sources
+    error_codes = columns.error_codes
+    type_index: Dict[str, int] = {}
+    prefix_source_index = {name: code for code, name in enumerate(prefix_source_names)}
+
+    for purl in purls:
+        if not purl or not isinstance(purl, str):
+            _append_failure(columns, TYPE_CODE_NULL, ERROR_INVALID_INPUT)
+            continue
+        try:
+            fields = _purl_fields(purl)
+        except ValueError:
+            _append_failure(columns, TYPE_CODE_NULL, ERROR_INVALID_FORMAT)
+            continue
+
+        ptype = fields[0]
+        type_code = type_index.get(ptype)
+        if type_code is None:
+            type_code = type_index[ptype] = len(types)
+            types.append(ptype)
+
+        try:
+            prefix_source, prefix = _prefix_from_fields(fields)
+        except ValueError as e:
+            _append_failure(columns, type_code, _error_status(e))
+            continue
+
+        source_code = prefix_source_index.get(prefix_source)
+        if source_code is None:
+            source_code = prefix_source_index[prefix_source] = len(prefix_source_names)
+            prefix_source_names.append(prefix_source)
+
+        if prefix is None:
+            data += fields[2].encode('utf-8', 'surrogatepass')
+        else:
+            data += f"{prefix}/{fields[2]}".encode('utf-8', 'surrogatepass')
+        offsets.append(len(data))
+        type_codes.append(type_code)
+        prefix_sources.append(source_code)
+        error_codes.append(ERROR_NONE)
+
+    return columns
+
+
+def _bitmap(flags: Iterable[bool]) -> bytes:
+    """Pack flags into a least-significant-bit-first bitmap."""
+    bitmap = bytearray()
+    byte = 0
+    bit = 1
+    for flag in flags:
+        if flag:
+            byte |= bit
+        bit <<= 1
+        if bit == 0x100:
+            bitmap.append(byte)
+            byte = 0
+            bit = 1
+    if bit != 1:
+        bitmap.append(byte)
+    return bytes(bitmap)
+
+
+def _append_failure(columns: ComponentColumns, type_code: int, error_code: int) -> None:
+    columns.offsets.append(columns.offsets[-1])
+    columns.type_codes.append(type_code)
+    columns.prefix_sources.append(PREFIX_SOURCE_NULL)
+    columns.error_codes.append(error_code)
@@ -2,7 +2,79 @@
 Core functionality for PURL parsing and component extraction.
 """
 
-from packageurl import PackageURL
+import string
+import sys
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, Union
+from urllib.parse import unquote
+
+if TYPE_CHECKING:
+    from packageurl import PackageURL
+
+
+ERRORS_RAISE = 'raise'
+ERRORS_SKIP = 'skip'
+ERRORS_RETURN = 'return'
+
+_ERROR_POLICIES = (ERRORS_RAISE, ERRORS_SKIP, ERRORS_RETURN)
+
+T = TypeVar('T')
+
+# The fields component extraction needs: (type, namespace, name, rpmmod, repository_url)
+PurlFields = Tuple[str, Optional[str], str, Optional[str], Optional[str]]
+
+# Where the component prefix comes from
+PREFIX_OCI_REPOSITORY = 'oci_repository'
+PREFIX_RPMMOD = 'rpmmod'
+PREFIX_NAMESPACE = 'namespace'
+PREFIX_NONE = 'none'
+
+# A component rule maps the fields of a PURL to (prefix source, prefix); the
+# component is ``prefix/name``, or just ``name`` when the prefix is None
+ComponentRule = Callable[[PurlFields], Tuple[str, Optional[str]]]
+
+
+class RuleError(ValueError):
+    """ValueError raised by a component rule that rejects a PURL.
+
+    ``status`` is the name of the status the failure is reported as by
+    ``particular_purl_parse.status`` and instrumentation. Rules may raise
+    a plain ValueError too, which is reported as ``'rule_failed'``.
+    """
+
+    status = 'rule_failed'
+
+
+class MissingRepositoryURLError(RuleError):
+    """The PURL has no repository_url qualifier."""
+
+    status = 'missing_repository_url'
+
+
+class InvalidRepositoryURLError(RuleError):
+    """The repository_url qualifier of the PURL has too few path segments."""
+
+    status = 'invalid_repository_url'
+
+_IDENTIFIER_CHARS = frozenset(string.ascii_letters + string.digits + '.-_')
+
+# The normalization below mirrors packageurl-python 0.17.6, the minimum
+# required version; earlier releases lowercase fewer types
+
+# Types whose names packageurl-python lowercases (see packageurl.normalize_name)
+_LOWERCASE_NAME_TYPES = frozenset({
+    'bitbucket', 'github', 'pypi', 'gitlab', 'composer', 'luarocks', 'oci',
+    'npm', 'alpm', 'apk', 'bitnami', 'hex', 'pub',
+})
+
+# Types whose namespaces packageurl-python lowercases (see packageurl.normalize_namespace)
+_LOWERCASE_NAMESPACE_TYPES = frozenset({
+    'bitbucket', 'github', 'pypi', 'gitlab', 'composer', 'luarocks', 'qpkg',
+    'alpm', 'apk', 'hex',
+})
+
+# Instrumented replacement for ps_component_from_purl, installed by
+# particular_purl_parse.instrumentation while a recorder is set
+_instrumented_resolve: Optional[Callable[[str], str]] = None
 
 
 def ps_component_from_purl(purl: str) -> str:
@@ -17,25 +89,295 @@ def ps_component_from_purl(purl: str) -> str:
     Raises:
         ValueError: If the PURL is invalid or missing required qualifiers
     """
+    if _instrumented_resolve is not None:
+        return _instrumented_resolve(purl)
+
     if not purl or not isinstance(purl, str):
         raise ValueError('PURL must be a non-empty string')
     
+    return _component_from_fields(_purl_fields(purl))
+
+
+def ps_components_from_purls(
+    purls: Iterable[str],
+    errors: str = ERRORS_RAISE,
+    resolver: Optional[Callable[[str], str]] = None,
+    intern: bool = False,
+    dedupe: bool = False,
+) -> List[Union[str, ValueError]]:
+    """Extract component names from many PackageURL strings.
+
+    A convenience wrapper calling the resolver once per PURL, with no
+    per-PURL saving over a loop of ``ps_component_from_purl`` calls; pass
+    ``dedupe=True`` to parse repeated PURLs only once, or see
+    ``ps_component_batch_from_purls`` for inputs with many failures.
+
+    Results are returned in input order. The per-item error policy decides
+    what happens to PURLs that ``ps_component_from_purl`` would reject:
+    ``'raise'`` propagates the first ValueError, ``'skip'`` drops the item
+    and ``'return'`` puts the ValueError in its place.
+
+    Args:
+        purls: Iterable of PackageURL strings to parse
+        errors: Error policy, one of ``'raise'``, ``'skip'`` or ``'return'``
+        resolver: Single-PURL resolver to use instead of
+            ``ps_component_from_purl``, e.g. a ``ComponentCache``
+        intern: Intern the component strings with ``sys.intern`` so equal
+            components share one string object, across calls too
+        dedupe: Resolve PURLs with the same ``canonical_purl_key`` only
+            once and copy the result to the others; a ValueError is then
+            the one raised for the first such PURL
+
+    Returns:
+        List of component name strings (and ValueErrors with ``'return'``)
+
+    Raises:
+        ValueError: If the error policy is unknown, or on the first invalid
+            PURL when the policy is ``'raise'``
+    """
+    _check_error_policy(errors)
+
+    resolve = ps_component_from_purl if resolver is None else resolver
+    if dedupe:
+        from .canonical import _resolve_deduped
+
+        results = _resolve_deduped(purls, errors, resolve)
+    else:
+        results = _resolve_batch(purls, errors, resolve)
+    if intern:
+        return _intern_components(results)
+    return results
+
+
+def _resolve_batch(
+    purls: Iterable[str], errors: str, resolve: Callable[[str], T]
+) -> List[Union[T, ValueError]]:
+    """Apply a single-PURL resolver to each of many PURLs under a checked error policy."""
+    if errors == ERRORS_RAISE:
+        return [resolve(purl) for purl in purls]
+
+    results: List[Union[T, ValueError]] = []
+    append = results.append
+    keep_errors = errors == ERRORS_RETURN
+    for purl in purls:
+        try:
+            append(resolve(purl))
+        except ValueError as e:
+            if keep_errors:
+                append(e)
+    return results
+
+
+def _intern_components(results: List[Union[str, ValueError]]) -> List[Union[str, ValueError]]:
+    """Replace component strings in a batch result with their interned copies."""
+    intern = sys.intern
+    return [intern(result) if result.__class__ is str else result for result in results]
+
+
+def _check_error_policy(errors: str) -> None:
+    """Raise ValueError if errors is not a known batch error policy."""
+    if errors not in _ERROR_POLICIES:
+        raise ValueError(
+            f'Invalid errors policy {errors!r}: expected one of {", ".join(_ERROR_POLICIES)}'
+        )
+
+
+def _purl_fields(purl: str) -> PurlFields:
+    """Extract the fields needed for component extraction from a PURL string.
+
+    Uses the fast scanner and falls back to a full ``PackageURL`` parse for
+    inputs the scanner does not handle.
+
+    Args:
+        purl: Non-empty PackageURL string
+
+    Returns:
+        Tuple of (type, namespace, name, rpmmod, repository_url)
+
+    Raises:
+        ValueError: If the PURL cannot be parsed
+    """
+    fields = _scan_purl(purl)
+    if fields is not None:
+        return fields
+
+    return _parse_purl_fields(purl)
+
+
+def _parse_purl_fields(purl: str) -> PurlFields:
+    """Extract the component extraction fields with a full ``PackageURL`` parse.
+
+    Args:
+        purl: Non-empty PackageURL string
+
+    Returns:
+        Tuple of (type, namespace, name, rpmmod, repository_url)
+
+    Raises:
+        ValueError: If ``PackageURL.from_string`` rejects the PURL
+    """
+    # packageurl is only imported once a PURL needs the full parse, to keep
+    # the package import cheap for short-lived processes
+    from packageurl import PackageURL
+
     try:
         parsed_purl = PackageURL.from_string(purl)
     except Exception as e:
         raise ValueError(f'Invalid PURL format: {e}')
-    
-    if parsed_purl.type == 'oci':
-        return _ps_component_oci(parsed_purl)
-    
-    rpmmod = parsed_purl.qualifiers.get('rpmmod')
+
+    qualifiers = parsed_purl.qualifiers
+    return (
+        parsed_purl.type,
+        parsed_purl.namespace,
+        parsed_purl.name,
+        qualifiers.get('rpmmod'),
+        qualifiers.get('repository_url'),
+    )
+
+
+def _scan_purl(purl: str) -> Optional[PurlFields]:
+    """Scan a PURL string for the fields needed for component extraction.
+
+    Only the type, namespace, name and the ``rpmmod``/``repository_url`` qualifiers are
+    extracted, percent-decoding only the parts that contain escapes. The
+    results match ``PackageURL.from_string`` for the inputs handled here;
+    anything outside the plain ``pkg:type/namespace/name@version?qualifiers#subpath``
+    grammar (whitespace, control characters, colons in the path, npm scopes,
+    types with special name rules) and anything ``PackageURL`` would reject
+    returns None so that the caller can fall back to a full parse.
+
+    Args:
+        purl: Non-empty PackageURL string
+
+    Returns:
+        Tuple of (type, namespace, name, rpmmod, repository_url), or None if the string
+        must be parsed with ``PackageURL``
+    """
+    if not purl.startswith('pkg:') or ' ' in purl or not purl.isprintable():
+        return None
+
+    ptype, sep, remainder = purl[4:].partition('/')
+    if not sep or not ptype or ptype[0] in string.digits or not _IDENTIFIER_CHARS.issuperset(ptype):
+        return None
+    ptype = ptype.lower()
+    # packageurl-python tests ``ptype in ("mlflow")``, a substring check, and
+    # applies extra rules to pub names
+    if ptype in 'mlflow' or ptype == 'pub':
+        return None
+
+    remainder = remainder.partition('#')[0]
+    path, _, qualifiers = remainder.partition('?')
+    if not path or path[0] == '/' or ':' in path or (ptype == 'npm' and path[0] == '@'):
+        return None
+
+    remainder, sep, _ = path.rpartition('@')
+    if not sep:
+        remainder = path
+    namespace, _, name = remainder.rpartition('/')
+    if not name:
+        return None
+    if '%' in name:
+        name = unquote(name)
+        if not name or name != name.strip().strip('/'):
+            return None
+    if ptype in _LOWERCASE_NAME_TYPES:
+        name = name.lower()
+    if ptype == 'pypi' or ptype == 'hackage':
+        name = name.replace('_', '-')
+
+    if namespace:
+        segments = [segment for segment in namespace.split('/') if segment]
+        if '%' in namespace:
+            segments = [unquote(segment) for segment in segments]
+            # packageurl-python normalizes twice; leave decoded slashes and
+            # blank segments to it
+            for segment in segments:
+                if '/' in segment or not segment or segment != segment.strip():
+                    return None
+        namespace = '/'.join(segments) or None
+        if namespace is not None:
+            if ptype in _LOWERCASE_NAMESPACE_TYPES:
+                namespace = namespace.lower()
+            # Another substring check in packageurl-python: ``ptype in ("cpan")``
+            elif ptype in 'cpan':
+                namespace = namespace.upper()
+    else:
+        namespace = None
+
+    rpmmod = None
+    repository_url = None
+    if qualifiers:
+        for pair in qualifiers.split('&'):
+            key, sep, value = pair.partition('=')
+            if not sep:
+                return None
+            if not key or not value:
+                continue
+            key = key.lower()
+            if key[0] in string.digits or not _IDENTIFIER_CHARS.issuperset(key):
+                return None
+            if '%' in value:
+                value = unquote(value)
+            # PackageURL drops a blank decoded value only after it has
+            # replaced an earlier one for the same key
+            field = value if value.strip() else None
+            if key == 'rpmmod':
+                rpmmod = field
+            elif key == 'repository_url':
+                repository_url = field
+
+    return ptype, namespace, name, rpmmod, repository_url
+
+
+def _component_from_fields(fields: PurlFields) -> str:
+    """Build the component name from extracted PURL fields.
+
+    Args:
+        fields: Tuple of (type, namespace, name, rpmmod, repository_url)
+
+    Returns:
+        Component name string
+
+    Raises:
+        ValueError: If the rule for the PURL type rejects the fields, e.g. an
+            OCI PURL with a missing or invalid repository_url
+    """
+    return _join_component(_prefix_from_fields(fields)[1], fields[2])
+
+
+def _join_component(prefix: Optional[str], name: str) -> str:
+    """Return ``prefix/name``, or name when there is no prefix."""
+    if prefix is None:
+        return name
+
+    return f"{prefix}/{name}"
+
+
+def _prefix_from_fields(fields: PurlFields) -> Tuple[str, Optional[str]]:
+    """Apply the rule for the PURL type, returning (prefix source, prefix)."""
+    return _RULES.get(fields[0], _rpmmod_rule)(fields)
+
+
+def _rpmmod_rule(fields: PurlFields) -> Tuple[str, Optional[str]]:
+    """Default rule: prefix with the rpmmod qualifier, if present."""
+    rpmmod = fields[3]
     if rpmmod:
-        return f"{rpmmod}/{parsed_purl.name}"
-    
-    return parsed_purl.name
+        return PREFIX_RPMMOD, rpmmod
+
+    return PREFIX_NONE, None
 
 
-def _ps_component_oci(parsed_purl: PackageURL) -> str:
+def _oci_rule(fields: PurlFields) -> Tuple[str, Optional[str]]:
+    """OCI rule: prefix with the second repository_url path segment."""
+    return PREFIX_OCI_REPOSITORY, _oci_prefix(fields[4])
+
+
+# Dispatch table of component rules by PURL type; types without an entry use
+# _rpmmod_rule. Managed through particular_purl_parse.rules.
+_RULES: Dict[str, ComponentRule] = {'oci': _oci_rule}
+
+
+def _ps_component_oci(parsed_purl: 'PackageURL') -> str:
     """Handle OCI type PackageURL component extraction.
     
     Args:
@@ -47,13 +389,27 @@ def _ps_component_oci(parsed_purl: PackageURL) -> str:
     Raises:
         ValueError: If repository_url is missing or invalid
     """
-    repository_url = parsed_purl.qualifiers.get('repository_url')
+    return f"{_oci_prefix(parsed_purl.qualifiers.get('repository_url'))}/{parsed_purl.name}"
+
+
+def _oci_prefix(repository_url: Optional[str], segment: int = 1) -> str:
+    """Extract the component prefix from an OCI repository_url qualifier.
+    
+    Args:
+        repository_url: Value of the repository_url qualifier, if any
+        segment: Index of the ``/``-separated path segment to use
+        
+    Returns:
+        Path segment of the repository URL, by default the second
+        
+    Raises:
+        MissingRepositoryURLError: If repository_url is missing
+        InvalidRepositoryURLError: If repository_url has too few path segments
+    """
     if not repository_url:
-        raise ValueError('Missing repository_url in OCI PURL')
+        raise MissingRepositoryURLError('Missing repository_url in OCI PURL')
     
     try:
-        prefix = repository_url.split('/')[1]
+        return repository_url.split('/')[segment]
     except IndexError:
-        raise ValueError('Invalid repository_url in OCI PURL: insufficient path components')
-    
-    return f"{prefix}/{parsed_purl.name}" 
\ No newline at end of file
+        raise InvalidRepositoryURLError('Invalid repository_url in OCI PURL: insufficient path components')
@@ -0,0 +1,214 @@
+"""
+Streaming diff of the component sets of two snapshots, e.g. SBOMs of two days.
+"""
+
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+
+from .core import _component_from_fields, _purl_fields
+
+
+CHANGE_ADDED = 'added'
+CHANGE_REMOVED = 'removed'
+CHANGE_CHANGED = 'changed'
+
+CHANGES = (CHANGE_ADDED, CHANGE_REMOVED, CHANGE_CHANGED)
+
+# PURLs read from one snapshot before switching to the other
+INTERLEAVE_CHUNK = 1024
+
+# Package and component of a PURL, or its error
+_Resolution = Union[Tuple[str, str], ValueError]
+
+
+class DiffRecord(NamedTuple):
+    """One difference between the old and the new snapshot.
+
+    Attributes:
+        change: ``'added'`` or ``'removed'`` for a component found in only
+            one snapshot; ``'changed'`` for a package found in both whose
+            components differ
+        key: The component, or for ``'changed'`` the package
+            (``type/namespace/name``, or ``type/name``)
+        old_count: PURLs of the component or package in the old snapshot
+        new_count: PURLs of the component or package in the new snapshot
+        old_components: Sorted components of the package in the old
+            snapshot (``'changed'`` only, empty otherwise)
+        new_components: Sorted components of the package in the new
+            snapshot (``'changed'`` only, empty otherwise)
+    """
+
+    change: str
+    key: str
+    old_count: int
+    new_count: int
+    old_components: Tuple[str, ...] = ()
+    new_components: Tuple[str, ...] = ()
+
+
+class _Snapshot:
+    """Per-snapshot counts; nothing is kept per PURL."""
+
+    __slots__ = ('purls', 'errors', 'components', 'packages')
+
+    def __init__(self) -> None:
+        self.purls = 0
+        self.errors = 0
+        self.components: Dict[str, int] = {}
+        # Component counts per package
+        self.packages: Dict[str, Dict[str, int]] = {}
+
+
+class ComponentDiff:
+    """Diff of the components two streams of PURLs resolve to.
+
+    Feed the old snapshot with ``add_old`` and the new one with
+    ``add_new``, in any number of calls each, then read ``records`` and
+    ``summary``. Inputs are consumed as they stream; memory grows with the
+    number of distinct components and packages, plus a cache of
+    resolutions shared by both snapshots. By default the cache keeps every
+    distinct PURL, so each one is resolved exactly once and memory also
+    grows with the number of distinct PURLs.
+
+    Besides components that appear or disappear, the diff reports packages
+    (PURLs without version, qualifiers or subpath) that map to other
+    components than before, e.g. an RPM moved to another module. PURLs that
+    fail to resolve are only counted. Instances are not thread-safe.
+
+    Args:
+        cache_size: Resolutions kept in an LRU cache, or None (the
+            default) for no limit. A bounded cache caps memory, but PURLs
+            evicted from it are resolved again when they recur, so repeats
+            further apart than the cache size are parsed more than once
+
+    Raises:
+        ValueError: If cache_size is not a positive integer or None
+    """
+
+    def __init__(self, cache_size: Optional[int] = None) -> None:
+        if cache_size is not None and (not isinstance(cache_size, int) or cache_size <= 0):
+            raise ValueError(f'cache_size must be a positive integer or None, got {cache_size!r}')
+
+        self.old = _Snapshot()
+        self.new = _Snapshot()
+        self._resolve: Callable[[str], _Resolution] = lru_cache(maxsize=cache_size)(_resolve)
+
+    def add_old(self, purls: Iterable[str]) -> None:
+        """Add PURLs of the old snapshot."""
+        self._add(self.old, purls)
+
+    def add_new(self, purls: Iterable[str]) -> None:
+        """Add PURLs of the new snapshot."""
+        self._add(self.new, purls)
+
+    def records(self) -> Iterator[DiffRecord]:
+        """Yield the removed, then the added components, then the changed packages, each sorted."""
+        old, new = self.old, self.new
+        for component in sorted(old.components.keys() - new.components.keys()):
+            yield DiffRecord(CHANGE_REMOVED, component, old.components[component], 0)
+        for component in sorted(new.components.keys() - old.components.keys()):
+            yield DiffRecord(CHANGE_ADDED, component, 0, new.components[component])
+        for package in sorted(old.packages.keys() & new.packages.keys()):
+            old_components = old.packages[package]
+            new_components = new.packages[package]
+            if old_components.keys() != new_components.keys():
+                yield DiffRecord(
+                    CHANGE_CHANGED,
+                    package,
+                    sum(old_components.values()),
+                    sum(new_components.values()),
+                    tuple(sorted(old_components)),
+                    tuple(sorted(new_components)),
+                )
+
+    def summary(self) -> Dict[str, int]:
+        """Return the counts of both snapshots and of the differences.
+
+        Returns:
+            Dictionary with ``old_purls``, ``old_errors``,
+            ``old_components``, the same for ``new``, the number of
+            ``added``, ``removed``, ``unchanged`` components and ``changed``
+            packages, and ``resolutions`` (PURLs actually parsed)
+        """
+        old, new = self.old, self.new
+        changes = dict.fromkeys(CHANGES, 0)
+        for record in self.records():
+            changes[record.change] += 1
+        return {
+            'old_purls': old.purls,
+            'old_errors': old.errors,
+            'old_components': len(old.components),
+            'new_purls': new.purls,
+            'new_errors': new.errors,
+            'new_components': len(new.components),
+            **changes,
+            'unchanged': len(old.components.keys() & new.components.keys()),
+            'resolutions': self._resolve.cache_info().misses,  # type: ignore[attr-defined]
+        }
+
+    def _add(self, snapshot: _Snapshot, purls: Iterable[str]) -> None:
+        resolve = self._resolve
+        components = snapshot.components
+        packages = snapshot.packages
+        for purl in purls:
+            snapshot.purls += 1
+            if not purl or purl.__class__ is not str:
+                snapshot.errors += 1
+                continue
+            resolution = resolve(purl)
+            if resolution.__class__ is ValueError:
+                snapshot.errors += 1
+                continue
+            package, component = resolution  # type: ignore[misc]
+            components[component] = components.get(component, 0) + 1
+            package_components = packages.get(package)
+            if package_components is None:
+                packages[package] = {component: 1}
+            else:
+                package_components[component] = package_components.get(component, 0) + 1
+
+
+def diff_components(
+    old_purls: Iterable[str],
+    new_purls: Iterable[str],
+    cache_size: Optional[int] = None,
+) -> ComponentDiff:
+    """Diff the components of two streams of PURLs.
+
+    Both streams are read in alternating chunks, so with a bounded cache a
+    PURL found in both is usually still cached when the other snapshot
+    reaches it, as long as the snapshots list their PURLs in similar order.
+
+    Args:
+        old_purls: PURLs of the old snapshot
+        new_purls: PURLs of the new snapshot
+        cache_size: Resolutions kept in the cache, as for ``ComponentDiff``
+
+    Returns:
+        ComponentDiff with both snapshots added
+
+    Raises:
+        ValueError: If cache_size is not a positive integer or None
+    """
+    diff = ComponentDiff(cache_size)
+    old_purls = iter(old_purls)
+    new_purls = iter(new_purls)
+    while True:
+        old_chunk = list(islice(old_purls, INTERLEAVE_CHUNK))
+        new_chunk = list(islice(new_purls, INTERLEAVE_CHUNK))
+        if not old_chunk and not new_chunk:
+            return diff
+        diff.add_old(old_chunk)
+        diff.add_new(new_chunk)
+
+
+def _resolve(purl: str) -> _Resolution:
+    try:
+        fields = _purl_fields(purl)
+        component = _component_from_fields(fields)
+    except ValueError as e:
+        # A fresh exception, so the cache doesn't pin traceback frames
+        return ValueError(*e.args)
+    ptype, namespace, name = fields[:3]
+    return (f'{ptype}/{namespace}/{name}' if namespace else f'{ptype}/{name}'), component
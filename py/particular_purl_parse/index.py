@@ -0,0 +1,355 @@
+"""
+Reverse index from resolved components (and facets) to PURL ids.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional
+
+from .core import ERRORS_RAISE, ERRORS_RETURN, _check_error_policy
+from .records import ps_component_record_from_purl
+
+
+# Fields with postings; every field except component is a facet
+FIELD_COMPONENT = 'component'
+FIELD_TYPE = 'type'
+FIELD_PREFIX = 'prefix'
+FIELD_PREFIX_SOURCE = 'prefix_source'
+
+FIELDS = (FIELD_COMPONENT, FIELD_TYPE, FIELD_PREFIX, FIELD_PREFIX_SOURCE)
+
+# Term code of ids without a value for a field: failed, removed, or no prefix
+NO_TERM = -1
+
+
+class ComponentIndex:
+    """In-memory reverse index of PURLs by component, type and prefix.
+
+    Every added PURL gets the next integer id, starting at 0, so the ids of
+    a single ``add_many`` batch on an empty index are the input positions.
+    Ids are never reused: removing a PURL leaves a gap. For each field in
+    ``FIELDS`` the index keeps one posting per distinct value: a sorted,
+    signed 32-bit ``array.array`` of ids. Queries are dictionary lookups plus
+    intersections of postings; PURLs are never parsed again.
+
+    PURLs that fail to resolve in ``add_many`` (with the ``'skip'`` and
+    ``'return'`` policies) still take an id but appear in no posting; see
+    ``failed_ids``. Instances are not thread-safe.
+
+    Attributes:
+        errors: ValueErrors of failed PURLs by id (only filled with the
+            ``'return'`` error policy)
+    """
+
+    def __init__(self) -> None:
+        self.errors: Dict[int, ValueError] = {}
+        self._purls: List[Optional[str]] = []
+        # 1 per id until it is removed
+        self._alive = bytearray()
+        self._live = 0
+        self._codes = {field: array('i') for field in FIELDS}
+        self._terms: Dict[str, Dict[str, int]] = {field: {} for field in FIELDS}
+        self._values: Dict[str, List[str]] = {field: [] for field in FIELDS}
+        self._postings: Dict[str, List['array[int]']] = {field: [] for field in FIELDS}
+
+    def __len__(self) -> int:
+        """Return the number of ids that have not been removed."""
+        return self._live
+
+    def __contains__(self, component: object) -> bool:
+        """Return whether any PURL maps to a component."""
+        return bool(self._posting(FIELD_COMPONENT, component))
+
+    def __repr__(self) -> str:
+        return (
+            f"ComponentIndex(purls={self._live}, components={len(self.components())}, "
+            f"errors={len(self.errors)})"
+        )
+
+    def add(self, purl: str) -> int:
+        """Resolve a PURL and index it under the next id.
+
+        Args:
+            purl: PackageURL string to parse
+
+        Returns:
+            Id of the PURL
+
+        Raises:
+            ValueError: If the PURL is invalid or missing required
+                qualifiers; no id is taken
+        """
+        record = ps_component_record_from_purl(purl)
+        purl_id = self._new_id(purl)
+        self._index(purl_id, FIELD_COMPONENT, record.component)
+        self._index(purl_id, FIELD_TYPE, record.type)
+        self._index(purl_id, FIELD_PREFIX, record.prefix)
+        self._index(purl_id, FIELD_PREFIX_SOURCE, record.prefix_source)
+        return purl_id
+
+    def add_many(self, purls: Iterable[str], errors: str = ERRORS_RAISE) -> range:
+        """Resolve and index many PURLs under consecutive ids.
+
+        Args:
+            purls: Iterable of PackageURL strings to parse
+            errors: Error policy: ``'raise'`` propagates the first ValueError,
+                leaving the PURLs before it indexed; with ``'skip'`` and
+                ``'return'`` failed PURLs take an id without postings, and
+                ``'return'`` also records the ValueError in ``errors``
+
+        Returns:
+            Range of the ids given to the PURLs
+
+        Raises:
+            ValueError: If the error policy is unknown, or on the first
+                invalid PURL when the policy is ``'raise'``
+        """
+        _check_error_policy(errors)
+
+        first = len(self._purls)
+        raise_errors = errors == ERRORS_RAISE
+        keep_errors = errors == ERRORS_RETURN
+        for purl in purls:
+            try:
+                self.add(purl)
+            except ValueError as e:
+                if raise_errors:
+                    raise
+                purl_id = self._new_id(purl)
+                for field in FIELDS:
+                    self._codes[field].append(NO_TERM)
+                if keep_errors:
+                    self.errors[purl_id] = e
+        return range(first, len(self._purls))
+
+    def remove(self, purl_id: int) -> None:
+        """Remove a PURL from the index.
+
+        Deleting from a posting shifts the ids after it, so each call costs
+        time linear in the postings of the PURL, e.g. in the number of PURLs
+        of its type. Use ``remove_many`` to remove many PURLs at once.
+
+        Args:
+            purl_id: Id returned when the PURL was added
+
+        Raises:
+            ValueError: If the id is unknown or already removed
+        """
+        self._check_alive(purl_id)
+
+        for field in FIELDS:
+            codes = self._codes[field]
+            code = codes[purl_id]
+            if code != NO_TERM:
+                posting = self._postings[field][code]
+                del posting[bisect_left(posting, purl_id)]
+                codes[purl_id] = NO_TERM
+        self._purls[purl_id] = None
+        self._alive[purl_id] = 0
+        self.errors.pop(purl_id, None)
+        self._live -= 1
+
+    def remove_many(self, purl_ids: Iterable[int]) -> None:
+        """Remove many PURLs from the index, rebuilding each posting once.
+
+        Args:
+            purl_ids: Ids returned when the PURLs were added
+
+        Raises:
+            ValueError: If an id is unknown, already removed or given twice;
+                nothing is removed then
+        """
+        removed = set()
+        for purl_id in purl_ids:
+            self._check_alive(purl_id)
+            if purl_id in removed:
+                raise ValueError(f'PURL id {purl_id!r} given more than once')
+            removed.add(purl_id)
+
+        alive = self._alive
+        for purl_id in removed:
+            self._purls[purl_id] = None
+            alive[purl_id] = 0
+            self.errors.pop(purl_id, None)
+        for field in FIELDS:
+            codes = self._codes[field]
+            touched = set()
+            for purl_id in removed:
+                code = codes[purl_id]
+                if code != NO_TERM:
+                    touched.add(code)
+                    codes[purl_id] = NO_TERM
+            postings = self._postings[field]
+            for code in touched:
+                postings[code] = array('i', [purl_id for purl_id in postings[code] if alive[purl_id]])
+        self._live -= len(removed)
+
+    def purl(self, purl_id: int) -> Optional[str]:
+        """Return the PURL (or failed input) with an id, or None if it was removed."""
+        return self._purls[purl_id]
+
+    def component(self, purl_id: int) -> Optional[str]:
+        """Return the component of a PURL id, or None if it failed or was removed."""
+        code = self._codes[FIELD_COMPONENT][purl_id]
+        return None if code == NO_TERM else self._values[FIELD_COMPONENT][code]
+
+    def ids(self, component: str) -> 'array[int]':
+        """Return the sorted ids of the PURLs mapping to a component.
+
+        Returns:
+            Copy of the posting as a signed 32-bit ``array.array``, empty if
+            no PURL maps to the component
+        """
+        return array('i', self._posting(FIELD_COMPONENT, component))
+
+    def purls(self, component: str) -> List[str]:
+        """Return the PURLs mapping to a component, in id order."""
+        purls = self._purls
+        return [purls[purl_id] for purl_id in self._posting(FIELD_COMPONENT, component)]  # type: ignore[misc]
+
+    def count(self, component: str) -> int:
+        """Return the number of PURLs mapping to a component."""
+        return len(self._posting(FIELD_COMPONENT, component))
+
+    def components(self) -> List[str]:
+        """Return the components with at least one PURL, in order of first appearance."""
+        return self.values(FIELD_COMPONENT)
+
+    def values(self, field: str) -> List[str]:
+        """Return the values of a field with at least one PURL.
+
+        Args:
+            field: One of ``FIELDS``
+
+        Raises:
+            ValueError: If the field is unknown
+        """
+        _check_field(field)
+        postings = self._postings[field]
+        return [value for value, posting in zip(self._values[field], postings) if posting]
+
+    def counts(self, field: str = FIELD_COMPONENT) -> Dict[str, int]:
+        """Return the number of PURLs per value of a field, e.g. per type.
+
+        Args:
+            field: One of ``FIELDS``
+
+        Raises:
+            ValueError: If the field is unknown
+        """
+        _check_field(field)
+        postings = self._postings[field]
+        return {value: len(posting) for value, posting in zip(self._values[field], postings) if posting}
+
+    def query(
+        self,
+        component: Optional[str] = None,
+        type: Optional[str] = None,
+        prefix: Optional[str] = None,
+        prefix_source: Optional[str] = None,
+    ) -> 'array[int]':
+        """Return the sorted ids of the PURLs matching every given value.
+
+        For example ``query(type='oci', prefix='library')`` finds the OCI
+        images from the ``library`` repository. Postings are intersected
+        starting from the shortest, with a binary search in the others.
+
+        Args:
+            component: Component name string
+            type: PURL type
+            prefix: Component prefix
+            prefix_source: Prefix source, e.g. ``'rpmmod'``
+
+        Returns:
+            Signed 32-bit ``array.array`` of ids
+
+        Raises:
+            ValueError: If no value is given
+        """
+        criteria = {
+            FIELD_COMPONENT: component,
+            FIELD_TYPE: type,
+            FIELD_PREFIX: prefix,
+            FIELD_PREFIX_SOURCE: prefix_source,
+        }
+        postings = [self._posting(field, value) for field, value in criteria.items() if value is not None]
+        if not postings:
+            raise ValueError('query needs at least one of component, type, prefix or prefix_source')
+
+        postings.sort(key=len)
+        result = array('i', postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result = array('i', [purl_id for purl_id in result if _contains(posting, purl_id)])
+        return result
+
+    def failed_ids(self) -> 'array[int]':
+        """Return the sorted ids of the PURLs that failed to resolve and were not removed."""
+        alive = self._alive
+        return array('i', [
+            purl_id for purl_id, code in enumerate(self._codes[FIELD_COMPONENT])
+            if code == NO_TERM and alive[purl_id]
+        ])
+
+    def _check_alive(self, purl_id: int) -> None:
+        if not 0 <= purl_id < len(self._alive) or not self._alive[purl_id]:
+            raise ValueError(f'Unknown PURL id {purl_id!r}')
+
+    def _new_id(self, purl: Optional[str]) -> int:
+        purl_id = len(self._purls)
+        self._purls.append(purl)
+        self._alive.append(1)
+        self._live += 1
+        return purl_id
+
+    def _index(self, purl_id: int, field: str, value: Optional[str]) -> None:
+        if value is None:
+            self._codes[field].append(NO_TERM)
+            return
+
+        terms = self._terms[field]
+        code = terms.get(value)
+        if code is None:
+            code = terms[value] = len(self._values[field])
+            self._values[field].append(value)
+            self._postings[field].append(array('i'))
+        self._codes[field].append(code)
+        # Ids only grow, so appending keeps postings sorted
+        self._postings[field][code].append(purl_id)
+
+    def _posting(self, field: str, value: object) -> 'array[int]':
+        code = self._terms[field].get(value)  # type: ignore[arg-type]
+        return _EMPTY if code is None else self._postings[field][code]
+
+
+_EMPTY: 'array[int]' = array('i')
+
+
+def ps_component_index_from_purls(purls: Iterable[str], errors: str = ERRORS_RAISE) -> ComponentIndex:
+    """Resolve many PURLs into a reverse index whose ids are input positions.
+
+    Args:
+        purls: Iterable of PackageURL strings to parse
+        errors: Error policy, as for ``ComponentIndex.add_many``
+
+    Returns:
+        ComponentIndex
+
+    Raises:
+        ValueError: If the error policy is unknown, or on the first invalid
+            PURL when the policy is ``'raise'``
+    """
+    index = ComponentIndex()
+    index.add_many(purls, errors)
+    return index
+
+
+def _check_field(field: str) -> None:
+    if field not in FIELDS:
+        raise ValueError(f"Unknown field {field!r}; expected one of {', '.join(FIELDS)}")
+
+
+def _contains(posting: 'array[int]', purl_id: int) -> bool:
+    position = bisect_left(posting, purl_id)
+    return position < len(posting) and posting[position] == purl_id
@@ -0,0 +1,221 @@
+"""
+Opt-in instrumentation of ps_component_from_purl.
+
+While a recorder is installed, every ``ps_component_from_purl`` call reports
+which branch it took, why it failed and how long each stage took. That
+covers what resolves through it in this process: ``ps_components_from_purls``
+and the caches, tables, async, SBOM, store and server APIs built on it, and
+the ``resolve``, ``sbom`` and ``shard`` commands. Records, the index,
+columnar output, status codes and diffs parse PURLs without it and are not
+counted, nor are worker processes of ``ParallelResolver`` and process pools.
+Without a recorder the only cost is one global ``is None`` check per call.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from . import core
+
+
+# Counters
+PURLS_TOTAL = 'purls_total'
+BRANCH_OCI = 'branch_oci'
+BRANCH_RPMMOD = 'branch_rpmmod'
+BRANCH_NAME = 'branch_name'
+PARSE_FAST_PATH = 'parse_fast_path'
+PARSE_FALLBACK = 'parse_fallback'
+ERROR_INVALID_INPUT = 'error_invalid_input'
+ERROR_INVALID_FORMAT = 'error_invalid_format'
+ERROR_MISSING_REPOSITORY_URL = 'error_missing_repository_url'
+ERROR_INVALID_REPOSITORY_URL = 'error_invalid_repository_url'
+ERROR_RULE_FAILED = 'error_rule_failed'
+
+# Branch counters by prefix source; other sources count as branch_<source>
+_BRANCH_COUNTERS = {
+    core.PREFIX_OCI_REPOSITORY: BRANCH_OCI,
+    core.PREFIX_RPMMOD: BRANCH_RPMMOD,
+    core.PREFIX_NONE: BRANCH_NAME,
+}
+
+# Histograms, in seconds
+SCAN_SECONDS = 'scan_seconds'
+PACKAGEURL_SECONDS = 'packageurl_seconds'
+COMPONENT_SECONDS = 'component_seconds'
+
+# Upper bounds of the histogram buckets, in seconds; larger values go to +Inf
+DEFAULT_BUCKETS = (
+    0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005,
+    0.0001, 0.00025, 0.0005, 0.001, 0.01,
+)
+
+_recorder: Optional['Recorder'] = None
+
+
+class Recorder:
+    """Instrumentation callback interface.
+
+    Subclass and override both methods to forward measurements to a metrics
+    system. The methods are called on the resolving thread, so they must be
+    cheap and, if resolution runs on several threads, thread-safe. The base
+    class discards everything.
+    """
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """Add value to the counter called name."""
+
+    def observe(self, name: str, value: float) -> None:
+        """Record a duration in seconds in the histogram called name."""
+
+
+class MetricsRecorder(Recorder):
+    """Thread-safe in-memory recorder of counters and bucketed histograms.
+
+    Args:
+        buckets: Ascending upper bounds of the histogram buckets in seconds
+
+    Raises:
+        ValueError: If buckets is empty or not strictly ascending
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        bounds = tuple(buckets)
+        if not bounds or any(a >= b for a, b in zip(bounds, bounds[1:])):
+            raise ValueError(f'Histogram buckets must be strictly ascending, got {bounds!r}')
+
+        self.buckets = bounds
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        # name -> [count, sum, per-bucket counts (last one is +Inf)]
+        self._histograms: Dict[str, List[Any]] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = [0, 0.0, [0] * (len(self.buckets) + 1)]
+            histogram[0] += 1
+            histogram[1] += value
+            histogram[2][position] += 1
+
+    def counter(self, name: str) -> int:
+        """Return the current value of a counter, 0 if it was never incremented."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serializable copy of all counters and histograms.
+
+        Histogram buckets are cumulative ``[upper_bound, count]`` pairs, the
+        last with an upper bound of ``"+Inf"``, as Prometheus exposes them.
+
+        Returns:
+            Dict with ``counters`` and ``histograms`` keys
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {}
+            for name, (count, total, bucket_counts) in self._histograms.items():
+                cumulative = 0
+                buckets: List[Tuple[Any, int]] = []
+                for bound, bucket_count in zip(self.buckets + ('+Inf',), bucket_counts):
+                    cumulative += bucket_count
+                    buckets.append((bound, cumulative))
+                histograms[name] = {'count': count, 'sum': total, 'buckets': buckets}
+        return {'counters': counters, 'histograms': histograms}
+
+    def reset(self) -> None:
+        """Clear all counters and histograms."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+def set_recorder(recorder: Optional[Recorder]) -> Optional[Recorder]:
+    """Install a recorder for all threads, or remove it with None.
+
+    Args:
+        recorder: Recorder to report to, or None to disable instrumentation
+
+    Returns:
+        The previously installed recorder, if any
+    """
+    global _recorder
+    previous = _recorder
+    _recorder = recorder
+    core._instrumented_resolve = None if recorder is None else partial(_instrumented_component, recorder)
+    return previous
+
+
+def get_recorder() -> Optional[Recorder]:
+    """Return the installed recorder, or None if instrumentation is disabled."""
+    return _recorder
+
+
+@contextmanager
+def recording(recorder: Optional[Recorder] = None) -> Iterator[Recorder]:
+    """Install a recorder for the duration of a with block.
+
+    Args:
+        recorder: Recorder to install, defaulting to a new MetricsRecorder
+
+    Yields:
+        The installed recorder
+    """
+    if recorder is None:
+        recorder = MetricsRecorder()
+    previous = set_recorder(recorder)
+    try:
+        yield recorder
+    finally:
+        set_recorder(previous)
+
+
+def _instrumented_component(recorder: Recorder, purl: str) -> str:
+    """ps_component_from_purl, reporting branch, errors and stage timings."""
+    increment = recorder.increment
+    observe = recorder.observe
+    clock = time.perf_counter
+
+    increment(PURLS_TOTAL)
+    if not purl or not isinstance(purl, str):
+        increment(ERROR_INVALID_INPUT)
+        raise ValueError('PURL must be a non-empty string')
+
+    start = clock()
+    fields = core._scan_purl(purl)
+    observe(SCAN_SECONDS, clock() - start)
+    if fields is None:
+        increment(PARSE_FALLBACK)
+        start = clock()
+        try:
+            fields = core._parse_purl_fields(purl)
+        except ValueError:
+            increment(ERROR_INVALID_FORMAT)
+            raise
+        finally:
+            observe(PACKAGEURL_SECONDS, clock() - start)
+    else:
+        increment(PARSE_FAST_PATH)
+
+    start = clock()
+    try:
+        prefix_source, prefix = core._prefix_from_fields(fields)
+    except ValueError as e:
+        observe(COMPONENT_SECONDS, clock() - start)
+        # Error counters are error_<status name>, as the rule's error reports it
+        increment(f'error_{e.status}' if isinstance(e, core.RuleError) else ERROR_RULE_FAILED)
+        raise
+    component = core._join_component(prefix, fields[2])
+    observe(COMPONENT_SECONDS, clock() - start)
+
+    increment(_BRANCH_COUNTERS.get(prefix_source) or f'branch_{prefix_source}')
+    return component
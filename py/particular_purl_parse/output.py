@@ -0,0 +1,34 @@
+"""
+Output line formats shared by the command line, sharded jobs and the HTTP service.
+"""
+
+import json
+from typing import Union
+
+FORMAT_TSV = 'tsv'
+FORMAT_JSONL = 'jsonl'
+FORMATS = (FORMAT_TSV, FORMAT_JSONL)
+
+
+def format_line(purl: str, result: Union[str, ValueError], jsonl: bool) -> str:
+    """Format the output line of a resolved or failed PURL.
+
+    In TSV, a resolved PURL is written as ``purl<TAB>component`` and a failed
+    one as ``purl<TAB><TAB>error``; in JSON lines as an object with
+    ``purl`` and ``component`` or ``error`` keys.
+
+    Args:
+        purl: PackageURL string
+        result: Component name, or the ValueError the PURL failed with
+        jsonl: Format as JSON lines instead of TSV
+
+    Returns:
+        Line including the trailing newline
+    """
+    if isinstance(result, ValueError):
+        if jsonl:
+            return json.dumps({'purl': purl, 'error': str(result)}, ensure_ascii=False) + '\n'
+        return f'{purl}\t\t{result}\n'
+    if jsonl:
+        return json.dumps({'purl': purl, 'component': result}, ensure_ascii=False) + '\n'
+    return f'{purl}\t{result}\n'
@@ -0,0 +1,156 @@
+"""
+Multiprocess batch resolution of PURLs to components.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from types import TracebackType
+from typing import Deque, Iterable, Iterator, List, Optional, Type, Union
+
+from .core import ERRORS_RAISE, _check_error_policy, _intern_components, ps_components_from_purls
+
+
+DEFAULT_CHUNKSIZE = 10000
+
+
+def _resolve_chunk(chunk: List[str], errors: str, intern: bool) -> List[Union[str, ValueError]]:
+    """Worker entry point: resolve one chunk with the batch API."""
+    # Interning in the worker also lets pickle send each repeated component once
+    return ps_components_from_purls(chunk, errors=errors, intern=intern)
+
+
+class ParallelResolver:
+    """Resolve large PURL batches on a reusable pool of worker processes.
+
+    Inputs are split into chunks of ``chunksize`` PURLs and each chunk is
+    resolved by a worker with ``ps_components_from_purls``. Results come back
+    in input order. The pool is started on first use and kept alive across
+    calls until ``close()`` is called or the context manager exits. Inputs
+    that fit in a single chunk are resolved in the calling process.
+
+    Args:
+        workers: Number of worker processes (defaults to the CPU count)
+        chunksize: Number of PURLs sent to a worker at a time
+
+    Raises:
+        ValueError: If workers or chunksize is not a positive integer
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunksize: int = DEFAULT_CHUNKSIZE) -> None:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 0:
+            raise ValueError(f'workers must be a positive integer, got {workers!r}')
+        if chunksize <= 0:
+            raise ValueError(f'chunksize must be a positive integer, got {chunksize!r}')
+
+        self.workers = workers
+        self.chunksize = chunksize
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'ParallelResolver':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pool, if it was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def resolve(
+        self, purls: Iterable[str], errors: str = ERRORS_RAISE, intern: bool = False
+    ) -> List[Union[str, ValueError]]:
+        """Extract component names from many PackageURL strings in parallel.
+
+        Args:
+            purls: Iterable of PackageURL strings to parse
+            errors: Error policy, as for ``ps_components_from_purls``
+            intern: Intern component strings, as for ``ps_components_from_purls``
+
+        Returns:
+            List of component name strings (and ValueErrors with ``'return'``)
+
+        Raises:
+            ValueError: If the error policy is unknown, or on the first invalid
+                PURL when the policy is ``'raise'``
+        """
+        return list(self.iter_resolve(purls, errors, intern))
+
+    def iter_resolve(
+        self, purls: Iterable[str], errors: str = ERRORS_RAISE, intern: bool = False
+    ) -> Iterator[Union[str, ValueError]]:
+        """Lazily resolve PURLs in parallel, yielding results in input order.
+
+        At most two chunks per worker are in flight at any time, so the input
+        iterable is consumed incrementally and memory stays bounded.
+
+        Args:
+            purls: Iterable of PackageURL strings to parse
+            errors: Error policy, as for ``ps_components_from_purls``
+            intern: Intern component strings, as for ``ps_components_from_purls``
+
+        Yields:
+            Component name strings (and ValueErrors with ``'return'``)
+
+        Raises:
+            ValueError: If the error policy is unknown, or on the first invalid
+                PURL when the policy is ``'raise'``
+        """
+        _check_error_policy(errors)
+
+        chunks = self._chunks(purls)
+        first = next(chunks, None)
+        if first is None:
+            return
+        second = next(chunks, None)
+        if second is None:
+            yield from ps_components_from_purls(first, errors=errors, intern=intern)
+            return
+
+        pool = self._get_pool()
+        max_in_flight = self.workers * 2
+        pending: Deque['Future[List[Union[str, ValueError]]]'] = deque()
+        try:
+            pending.append(pool.submit(_resolve_chunk, first, errors, intern))
+            pending.append(pool.submit(_resolve_chunk, second, errors, intern))
+            for chunk in chunks:
+                if len(pending) >= max_in_flight:
+                    yield from self._chunk_results(pending.popleft(), intern)
+                pending.append(pool.submit(_resolve_chunk, chunk, errors, intern))
+            while pending:
+                yield from self._chunk_results(pending.popleft(), intern)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    @staticmethod
+    def _chunk_results(
+        future: 'Future[List[Union[str, ValueError]]]', intern: bool
+    ) -> List[Union[str, ValueError]]:
+        results = future.result()
+        # Unpickled strings are new objects; intern again to share them across chunks
+        return _intern_components(results) if intern else results
+
+    def _chunks(self, purls: Iterable[str]) -> Iterator[List[str]]:
+        iterator = iter(purls)
+        chunksize = self.chunksize
+        while True:
+            chunk = list(islice(iterator, chunksize))
+            if not chunk:
+                return
+            yield chunk
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
@@ -0,0 +1,317 @@
+"""
+Opt-in sampling profiler for bulk runs.
+
+``Profiler`` samples the call stack of the main thread on ``SIGPROF``, which
+an ``ITIMER_PROF`` interval timer raises for every interval of CPU time the
+process uses, and optionally traces allocations with ``tracemalloc``.
+Samples and allocations are attributed to the stage of the innermost frame
+that belongs to one:
+
+- ``input``: reading PURLs (input files, memory maps, SBOM documents)
+- ``parse``: extracting PURL fields (the fast scanner and ``packageurl``)
+- ``rule``: applying the component rule and building the component
+- ``output``: formatting and writing results
+- ``other``: everything else, e.g. batching and caching
+
+Nothing is installed until a profiler starts, so there is no cost when
+profiling is off. Time spent waiting (e.g. on I/O) uses no CPU time and is
+not sampled. Worker processes of ``ParallelResolver`` and other threads are
+not sampled. Needs ``signal.setitimer``, so not available on Windows.
+"""
+
+import os
+import signal
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from types import CodeType, FrameType
+from typing import IO, Any, Counter as CounterType, Dict, List, Optional, Tuple
+
+from . import core
+
+
+STAGE_INPUT = 'input'
+STAGE_PARSE = 'parse'
+STAGE_RULE = 'rule'
+STAGE_OUTPUT = 'output'
+STAGE_OTHER = 'other'
+
+STAGES = (STAGE_INPUT, STAGE_PARSE, STAGE_RULE, STAGE_OUTPUT, STAGE_OTHER)
+
+DEFAULT_INTERVAL = 0.001
+# Frames kept per sampled stack and per traced allocation
+MAX_STACK_DEPTH = 64
+TRACEMALLOC_FRAMES = 32
+
+Stack = Tuple[str, ...]
+
+
+class Profiler:
+    """Sample the main thread's stack and attribute CPU time to stages.
+
+    Use as a context manager around a bulk run, or call ``start`` and
+    ``stop``, from the main thread. Only one profiler can run at a time, as
+    it owns the ``SIGPROF`` handler and the ``ITIMER_PROF`` timer until it
+    stops.
+
+    Args:
+        interval: Seconds of CPU time between samples
+        memory: Also trace allocations with ``tracemalloc`` (much slower);
+            ``stage_memory`` then reports the traced memory still allocated
+            when the profiler stopped, by stage
+
+    Raises:
+        ValueError: If interval is not positive
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, memory: bool = False) -> None:
+        if interval <= 0:
+            raise ValueError(f'interval must be positive, got {interval!r}')
+
+        self.interval = interval
+        self.memory = memory
+        self.samples: CounterType[Stack] = Counter()
+        self.stage_samples: CounterType[str] = Counter()
+        self.elapsed = 0.0
+        self.cpu_time = 0.0
+        self.peak_memory: Optional[int] = None
+        self._stage_memory: Dict[str, int] = {}
+        self._classifier: Optional[_StageClassifier] = None
+        self._running = False
+        self._previous_handler: Any = None
+        self._started = 0.0
+        self._started_cpu = 0.0
+        self._started_tracemalloc = False
+
+    def __enter__(self) -> 'Profiler':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Start sampling the main thread.
+
+        Raises:
+            ValueError: If the profiler is already running, is not started
+                from the main thread, or the platform has no ``SIGPROF``
+        """
+        if self._running:
+            raise ValueError('Profiler is already running')
+        if not hasattr(signal, 'setitimer'):
+            raise ValueError('Profiler needs signal.setitimer, which this platform lacks')
+        if threading.current_thread() is not threading.main_thread():
+            raise ValueError('Profiler must be started from the main thread')
+
+        self._classifier = _StageClassifier()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        self._running = True
+        self._started = time.perf_counter()
+        self._started_cpu = time.process_time()
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self) -> None:
+        """Stop sampling and, with ``memory``, take the allocation snapshot."""
+        if not self._running:
+            return
+
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler)
+        self._running = False
+        self.elapsed += time.perf_counter() - self._started
+        self.cpu_time += time.process_time() - self._started_cpu
+        if self.memory and tracemalloc.is_tracing():
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            self._stage_memory = self._attribute_memory(tracemalloc.take_snapshot())
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    def stage_seconds(self) -> Dict[str, float]:
+        """Return the estimated CPU seconds per stage.
+
+        Each stage gets the share of the process CPU time matching its share
+        of the samples. The kernel may deliver fewer samples than one per
+        interval, but their distribution is still proportional.
+        """
+        total = sum(self.stage_samples.values())
+        return {
+            stage: self.cpu_time * self.stage_samples[stage] / total if total else 0.0
+            for stage in STAGES
+        }
+
+    def stage_memory(self) -> Dict[str, int]:
+        """Return the traced bytes still allocated at stop, by allocating stage."""
+        return {stage: self._stage_memory.get(stage, 0) for stage in STAGES}
+
+    def write_collapsed(self, stream: IO[str]) -> None:
+        """Write the samples as collapsed stacks, one ``frame;frame;... count`` per line.
+
+        This is the input format of ``flamegraph.pl``, speedscope and most
+        other flame graph viewers.
+        """
+        for stack, count in sorted(self.samples.items()):
+            stream.write(f"{';'.join(stack)} {count}\n")
+
+    def report(self, top: int = 15) -> str:
+        """Format a text report of the time (and memory) per stage and the hottest frames.
+
+        Args:
+            top: Number of hottest innermost frames listed
+
+        Returns:
+            Multi-line report string
+        """
+        total = sum(self.stage_samples.values())
+        lines = [
+            f'Profile: {self.elapsed:.3f} s elapsed, {self.cpu_time:.3f} s CPU, '
+            f'{total} samples (interval {self.interval * 1000:g} ms of CPU time)'
+        ]
+        lines.append(f"{'stage':<8} {'cpu s':>10} {'share':>7}")
+        for stage, seconds in self.stage_seconds().items():
+            share = self.stage_samples[stage] / total if total else 0.0
+            lines.append(f'{stage:<8} {seconds:>10.3f} {share:>7.1%}')
+
+        if self.memory:
+            lines.append('')
+            lines.append(f'Traced memory: peak {_format_bytes(self.peak_memory or 0)}; still allocated at stop:')
+            for stage, size in self.stage_memory().items():
+                lines.append(f'{stage:<8} {_format_bytes(size):>10}')
+
+        hottest: CounterType[str] = Counter()
+        for stack, count in self.samples.items():
+            if stack:
+                hottest[stack[-1]] += count
+        if hottest:
+            lines.append('')
+            lines.append('Hottest frames (self time):')
+            for frame, count in hottest.most_common(top):
+                lines.append(f'{count / total:>7.1%}  {frame}')
+        return '\n'.join(lines)
+
+    def _sample(self, signum: int, frame: Optional[FrameType]) -> None:
+        # Runs in the main thread between two bytecodes, with frame the one
+        # that was executing (or calling into C) when the timer fired
+        if frame is None or self._classifier is None:
+            return
+        stack, stage = self._classifier.stack(frame)
+        self.samples[stack] += 1
+        self.stage_samples[stage] += 1
+
+    def _attribute_memory(self, snapshot: tracemalloc.Snapshot) -> Dict[str, int]:
+        classifier = self._classifier
+        assert classifier is not None
+        sizes: Dict[str, int] = {}
+        for statistic in snapshot.statistics('traceback'):
+            stage = classifier.traceback_stage(statistic.traceback)
+            sizes[stage] = sizes.get(stage, 0) + statistic.size
+        return sizes
+
+
+class _StageClassifier:
+    """Map frames to stages by code object, or by module file for whole modules."""
+
+    def __init__(self) -> None:
+        from . import cli
+
+        codes: Dict[CodeType, str] = {}
+        for stage, functions in (
+            (STAGE_INPUT, (cli._iter_input_purls, cli._purls_from_lines)),
+            (STAGE_PARSE, (core._scan_purl, core._parse_purl_fields)),
+            (STAGE_RULE, (
+                core._component_from_fields, core._prefix_from_fields, core._rpmmod_rule,
+                core._oci_rule, core._oci_prefix, core._ps_component_oci, *core._RULES.values(),
+            )),
+            (STAGE_OUTPUT, (cli._write_results, cli._close_output)),
+        ):
+            for function in functions:
+                code = getattr(function, '__code__', None)
+                if code is not None:
+                    codes.setdefault(code, stage)
+        self._codes = codes
+
+        files: Dict[str, str] = {}
+        package = os.path.dirname(os.path.abspath(__file__))
+        for name in ('reader.py', 'sbom.py'):
+            files[os.path.join(package, name)] = STAGE_INPUT
+        files[os.path.join(package, 'output.py')] = STAGE_OUTPUT
+        self._files = files
+        self._parse_prefix = _packageurl_directory()
+        self._names: Dict[CodeType, str] = {}
+        # Line ranges of the classified code objects, for tracemalloc frames
+        self._lines: Dict[str, List[Tuple[int, int, str]]] = {}
+        for code, stage in codes.items():
+            last = max((line for _, _, line in _code_lines(code) if line is not None), default=code.co_firstlineno)
+            self._lines.setdefault(code.co_filename, []).append((code.co_firstlineno, last, stage))
+
+    def stack(self, frame: Optional[FrameType]) -> Tuple[Stack, str]:
+        """Return the stack of frame, outermost first, and its stage."""
+        names = []
+        stage = None
+        depth = 0
+        while frame is not None and depth < MAX_STACK_DEPTH:
+            code = frame.f_code
+            if stage is None:
+                stage = self._code_stage(code)
+            names.append(self._name(code))
+            frame = frame.f_back
+            depth += 1
+        names.reverse()
+        return tuple(names), stage or STAGE_OTHER
+
+    def traceback_stage(self, traceback: tracemalloc.Traceback) -> str:
+        """Return the stage of the innermost classified frame of an allocation."""
+        # Tracebacks are ordered from the most recent frame since Python 3.7
+        for frame in traceback:
+            stage = self._file_stage(frame.filename)
+            if stage is not None:
+                return stage
+            for first, last, line_stage in self._lines.get(frame.filename, ()):
+                if first <= frame.lineno <= last:
+                    return line_stage
+        return STAGE_OTHER
+
+    def _code_stage(self, code: CodeType) -> Optional[str]:
+        stage = self._codes.get(code)
+        if stage is None:
+            stage = self._file_stage(code.co_filename)
+        return stage
+
+    def _file_stage(self, filename: str) -> Optional[str]:
+        if self._parse_prefix is not None and filename.startswith(self._parse_prefix):
+            return STAGE_PARSE
+        return self._files.get(filename)
+
+    def _name(self, code: CodeType) -> str:
+        name = self._names.get(code)
+        if name is None:
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            qualname = getattr(code, 'co_qualname', code.co_name)
+            name = self._names[code] = f'{module}:{qualname}'
+        return name
+
+
+def _packageurl_directory() -> Optional[str]:
+    try:
+        import packageurl
+    except ImportError:
+        return None
+    return os.path.dirname(os.path.abspath(packageurl.__file__ or '')) + os.sep
+
+
+def _code_lines(code: CodeType) -> List[Tuple[Any, Any, Optional[int]]]:
+    if hasattr(code, 'co_lines'):
+        return list(code.co_lines())
+    # Python < 3.10
+    import dis
+
+    return [(None, None, line) for _, line in dis.findlinestarts(code)]
+
+
+def _format_bytes(size: int) -> str:
+    return f'{size / 1024:,.1f} KiB'
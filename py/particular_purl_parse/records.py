@@ -0,0 +1,134 @@
+"""
+Structured component records as an alternative to bare component strings.
+"""
+
+from typing import Any, Iterable, List, Optional, Union
+
+from .core import (  # noqa: F401 (prefix sources are re-exported)
+    ERRORS_RAISE,
+    PREFIX_NAMESPACE,
+    PREFIX_NONE,
+    PREFIX_OCI_REPOSITORY,
+    PREFIX_RPMMOD,
+    _check_error_policy,
+    _prefix_from_fields,
+    _purl_fields,
+    _resolve_batch,
+)
+
+
+class PurlComponent:
+    """Immutable record of a resolved component.
+
+    The component string (``prefix/name``, or just ``name`` without a prefix)
+    is only built on first use of ``component`` or ``str()``, and then kept.
+
+    Attributes:
+        type: PURL type, e.g. ``oci`` or ``rpm``
+        prefix_source: Where the prefix came from: ``'oci_repository'``,
+            ``'rpmmod'``, ``'namespace'``, ``'none'`` or a source returned by
+            a registered rule
+        prefix: Component prefix, or None when prefix_source is ``'none'``
+        name: PURL name
+    """
+
+    __slots__ = ('_type', '_prefix_source', '_prefix', '_name', '_component')
+
+    def __init__(self, type: str, prefix_source: str, prefix: Optional[str], name: str) -> None:
+        self._type = type
+        self._prefix_source = prefix_source
+        self._prefix = prefix
+        self._name = name
+        self._component: Optional[str] = name if prefix is None else None
+
+    @property
+    def type(self) -> str:
+        return self._type
+
+    @property
+    def prefix_source(self) -> str:
+        return self._prefix_source
+
+    @property
+    def prefix(self) -> Optional[str]:
+        return self._prefix
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def component(self) -> str:
+        """Component name string, as returned by ``ps_component_from_purl``."""
+        component = self._component
+        if component is None:
+            component = self._component = f"{self._prefix}/{self._name}"
+        return component
+
+    def __str__(self) -> str:
+        return self.component
+
+    def __repr__(self) -> str:
+        return (
+            f"PurlComponent(type={self._type!r}, prefix_source={self._prefix_source!r}, "
+            f"prefix={self._prefix!r}, name={self._name!r})"
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, PurlComponent):
+            return NotImplemented
+        return (
+            self._type == other._type
+            and self._prefix_source == other._prefix_source
+            and self._prefix == other._prefix
+            and self._name == other._name
+        )
+
+    def __hash__(self) -> int:
+        return hash((self._type, self._prefix_source, self._prefix, self._name))
+
+    def __reduce__(self) -> Any:
+        return (PurlComponent, (self._type, self._prefix_source, self._prefix, self._name))
+
+
+def ps_component_record_from_purl(purl: str) -> PurlComponent:
+    """Extract a structured component record from PackageURL string.
+
+    Follows the same rules and raises the same errors as
+    ``ps_component_from_purl``.
+
+    Args:
+        purl: PackageURL string to parse
+
+    Returns:
+        PurlComponent record
+
+    Raises:
+        ValueError: If the PURL is invalid or missing required qualifiers
+    """
+    if not purl or not isinstance(purl, str):
+        raise ValueError('PURL must be a non-empty string')
+
+    fields = _purl_fields(purl)
+    prefix_source, prefix = _prefix_from_fields(fields)
+    return PurlComponent(fields[0], prefix_source, prefix, fields[2])
+
+
+def ps_component_records_from_purls(
+    purls: Iterable[str], errors: str = ERRORS_RAISE
+) -> List[Union[PurlComponent, ValueError]]:
+    """Extract structured component records from many PackageURL strings.
+
+    Args:
+        purls: Iterable of PackageURL strings to parse
+        errors: Error policy, as for ``ps_components_from_purls``
+
+    Returns:
+        List of PurlComponent records (and ValueErrors with ``'return'``)
+
+    Raises:
+        ValueError: If the error policy is unknown, or on the first invalid
+            PURL when the policy is ``'raise'``
+    """
+    _check_error_policy(errors)
+    return _resolve_batch(purls, errors, ps_component_record_from_purl)
@@ -0,0 +1,119 @@
+"""
+Registry of per-type component extraction rules.
+
+Component extraction looks up the rule for the PURL type in a dispatch table,
+so adding rules does not slow down other types. Types without a rule use the
+default: prefix the name with the ``rpmmod`` qualifier when present.
+``oci`` is registered out of the box.
+
+Rules apply to the current process. Register them at import time of your
+own module, before creating resolvers or worker pools, so that caches and
+forked workers see them.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from . import core
+from .core import (
+    PREFIX_NAMESPACE,
+    PREFIX_OCI_REPOSITORY,
+    ComponentRule,
+    PurlFields,
+    _oci_prefix,
+    _oci_rule,
+    _rpmmod_rule,
+)
+
+# Errors for rules to raise, each reported under its own status
+from .core import InvalidRepositoryURLError, MissingRepositoryURLError, RuleError  # noqa: F401
+
+
+def register_rule(ptype: str, rule: ComponentRule, replace: bool = False) -> None:
+    """Register the component rule for a PURL type.
+
+    A rule is called with the tuple ``(type, namespace, name, rpmmod,
+    repository_url)`` of a parsed PURL and returns ``(prefix_source,
+    prefix)``. The component is ``prefix/name``, or ``name`` when the prefix
+    is None. Rules raise ValueError for PURLs they cannot handle; raise a
+    ``RuleError`` subclass to choose the status the failure is reported as
+    by ``ps_purl_status`` and instrumentation.
+
+    Args:
+        ptype: PURL type, matched case-insensitively
+        rule: Rule to use for the type
+        replace: Allow replacing an already registered rule
+
+    Raises:
+        ValueError: If the type is empty, or already has a rule and replace
+            is False
+    """
+    if not ptype or not isinstance(ptype, str):
+        raise ValueError('PURL type must be a non-empty string')
+
+    ptype = ptype.lower()
+    if ptype in core._RULES and not replace:
+        raise ValueError(f'A rule is already registered for PURL type {ptype!r}')
+    core._RULES[ptype] = rule
+
+
+def unregister_rule(ptype: str) -> Optional[ComponentRule]:
+    """Remove the rule for a PURL type, so that it uses the default rule.
+
+    Args:
+        ptype: PURL type, matched case-insensitively
+
+    Returns:
+        The removed rule, or None if the type had no rule
+    """
+    return core._RULES.pop(ptype.lower(), None)
+
+
+def get_rule(ptype: str) -> ComponentRule:
+    """Return the rule used for a PURL type, falling back to the default ``rpmmod`` rule."""
+    return core._RULES.get(ptype.lower(), _rpmmod_rule)
+
+
+def registered_rules() -> Dict[str, ComponentRule]:
+    """Return a copy of the dispatch table of registered rules by type."""
+    return dict(core._RULES)
+
+
+def oci_repository_rule(segment: int = 1) -> ComponentRule:
+    """Build a rule prefixing the name with a ``repository_url`` path segment.
+
+    The built-in ``oci`` rule is ``oci_repository_rule(1)``: the prefix of
+    ``repository_url=registry.io/library/nginx`` is ``library``.
+
+    Args:
+        segment: Index of the ``/``-separated repository_url segment
+
+    Returns:
+        Component rule
+
+    Raises:
+        ValueError: If segment is negative
+    """
+    if segment < 0:
+        raise ValueError(f'segment must be a non-negative integer, got {segment!r}')
+    if segment == 1:
+        return _oci_rule
+
+    def rule(fields: PurlFields) -> Tuple[str, Optional[str]]:
+        return PREFIX_OCI_REPOSITORY, _oci_prefix(fields[4], segment)
+
+    return rule
+
+
+def namespace_rule(fields: PurlFields) -> Tuple[str, Optional[str]]:
+    """Rule prefixing the name with the PURL namespace, when there is one.
+
+    For example ``pkg:maven/org.springframework/spring-core@5.3.0`` becomes
+    ``org.springframework/spring-core`` and ``pkg:golang/github.com/gorilla/mux``
+    becomes ``github.com/gorilla/mux``. Without a namespace the default
+    ``rpmmod`` rule applies.
+    """
+    namespace = fields[1]
+    if namespace:
+        return PREFIX_NAMESPACE, namespace
+
+    return _rpmmod_rule(fields)
@@ -0,0 +1,393 @@
+"""
+Streaming extraction of PURLs and components from CycloneDX and SPDX JSON documents.
+
+Documents are read incrementally with a small event-based JSON parser, so
+memory use is bounded by the largest array element (a single component or
+package) rather than the document size.
+"""
+
+import codecs
+import os
+import re
+from itertools import islice
+from json import JSONDecodeError, JSONDecoder
+from json.decoder import scanstring
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .core import (
+    ERRORS_RAISE,
+    ERRORS_RETURN,
+    ERRORS_SKIP,
+    _check_error_policy,
+    ps_components_from_purls,
+)
+
+
+READ_SIZE = 1 << 16
+BATCH_SIZE = 1024
+# Array elements up to this many characters are decoded in one go
+MAX_ELEMENT_SIZE = 1 << 22
+
+SbomSource = Union[str, 'os.PathLike[str]', IO[str], IO[bytes]]
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER = re.compile(r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?')
+_LITERALS = (('true', True), ('false', False), ('null', None))
+_DECODER = JSONDecoder()
+
+# Parser states
+_VALUE = 0
+_VALUE_OR_END = 1
+_KEY = 2
+_KEY_OR_END = 3
+_COLON = 4
+_COMMA_OR_END = 5
+_DONE = 6
+
+# Roles of objects the SBOM walker cares about
+_ROLE_NONE = 0
+_ROLE_COMPONENT = 1
+_ROLE_EXTERNAL_REF = 2
+
+
+def iter_sbom_purls(source: SbomSource) -> Iterator[str]:
+    """Stream the PURLs referenced by a CycloneDX or SPDX JSON document.
+
+    Yields CycloneDX ``components[].purl`` values (including nested
+    components) and the ``referenceLocator`` of SPDX ``externalRefs`` whose
+    ``referenceType`` is ``purl``, in document order.
+
+    Args:
+        source: Path to the document, or a text or binary file object
+
+    Yields:
+        PURL strings
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as stream:
+            yield from _walk_sbom(_iter_json_events(_reader(stream)))
+    else:
+        yield from _walk_sbom(_iter_json_events(_reader(source)))
+
+
+def iter_sbom_components(
+    source: SbomSource,
+    errors: str = ERRORS_RAISE,
+    resolver: Optional[Callable[[str], str]] = None,
+    intern: bool = False,
+) -> Iterator[Tuple[str, Union[str, ValueError]]]:
+    """Stream ``(purl, component)`` pairs from a CycloneDX or SPDX JSON document.
+
+    PURLs are resolved in batches with ``ps_components_from_purls`` and the
+    error policy has the same meaning as there.
+
+    Args:
+        source: Path to the document, or a text or binary file object
+        errors: Error policy, one of ``'raise'``, ``'skip'`` or ``'return'``
+        resolver: Single-PURL resolver to use instead of
+            ``ps_component_from_purl``, e.g. a ``ComponentCache``
+        intern: Intern component strings, as for ``ps_components_from_purls``
+
+    Yields:
+        Tuples of (purl, component), with a ValueError in place of the
+        component for failed PURLs when the policy is ``'return'``
+
+    Raises:
+        ValueError: If the document is not valid JSON, the error policy is
+            unknown, or on the first invalid PURL when the policy is ``'raise'``
+    """
+    _check_error_policy(errors)
+
+    purls = iter_sbom_purls(source)
+    while True:
+        batch = list(islice(purls, BATCH_SIZE))
+        if not batch:
+            return
+        results = ps_components_from_purls(batch, errors=ERRORS_RETURN, resolver=resolver, intern=intern)
+        for purl, result in zip(batch, results):
+            if isinstance(result, ValueError):
+                if errors == ERRORS_RAISE:
+                    raise result
+                if errors == ERRORS_SKIP:
+                    continue
+            yield purl, result
+
+
+def _walk_sbom(events: Iterator[Tuple[str, Any]]) -> Iterator[str]:
+    # One frame per open container: [is_object, key in parent, role,
+    # current key, SPDX referenceType, SPDX referenceLocator]
+    stack: List[List[Any]] = []
+    for event, value in events:
+        if event == 'string':
+            if stack:
+                frame = stack[-1]
+                role = frame[2]
+                if role == _ROLE_COMPONENT:
+                    if frame[3] == 'purl':
+                        yield value
+                elif role == _ROLE_EXTERNAL_REF:
+                    if frame[3] == 'referenceType':
+                        frame[4] = value
+                    elif frame[3] == 'referenceLocator':
+                        frame[5] = value
+        elif event == 'map_key':
+            stack[-1][3] = value
+        elif event == 'value':
+            yield from _walk_element(value, stack[-1][1])
+        elif event == 'start_map' or event == 'start_array':
+            role = _ROLE_NONE
+            key = None
+            if stack:
+                parent = stack[-1]
+                if parent[0]:
+                    key = parent[3]
+                elif event == 'start_map':
+                    if parent[1] == 'components':
+                        role = _ROLE_COMPONENT
+                    elif parent[1] == 'externalRefs':
+                        role = _ROLE_EXTERNAL_REF
+            stack.append([event == 'start_map', key, role, None, None, None])
+        elif event == 'end_map' or event == 'end_array':
+            frame = stack.pop()
+            if frame[2] == _ROLE_EXTERNAL_REF and frame[4] == 'purl' and frame[5]:
+                yield frame[5]
+
+
+def _walk_element(element: Any, array_key: Optional[str]) -> Iterator[str]:
+    """Walk a decoded element of the array stored under array_key."""
+    if isinstance(element, dict):
+        if array_key == 'components':
+            yield from _walk_object(element, _ROLE_COMPONENT)
+        elif array_key == 'externalRefs':
+            yield from _walk_object(element, _ROLE_EXTERNAL_REF)
+        else:
+            yield from _walk_object(element, _ROLE_NONE)
+    elif isinstance(element, list):
+        for item in element:
+            yield from _walk_element(item, None)
+
+
+def _walk_object(obj: Dict[str, Any], role: int) -> Iterator[str]:
+    for key, value in obj.items():
+        if isinstance(value, str):
+            if role == _ROLE_COMPONENT and key == 'purl':
+                yield value
+        elif isinstance(value, list):
+            for item in value:
+                yield from _walk_element(item, key)
+        elif isinstance(value, dict):
+            yield from _walk_object(value, _ROLE_NONE)
+    if role == _ROLE_EXTERNAL_REF and obj.get('referenceType') == 'purl':
+        locator = obj.get('referenceLocator')
+        if locator and isinstance(locator, str):
+            yield locator
+
+
+def _reader(stream: Union[IO[str], IO[bytes]]) -> Callable[[], str]:
+    """Return a function reading the next decoded chunk ('' at EOF)."""
+    sample = stream.read(0)
+    if isinstance(sample, str):
+        text_stream: IO[str] = stream  # type: ignore[assignment]
+        return lambda: text_stream.read(READ_SIZE)
+
+    binary_stream: IO[bytes] = stream  # type: ignore[assignment]
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+
+    def read() -> str:
+        while True:
+            data = binary_stream.read(READ_SIZE)
+            if not data:
+                return decoder.decode(b'', final=True)
+            text = decoder.decode(data)
+            if text:
+                return text
+
+    return read
+
+
+def _iter_json_events(read: Callable[[], str]) -> Iterator[Tuple[str, Any]]:
+    """Parse JSON text incrementally into ijson-style ``(event, value)`` pairs.
+
+    Events are ``start_map``, ``map_key``, ``end_map``, ``start_array``,
+    ``end_array``, ``string``, ``number``, ``boolean`` and ``null``. Array
+    elements that are objects or arrays are decoded whole with the C JSON
+    decoder and reported as a single ``value`` event carrying the decoded
+    element, unless they are larger than ``MAX_ELEMENT_SIZE``.
+
+    Args:
+        read: Function returning the next chunk of text, '' at end of input
+
+    Raises:
+        ValueError: If the input is not a single valid JSON document
+    """
+    buf = ''
+    pos = 0
+    offset = 0
+    eof = False
+    stack: List[bool] = []
+    state = _VALUE
+    tokenize_from = -1
+
+    while True:
+        pos = _WHITESPACE.match(buf, pos).end()  # type: ignore[union-attr]
+        if pos >= len(buf):
+            if eof:
+                if state == _DONE:
+                    return
+                raise ValueError(f'Invalid JSON: unexpected end of document at offset {offset + pos}')
+            chunk = read()
+            offset += pos
+            buf = buf[pos:] + chunk
+            pos = 0
+            eof = not chunk
+            continue
+
+        char = buf[pos]
+
+        if state == _COMMA_OR_END:
+            if char == ',':
+                state = _KEY if stack[-1] else _VALUE
+                pos += 1
+                continue
+            if char == ('}' if stack[-1] else ']'):
+                yield ('end_map' if stack.pop() else 'end_array'), None
+                state = _COMMA_OR_END if stack else _DONE
+                pos += 1
+                continue
+        elif state == _COLON:
+            if char == ':':
+                state = _VALUE
+                pos += 1
+                continue
+        elif state == _KEY or state == _KEY_OR_END:
+            if char == '"':
+                try:
+                    key, pos = scanstring(buf, pos + 1)
+                except JSONDecodeError as e:
+                    if eof or not _is_truncated(e, buf):
+                        raise ValueError(f'Invalid JSON: {e.msg} at offset {offset + e.pos}')
+                    chunk = read()
+                    offset += pos
+                    buf = buf[pos:] + chunk
+                    pos = 0
+                    eof = not chunk
+                    continue
+                yield 'map_key', key
+                state = _COLON
+                continue
+            if char == '}' and state == _KEY_OR_END:
+                stack.pop()
+                yield 'end_map', None
+                state = _COMMA_OR_END if stack else _DONE
+                pos += 1
+                continue
+        elif state == _VALUE or state == _VALUE_OR_END:
+            if char == ']' and state == _VALUE_OR_END:
+                stack.pop()
+                yield 'end_array', None
+                state = _COMMA_OR_END if stack else _DONE
+                pos += 1
+                continue
+            if char == '"':
+                try:
+                    value, pos = scanstring(buf, pos + 1)
+                except JSONDecodeError as e:
+                    if eof or not _is_truncated(e, buf):
+                        raise ValueError(f'Invalid JSON: {e.msg} at offset {offset + e.pos}')
+                    chunk = read()
+                    offset += pos
+                    buf = buf[pos:] + chunk
+                    pos = 0
+                    eof = not chunk
+                    continue
+                yield 'string', value
+                state = _COMMA_OR_END if stack else _DONE
+                continue
+            if (char == '{' or char == '[') and stack and not stack[-1] and offset + pos != tokenize_from:
+                try:
+                    value, end = _DECODER.raw_decode(buf, pos)
+                except JSONDecodeError as e:
+                    if not eof and len(buf) - pos < MAX_ELEMENT_SIZE and _is_truncated(e, buf):
+                        # Read until the buffered tail has doubled, then retry
+                        wanted = 2 * (len(buf) - pos)
+                        offset += pos
+                        parts = [buf[pos:]]
+                        size = len(parts[0])
+                        while size < wanted:
+                            chunk = read()
+                            if not chunk:
+                                eof = True
+                                break
+                            parts.append(chunk)
+                            size += len(chunk)
+                        buf = ''.join(parts)
+                        pos = 0
+                        continue
+                    # Too large or invalid: tokenize this element instead
+                    tokenize_from = offset + pos
+                    continue
+                pos = end
+                yield 'value', value
+                state = _COMMA_OR_END
+                continue
+            if char == '{':
+                stack.append(True)
+                yield 'start_map', None
+                state = _KEY_OR_END
+                pos += 1
+                continue
+            if char == '[':
+                stack.append(False)
+                yield 'start_array', None
+                state = _VALUE_OR_END
+                pos += 1
+                continue
+            if char == '-' or '0' <= char <= '9':
+                match = _NUMBER.match(buf, pos)
+                # A fraction or exponent may continue past the buffer end
+                if match is not None and (len(buf) - match.end() > 2 or eof):
+                    text = match.group()
+                    pos = match.end()
+                    yield 'number', float(text) if '.' in text or 'e' in text or 'E' in text else int(text)
+                    state = _COMMA_OR_END if stack else _DONE
+                    continue
+                if not eof:
+                    chunk = read()
+                    offset += pos
+                    buf = buf[pos:] + chunk
+                    pos = 0
+                    eof = not chunk
+                    continue
+            else:
+                literal = _match_literal(buf, pos)
+                if literal is None and not eof and len(buf) - pos < 5:
+                    chunk = read()
+                    offset += pos
+                    buf = buf[pos:] + chunk
+                    pos = 0
+                    eof = not chunk
+                    continue
+                if literal is not None:
+                    text, value = literal
+                    pos += len(text)
+                    yield ('null' if value is None else 'boolean'), value
+                    state = _COMMA_OR_END if stack else _DONE
+                    continue
+
+        raise ValueError(f'Invalid JSON: unexpected {char!r} at offset {offset + pos}')
+
+
+def _match_literal(buf: str, pos: int) -> Optional[Tuple[str, Any]]:
+    for text, value in _LITERALS:
+        if buf.startswith(text, pos):
+            return text, value
+    return None
+
+
+def _is_truncated(error: JSONDecodeError, buf: str) -> bool:
+    """Whether a string scan failed because the buffer ends mid-string."""
+    # Errors within a \\uXXXX escape's reach of the end may be truncation too
+    return error.msg.startswith('Unterminated string') or error.pos >= len(buf) - 6
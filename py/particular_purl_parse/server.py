@@ -0,0 +1,354 @@
+"""
+Local HTTP service resolving PURLs to components.
+
+Endpoints:
+
+- ``GET /resolve?purl=...``: resolve one PURL; 200 with
+  ``{"purl": ..., "component": ...}`` or 422 with ``{"purl": ..., "error": ...}``
+- ``POST /resolve``: resolve a batch given as newline-delimited text or,
+  with ``Content-Type: application/json``, a JSON array of strings. The
+  response streams one JSON line per input (``application/x-ndjson``,
+  chunked), in input order, in the format of ``resolve --format jsonl``. If
+  the rest of a newline-delimited body times out, a last line holds only an
+  ``error`` and the response ends without its final chunk
+- ``GET /metrics``: JSON counters of the server, its cache and, when a
+  ``MetricsRecorder`` is installed, of resolution itself
+- ``GET /health``: ``{"status": "ok"}``
+
+Connections are kept alive (HTTP/1.1). Each connection is served by its own
+thread, while resolution runs in a bounded pool of worker threads. Requests
+beyond the concurrency limit get 503 with ``Retry-After`` rather than
+queueing. Only the standard library is used; bind to localhost unless the
+port is protected otherwise, as there is no authentication.
+"""
+
+import json
+import socket
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from typing import IO, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from . import __version__
+from .cache import DEFAULT_CACHE_SIZE, SharedComponentCache
+from .core import ERRORS_RETURN, ps_component_from_purl, ps_components_from_purls
+from .instrumentation import MetricsRecorder, get_recorder
+from .output import format_line
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_CONCURRENCY = 64
+DEFAULT_MAX_BODY_SIZE = 64 << 20
+DEFAULT_CHUNKSIZE = 1024
+# Chunks of one batch submitted to the pool ahead of the one being written
+MAX_PENDING_CHUNKS = 2
+RETRY_AFTER_SECONDS = 1
+# Idle keep-alive connections are closed after this many seconds
+IDLE_TIMEOUT_SECONDS = 60
+
+CONTENT_TYPE_JSON = 'application/json'
+CONTENT_TYPE_NDJSON = 'application/x-ndjson'
+BODY_TIMEOUT_ERROR = 'Timed out reading the request body'
+
+Result = Union[str, ValueError]
+
+
+class ResolverServer(ThreadingHTTPServer):
+    """Threaded HTTP server resolving PURLs, see the module docstring.
+
+    Args:
+        address: ``(host, port)`` to bind; port 0 picks a free port
+        workers: Number of resolution worker threads
+        max_concurrency: Maximum number of resolve requests in progress;
+            further ones get 503
+        max_body_size: Maximum batch request body in bytes; larger ones
+            get 413
+        chunksize: Number of PURLs of a batch resolved per pool task
+        cache_size: Entries of the shared component cache, 0 to disable it
+
+    Raises:
+        ValueError: If a size or count is not a positive integer
+        OSError: If the address cannot be bound
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = (DEFAULT_HOST, DEFAULT_PORT),
+        workers: int = DEFAULT_WORKERS,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_body_size: int = DEFAULT_MAX_BODY_SIZE,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        for name, value in (
+            ('workers', workers),
+            ('max_concurrency', max_concurrency),
+            ('max_body_size', max_body_size),
+            ('chunksize', chunksize),
+        ):
+            if not isinstance(value, int) or value <= 0:
+                raise ValueError(f'{name} must be a positive integer, got {value!r}')
+        if not isinstance(cache_size, int) or cache_size < 0:
+            raise ValueError(f'cache_size must be a non-negative integer, got {cache_size!r}')
+
+        self.max_concurrency = max_concurrency
+        self.max_body_size = max_body_size
+        self.chunksize = chunksize
+        self.cache = SharedComponentCache(cache_size) if cache_size else None
+        self.resolve: Callable[[str], str] = ps_component_from_purl if self.cache is None else self.cache.resolve
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix='purl-resolve')
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'requests_total': 0,
+            'requests_rejected': 0,
+            'requests_in_progress': 0,
+            'purls_total': 0,
+            'purl_errors_total': 0,
+        }
+        super().__init__(address, _ResolverHandler)
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server, e.g. ``http://127.0.0.1:8080``."""
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot of the server metrics.
+
+        Returns:
+            Dict with ``server`` counters, ``cache`` statistics (or None
+            without a cache) and ``resolution`` metrics of the installed
+            ``MetricsRecorder`` (or None)
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        recorder = get_recorder()
+        return {
+            'version': __version__,
+            'server': stats,
+            'cache': None if self.cache is None else self.cache.cache_info()._asdict(),
+            'resolution': recorder.snapshot() if isinstance(recorder, MetricsRecorder) else None,
+        }
+
+    def resolve_many(self, purls: List[str]) -> List[Result]:
+        """Resolve a chunk of PURLs, counting them; runs on a worker thread."""
+        results = ps_components_from_purls(purls, errors=ERRORS_RETURN, resolver=self.resolve)
+        errors = sum(1 for result in results if result.__class__ is not str)
+        self._count(purls_total=len(purls), purl_errors_total=errors)
+        return results
+
+    def _count(self, **increments: int) -> None:
+        with self._stats_lock:
+            for name, value in increments.items():
+                self._stats[name] += value
+
+
+class _ResolverHandler(BaseHTTPRequestHandler):
+    """Request handler of ResolverServer."""
+
+    protocol_version = 'HTTP/1.1'
+    timeout = IDLE_TIMEOUT_SECONDS
+    server_version = f'particular-purl-parse/{__version__}'
+    server: ResolverServer
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == '/resolve':
+            purls = parse_qs(url.query).get('purl')
+            if not purls:
+                self._send_json(HTTPStatus.BAD_REQUEST, {'error': 'Missing purl query parameter'})
+                return
+            self._with_slot(lambda: self._resolve_single(purls[0]))
+        elif url.path == '/metrics':
+            self._send_json(HTTPStatus.OK, self.server.metrics())
+        elif url.path == '/health':
+            self._send_json(HTTPStatus.OK, {'status': 'ok'})
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': f'Unknown path {url.path!r}'})
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path != '/resolve':
+            self._discard_body()
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': f'Unknown path {url.path!r}'})
+            return
+        self._with_slot(self._resolve_batch)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Quiet by default; errors are still logged through log_error
+        pass
+
+    def log_error(self, format: str, *args: Any) -> None:
+        super().log_message(format, *args)
+
+    def _with_slot(self, handle: Callable[[], None]) -> None:
+        server = self.server
+        if not server.slots.acquire(blocking=False):
+            server._count(requests_rejected=1)
+            self._discard_body()
+            self._send_json(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {'error': f'Too many concurrent requests (limit {server.max_concurrency})'},
+                headers={'Retry-After': str(RETRY_AFTER_SECONDS)},
+            )
+            return
+
+        server._count(requests_total=1, requests_in_progress=1)
+        try:
+            handle()
+        finally:
+            server._count(requests_in_progress=-1)
+            server.slots.release()
+
+    def _resolve_single(self, purl: str) -> None:
+        result = self.server.executor.submit(self.server.resolve_many, [purl]).result()[0]
+        if isinstance(result, ValueError):
+            self._send_json(HTTPStatus.UNPROCESSABLE_ENTITY, {'purl': purl, 'error': str(result)})
+        else:
+            self._send_json(HTTPStatus.OK, {'purl': purl, 'component': result})
+
+    def _resolve_batch(self) -> None:
+        length = self.headers.get('Content-Length')
+        if length is None or not length.isdigit():
+            self.close_connection = True
+            self._send_json(HTTPStatus.LENGTH_REQUIRED, {'error': 'Content-Length is required'})
+            return
+        length = int(length)
+        if length > self.server.max_body_size:
+            # The body is not read, so the connection cannot be reused
+            self.close_connection = True
+            self._send_json(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                {'error': f'Body exceeds {self.server.max_body_size} bytes'},
+            )
+            return
+
+        content_type = self.headers.get('Content-Type', '').partition(';')[0].strip().lower()
+        body = None
+        if content_type == CONTENT_TYPE_JSON:
+            try:
+                purls: Iterable[str] = _parse_json_purls(self.rfile.read(length))
+            except socket.timeout:
+                self._send_json(
+                    HTTPStatus.REQUEST_TIMEOUT, {'error': BODY_TIMEOUT_ERROR}, headers={'Connection': 'close'}
+                )
+                return
+            except ValueError as e:
+                self._send_json(HTTPStatus.BAD_REQUEST, {'error': str(e)})
+                return
+        else:
+            purls = body = _BodyLines(self.rfile, length)
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', CONTENT_TYPE_NDJSON)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            for lines in self._stream_results(purls):
+                self._write_chunk(''.join(lines).encode('utf-8'))
+            if body is not None and body.timed_out:
+                # Without the final chunk, clients see the response as cut short
+                self.close_connection = True
+                self.log_error('%s', BODY_TIMEOUT_ERROR)
+                self._write_chunk(json.dumps({'error': BODY_TIMEOUT_ERROR}).encode('utf-8') + b'\n')
+                return
+            self._write_chunk(b'')
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _stream_results(self, purls: Iterable[str]) -> Iterator[List[str]]:
+        """Resolve chunks in the pool, yielding formatted lines in input order."""
+        server = self.server
+        purls = iter(purls)
+        pending: Deque[Tuple[List[str], 'Future[List[Result]]']] = deque()
+        try:
+            while True:
+                while len(pending) < MAX_PENDING_CHUNKS:
+                    chunk = list(islice(purls, server.chunksize))
+                    if not chunk:
+                        break
+                    pending.append((chunk, server.executor.submit(server.resolve_many, chunk)))
+                if not pending:
+                    return
+                chunk, future = pending.popleft()
+                yield [format_line(purl, result, True) for purl, result in zip(chunk, future.result())]
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+
+    def _send_json(
+        self, status: HTTPStatus, payload: Any, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', CONTENT_TYPE_JSON)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _discard_body(self) -> None:
+        length = self.headers.get('Content-Length')
+        if length is None or not length.isdigit() or int(length) > self.server.max_body_size:
+            self.close_connection = True
+        elif int(length):
+            self.rfile.read(int(length))
+
+
+def _parse_json_purls(body: bytes) -> List[str]:
+    try:
+        purls = json.loads(body)
+    except ValueError as e:
+        raise ValueError(f'Invalid JSON body: {e}')
+    if not isinstance(purls, list):
+        raise ValueError('JSON body must be an array of PURL strings')
+    for index, purl in enumerate(purls):
+        if not isinstance(purl, str):
+            raise ValueError(f'Item {index} of the JSON body is not a string: {purl!r}')
+    return purls
+
+
+class _BodyLines:
+    """Stripped, non-blank lines of a request body, read as it arrives.
+
+    Iteration stops early when the body ends before its length or a read
+    times out; ``timed_out`` tells the two apart, so lines already read
+    are still resolved.
+    """
+
+    def __init__(self, stream: IO[bytes], length: int) -> None:
+        self.stream = stream
+        self.remaining = length
+        self.timed_out = False
+
+    def __iter__(self) -> Iterator[str]:
+        while self.remaining > 0:
+            try:
+                line = self.stream.readline(self.remaining)
+            except socket.timeout:
+                self.timed_out = True
+                return
+            if not line:
+                return
+            self.remaining -= len(line)
+            purl = line.decode('utf-8', 'replace').strip()
+            if purl:
+                yield purl
@@ -0,0 +1,356 @@
+"""
+Hash-partitioned part files for resolution jobs split across processes or nodes.
+
+Every process of a job reads the same input, resolves only the PURLs of the
+shards it owns and writes one part file plus one JSON manifest per shard.
+``merge_shards`` then streams the parts back into a single output in input
+order, identical to what ``particular-purl-parse resolve`` writes, and
+checks every part against its manifest along the way.
+
+Part files hold one record per line, ``position<TAB>flag<TAB>line``: the
+0-based position of the PURL in the job input, ``1`` for failed PURLs and
+``0`` otherwise, and the output line of the PURL.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import zlib
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .output import FORMAT_JSONL, FORMAT_TSV, FORMATS, format_line
+
+
+PARTITION_CRC32 = 'crc32'
+MANIFEST_VERSION = 1
+MERGE_BATCH_SIZE = 4096
+
+Record = Tuple[int, str, Union[str, ValueError]]
+
+
+def shard_of_purl(purl: str, shards: int) -> int:
+    """Return the shard of a PURL: the CRC-32 of its UTF-8 bytes modulo shards.
+
+    Unlike ``hash``, the result does not depend on the process, machine or
+    Python version, so every node of a job agrees on it.
+
+    Args:
+        purl: PackageURL string
+        shards: Number of shards of the job
+
+    Returns:
+        Shard index from 0 to shards - 1
+    """
+    return zlib.crc32(purl.encode('utf-8', 'surrogatepass')) % shards
+
+
+def part_file_name(shard: int, shards: int, format: str = FORMAT_TSV) -> str:
+    """Return the name of the part file of a shard, e.g. ``part-00002-of-00004.tsv``."""
+    return f'part-{shard:05d}-of-{shards:05d}.{format}'
+
+
+def manifest_file_name(shard: int, shards: int) -> str:
+    """Return the name of the manifest of a shard, e.g. ``part-00002-of-00004.json``."""
+    return f'part-{shard:05d}-of-{shards:05d}.json'
+
+
+class ShardWriter:
+    """Write resolved PURLs to the part files of the shards a process owns.
+
+    Parts are written to temporary files and renamed into place by
+    ``close``, which then writes the manifests, so a directory only ever
+    holds complete parts. Use as a context manager; leaving it with an
+    exception removes the temporary files and writes no manifest.
+
+    Args:
+        directory: Output directory, created if missing; shared by all
+            processes of the job
+        shards: Number of shards of the job
+        owned: Shards written by this writer, defaulting to all of them;
+            each one keeps a file open until ``close``
+        format: Output line format, ``'tsv'`` or ``'jsonl'``
+        skip_errors: Leave failed PURLs out of the parts (manifests still
+            count them)
+
+    Raises:
+        ValueError: If shards is not positive, an owned shard is out of
+            range, or the format is unknown
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        shards: int,
+        owned: Optional[Iterable[int]] = None,
+        format: str = FORMAT_TSV,
+        skip_errors: bool = False,
+    ) -> None:
+        if shards < 1:
+            raise ValueError(f'shards must be positive, got {shards!r}')
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format {format!r}; expected one of {', '.join(FORMATS)}")
+        owned = range(shards) if owned is None else sorted(set(owned))
+        for shard in owned:
+            if not 0 <= shard < shards:
+                raise ValueError(f'Shard {shard!r} out of range for {shards} shards')
+
+        self.directory = directory
+        self.shards = shards
+        self.format = format
+        self.skip_errors = skip_errors
+        self._jsonl = format == FORMAT_JSONL
+        os.makedirs(directory, exist_ok=True)
+        self._parts: Dict[int, _Part] = {}
+        try:
+            for shard in owned:
+                self._parts[shard] = _Part(os.path.join(directory, part_file_name(shard, shards, format)))
+        except BaseException:
+            self.abort()
+            raise
+
+    def __enter__(self) -> 'ShardWriter':
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def owns(self, purl: str) -> bool:
+        """Return whether the shard of a PURL is written by this writer."""
+        return shard_of_purl(purl, self.shards) in self._parts
+
+    def write(self, records: Iterable[Record]) -> None:
+        """Write a batch of ``(position, purl, component or ValueError)`` records.
+
+        Positions must increase within each shard, which they do when the
+        input is read in order.
+
+        Raises:
+            ValueError: If a PURL belongs to a shard this writer does not
+                own, or a position does not increase
+        """
+        jsonl = self._jsonl
+        skip_errors = self.skip_errors
+        batches: Dict[int, List[str]] = {}
+        for position, purl, result in records:
+            shard = shard_of_purl(purl, self.shards)
+            part = self._parts.get(shard)
+            if part is None:
+                raise ValueError(f'PURL at position {position} belongs to shard {shard}, not written here')
+            if position <= part.last_position:
+                raise ValueError(f'Position {position} after {part.last_position} in shard {shard}')
+            part.last_position = position
+            part.purls += 1
+            if isinstance(result, ValueError):
+                part.errors += 1
+                if skip_errors:
+                    continue
+                flag = '1'
+            else:
+                flag = '0'
+            batches.setdefault(shard, []).append(f'{position}\t{flag}\t{format_line(purl, result, jsonl)}')
+        for shard, lines in batches.items():
+            self._parts[shard].write(lines)
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Move the parts into place and write their manifests.
+
+        Returns:
+            Manifests of the written shards
+        """
+        manifests = []
+        for shard, part in self._parts.items():
+            part.close()
+            manifest = {
+                'version': MANIFEST_VERSION,
+                'partition': PARTITION_CRC32,
+                'shard': shard,
+                'shards': self.shards,
+                'format': self.format,
+                'file': os.path.basename(part.path),
+                'records': part.records,
+                'purls': part.purls,
+                'resolved': part.purls - part.errors,
+                'errors': part.errors,
+                'skip_errors': self.skip_errors,
+                'bytes': part.size,
+                'sha256': part.digest.hexdigest(),
+            }
+            _write_atomically(
+                os.path.join(self.directory, manifest_file_name(shard, self.shards)),
+                json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8') + b'\n',
+            )
+            manifests.append(manifest)
+        self._parts = {}
+        return manifests
+
+    def abort(self) -> None:
+        """Close and remove the temporary part files without writing manifests."""
+        for part in self._parts.values():
+            part.discard()
+        self._parts = {}
+
+
+class _Part:
+    """Temporary part file with its running counts and checksum."""
+
+    __slots__ = ('path', 'stream', 'digest', 'records', 'purls', 'errors', 'size', 'last_position')
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.stream = open(path + '.tmp', 'wb')
+        self.digest = hashlib.sha256()
+        self.records = 0
+        self.purls = 0
+        self.errors = 0
+        self.size = 0
+        self.last_position = -1
+
+    def write(self, lines: List[str]) -> None:
+        data = ''.join(lines).encode('utf-8', 'surrogatepass')
+        self.stream.write(data)
+        self.digest.update(data)
+        self.records += len(lines)
+        self.size += len(data)
+
+    def close(self) -> None:
+        self.stream.close()
+        os.replace(self.path + '.tmp', self.path)
+
+    def discard(self) -> None:
+        self.stream.close()
+        try:
+            os.remove(self.path + '.tmp')
+        except FileNotFoundError:
+            pass
+
+
+def read_manifests(directory: str) -> List[Dict[str, Any]]:
+    """Load the manifests of a job and check that they form a complete job.
+
+    Args:
+        directory: Directory the shards were written to
+
+    Returns:
+        Manifests ordered by shard
+
+    Raises:
+        ValueError: If there are no manifests, manifests disagree on the
+            number of shards, format or partition, or shards are missing
+    """
+    manifests = {}
+    for name in sorted(os.listdir(directory)):
+        if not (name.startswith('part-') and name.endswith('.json')):
+            continue
+        with open(os.path.join(directory, name), encoding='utf-8') as stream:
+            manifest = json.load(stream)
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f'{name}: unsupported manifest version {manifest.get("version")!r}')
+        manifests[manifest['shard']] = manifest
+    if not manifests:
+        raise ValueError(f'No shard manifests in {directory!r}')
+
+    first = manifests[min(manifests)]
+    for manifest in manifests.values():
+        for key in ('shards', 'format', 'partition'):
+            if manifest[key] != first[key]:
+                raise ValueError(
+                    f'Manifests of shards {first["shard"]} and {manifest["shard"]} disagree on {key}: '
+                    f'{first[key]!r} != {manifest[key]!r}'
+                )
+    missing = sorted(set(range(first['shards'])) - set(manifests))
+    if missing:
+        raise ValueError(f"Missing shards {', '.join(map(str, missing))} of {first['shards']}")
+    return [manifests[shard] for shard in sorted(manifests)]
+
+
+def merge_shards(
+    directory: str,
+    output: IO[str],
+    error_output: Optional[IO[str]] = None,
+    skip_errors: bool = False,
+) -> Dict[str, int]:
+    """Merge the parts of a complete job into one output, in input order.
+
+    Parts are read line by line and merged on their positions, so memory
+    does not grow with the job. Each part's record count, size and SHA-256
+    are checked against its manifest when the part is exhausted.
+
+    Args:
+        directory: Directory the shards were written to
+        output: Stream for the output lines
+        error_output: Stream for the lines of failed PURLs, defaulting to
+            output
+        skip_errors: Drop the lines of failed PURLs
+
+    Returns:
+        Totals over all shards: ``shards``, ``purls``, ``resolved``,
+        ``errors`` (from the manifests) and ``records`` (lines merged)
+
+    Raises:
+        ValueError: If the manifests do not form a complete job, a part does
+            not match its manifest, or two parts hold the same position
+    """
+    manifests = read_manifests(directory)
+    if error_output is None:
+        error_output = output
+
+    records = heapq.merge(*(_iter_part(directory, manifest) for manifest in manifests))
+    lines: List[str] = []
+    error_lines = lines if error_output is output else []
+    merged = 0
+    previous = -1
+    for position, failed, line in records:
+        if position == previous:
+            raise ValueError(f'Position {position} appears in more than one shard')
+        previous = position
+        merged += 1
+        if failed:
+            if not skip_errors:
+                error_lines.append(line)
+        else:
+            lines.append(line)
+        if merged % MERGE_BATCH_SIZE == 0:
+            output.writelines(lines)
+            lines.clear()
+            if error_lines is not lines:
+                error_output.writelines(error_lines)
+                error_lines.clear()
+    output.writelines(lines)
+    if error_lines is not lines:
+        error_output.writelines(error_lines)
+
+    totals = {'shards': len(manifests), 'records': merged}
+    for key in ('purls', 'resolved', 'errors'):
+        totals[key] = sum(manifest[key] for manifest in manifests)
+    return totals
+
+
+def _iter_part(directory: str, manifest: Dict[str, Any]) -> Iterator[Tuple[int, bool, str]]:
+    name = manifest['file']
+    digest = hashlib.sha256()
+    records = 0
+    size = 0
+    last_position = -1
+    with open(os.path.join(directory, name), 'rb') as stream:
+        for data in stream:
+            digest.update(data)
+            size += len(data)
+            records += 1
+            position, flag, line = data.decode('utf-8', 'surrogatepass').split('\t', 2)
+            position = int(position)
+            if position <= last_position:
+                raise ValueError(f'{name}: position {position} after {last_position}')
+            last_position = position
+            yield position, flag == '1', line
+    if records != manifest['records'] or size != manifest['bytes'] or digest.hexdigest() != manifest['sha256']:
+        raise ValueError(f'{name} does not match its manifest (records, size or SHA-256)')
+
+
+def _write_atomically(path: str, data: bytes) -> None:
+    with open(path + '.tmp', 'wb') as stream:
+        stream.write(data)
+    os.replace(path + '.tmp', path)
@@ -0,0 +1,289 @@
+"""
+Persistent SQLite store of resolved components for incremental runs.
+"""
+
+import hashlib
+import os
+import sqlite3
+import types
+from importlib import metadata
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from . import core, rules
+from .core import ERRORS_RAISE, ERRORS_RETURN, _check_error_policy, ps_components_from_purls
+
+
+Result = Union[str, ValueError]
+
+# Bound parameters per SELECT, below SQLite's historical limit of 999
+LOOKUP_CHUNK_SIZE = 500
+DIGEST_SIZE = 16
+DEFAULT_TIMEOUT = 30.0
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS components (
+    fingerprint TEXT NOT NULL,
+    digest BLOB NOT NULL,
+    component TEXT,
+    error TEXT,
+    PRIMARY KEY (fingerprint, digest)
+) WITHOUT ROWID
+'''
+
+
+class ComponentStore:
+    """On-disk map of PURL digests to resolved components.
+
+    Entries are keyed by a BLAKE2b digest of the PURL and by a fingerprint of
+    the extraction logic: the package version, the sources of ``core.py`` and
+    ``rules.py`` and the code of the registered rules (see
+    ``extraction_fingerprint``). Changing any of
+    them starts a fresh set of entries, so stale results are never returned;
+    ``prune`` deletes the entries of other fingerprints. Failures are stored
+    too and come back as ValueErrors with the original message.
+
+    The database uses SQLite's write-ahead log, so any number of processes
+    can read while one writes. Instances are not thread-safe: open one per
+    thread or process.
+
+    Args:
+        path: Database file, created if missing
+        fingerprint: Extraction fingerprint, defaulting to the current one
+        timeout: Seconds to wait for another writer's lock
+
+    Raises:
+        sqlite3.Error: If the database cannot be opened
+    """
+
+    def __init__(
+        self,
+        path: Union[str, 'os.PathLike[str]'],
+        fingerprint: Optional[str] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.path = os.fspath(path)
+        self.fingerprint = extraction_fingerprint() if fingerprint is None else fingerprint
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(self.path, timeout=timeout)
+        with self._connection:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute(_SCHEMA)
+
+    def __enter__(self) -> 'ComponentStore':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        row = self._connection.execute(
+            'SELECT COUNT(*) FROM components WHERE fingerprint = ?', (self.fingerprint,)
+        ).fetchone()
+        return int(row[0])
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def lookup_many(self, purls: Iterable[str]) -> Dict[str, Result]:
+        """Look up stored results for many PURLs.
+
+        Args:
+            purls: PackageURL strings
+
+        Returns:
+            Dict of the PURLs found to their component or ValueError
+        """
+        by_digest = {_digest(purl): purl for purl in set(purls) if purl and isinstance(purl, str)}
+        digests = iter(by_digest)
+        found: Dict[str, Result] = {}
+        while True:
+            chunk = list(islice(digests, LOOKUP_CHUNK_SIZE))
+            if not chunk:
+                break
+            rows = self._connection.execute(
+                'SELECT digest, component, error FROM components '
+                f'WHERE fingerprint = ? AND digest IN ({", ".join("?" * len(chunk))})',
+                [self.fingerprint, *chunk],
+            )
+            for digest, component, error in rows:
+                found[by_digest[digest]] = ValueError(error) if component is None else component
+        return found
+
+    def store_many(self, results: Iterable[Tuple[str, Result]]) -> None:
+        """Insert or replace results for many PURLs in one transaction.
+
+        Args:
+            results: Pairs of PackageURL string and component or ValueError
+        """
+        fingerprint = self.fingerprint
+        rows = (
+            (fingerprint, _digest(purl), None, str(result))
+            if isinstance(result, ValueError)
+            else (fingerprint, _digest(purl), result, None)
+            for purl, result in results
+            if purl and isinstance(purl, str)
+        )
+        with self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO components (fingerprint, digest, component, error) '
+                'VALUES (?, ?, ?, ?)',
+                rows,
+            )
+
+    def resolve_many(
+        self,
+        purls: Iterable[str],
+        errors: str = ERRORS_RAISE,
+        resolve_missing: Optional[Callable[[List[str]], List[Result]]] = None,
+    ) -> List[Result]:
+        """Resolve many PURLs, parsing only those not in the store yet.
+
+        Results are the same as from ``ps_components_from_purls``. New results
+        are stored before returning.
+
+        Args:
+            purls: Iterable of PackageURL strings to parse
+            errors: Error policy, as for ``ps_components_from_purls``
+            resolve_missing: Batch resolver for the PURLs not in the store,
+                returning a component or ValueError per PURL, e.g.
+                ``functools.partial(parallel_resolver.resolve, errors='return')``
+
+        Returns:
+            List of component name strings (and ValueErrors with ``'return'``)
+
+        Raises:
+            ValueError: If the error policy is unknown, or on the first
+                invalid PURL when the policy is ``'raise'``
+        """
+        _check_error_policy(errors)
+
+        purls = list(purls)
+        found = self.lookup_many(purls)
+        missing = [purl for purl in purls if purl not in found]
+        self.hits += len(purls) - len(missing)
+        self.misses += len(missing)
+        missing = list(dict.fromkeys(missing))
+        if missing:
+            if resolve_missing is None:
+                resolved = ps_components_from_purls(missing, errors=ERRORS_RETURN)
+            else:
+                resolved = resolve_missing(missing)
+            self.store_many(zip(missing, resolved))
+            found.update(zip(missing, resolved))
+
+        results = [found[purl] for purl in purls]
+        if errors == ERRORS_RETURN:
+            return results
+
+        if errors == ERRORS_RAISE:
+            for result in results:
+                if isinstance(result, ValueError):
+                    raise result
+            return results
+
+        return [result for result in results if not isinstance(result, ValueError)]
+
+    def prune(self) -> int:
+        """Delete the entries of all other fingerprints.
+
+        Returns:
+            Number of deleted entries
+        """
+        with self._connection:
+            cursor = self._connection.execute(
+                'DELETE FROM components WHERE fingerprint != ?', (self.fingerprint,)
+            )
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        """Delete the entries of the current fingerprint."""
+        with self._connection:
+            self._connection.execute(
+                'DELETE FROM components WHERE fingerprint = ?', (self.fingerprint,)
+            )
+
+
+def extraction_fingerprint() -> str:
+    """Return a fingerprint of the component extraction logic in this process.
+
+    It covers the package version, the installed ``packageurl-python``
+    version (which parses the PURLs the fast scanner hands over), the sources
+    of ``core.py`` and ``rules.py``, and each registered rule's type,
+    qualified name, bytecode, constants (nested functions included) and
+    closure values, so a store written by other code or rules is not reused.
+    Code the rules reach only through module globals, such as helpers of
+    your own module, is not covered; open the store with an explicit
+    ``fingerprint`` or ``clear`` it after changing such code.
+
+    Returns:
+        Hex digest string
+    """
+    from . import __version__
+
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    digest.update(__version__.encode())
+    digest.update(f'\0packageurl-python {_distribution_version("packageurl-python")}'.encode())
+    for module in (core, rules):
+        try:
+            with open(module.__file__, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(module.__file__.encode('utf-8', 'surrogatepass'))
+    for ptype, rule in sorted(core._RULES.items()):
+        digest.update(f'\0{ptype}\0{_rule_identity(rule, set())}'.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+def _distribution_version(name: str) -> str:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+def _rule_identity(rule: object, seen: Set[int]) -> str:
+    # The name and code tell rules apart, closure values parameterized rules
+    # such as oci_repository_rule(2); seen guards against recursive closures
+    if id(rule) in seen:
+        return _callable_name(rule)
+    seen.add(id(rule))
+    code = getattr(rule, '__code__', None)
+    cells = getattr(rule, '__closure__', None) or ()
+    values = [_value_identity(cell.cell_contents, seen) for cell in cells]
+    if code is None:
+        return f'{_callable_name(rule)}{values}'
+    return f'{_callable_name(rule)}{_code_identity(code, seen)}{values}'
+
+
+def _code_identity(code: types.CodeType, seen: Set[int]) -> str:
+    consts = [_value_identity(const, seen) for const in code.co_consts]
+    return f'{code.co_code.hex()}{code.co_names}{consts}'
+
+
+def _value_identity(value: object, seen: Set[int]) -> str:
+    if isinstance(value, types.CodeType):
+        return _code_identity(value, seen)
+    if isinstance(value, (frozenset, set)):
+        # Set order follows string hashes, which change between runs
+        return f'{{{", ".join(sorted(_value_identity(item, seen) for item in value))}}}'
+    if isinstance(value, tuple):
+        return f'({", ".join(_value_identity(item, seen) for item in value)})'
+    if callable(value):
+        # Named rather than repr'd, since a repr contains an address
+        return _rule_identity(value, seen)
+    return repr(value)
+
+
+def _callable_name(value: object) -> str:
+    module = getattr(value, '__module__', None) or type(value).__module__
+    name = getattr(value, '__qualname__', None) or type(value).__qualname__
+    return f'{module}.{name}'
+
+
+def _digest(purl: str) -> bytes:
+    return hashlib.blake2b(purl.encode('utf-8', 'surrogatepass'), digest_size=DIGEST_SIZE).digest()
+
@@ -0,0 +1,128 @@
+"""
+Deduplicated batch results: unique components plus integer indices per input.
+"""
+
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from .core import ERRORS_RAISE, ERRORS_RETURN, _check_error_policy, ps_component_from_purl
+
+
+# Index of inputs that failed to resolve
+NO_COMPONENT = -1
+
+
+class ComponentTable:
+    """Batch resolution result stored as a component table and an index array.
+
+    ``components`` holds each distinct component once, in order of first
+    appearance. ``indices`` holds, for every input position, the index of its
+    component in ``components`` or ``NO_COMPONENT`` (-1) if it failed. It is a
+    signed 32-bit ``array.array`` and can be wrapped without copying, e.g. with
+    ``numpy.frombuffer(table.indices, dtype=numpy.int32)``.
+
+    Attributes:
+        components: Distinct component strings
+        indices: Component index for each input
+        errors: ValueErrors of failed inputs by input position (only filled
+            with the ``'return'`` error policy)
+    """
+
+    __slots__ = ('components', 'indices', 'errors')
+
+    def __init__(
+        self,
+        components: List[str],
+        indices: 'array[int]',
+        errors: Optional[Dict[int, ValueError]] = None,
+    ) -> None:
+        self.components = components
+        self.indices = indices
+        self.errors = {} if errors is None else errors
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, position: int) -> Optional[str]:
+        """Return the component of the input at position, or None if it failed."""
+        index = self.indices[position]
+        return None if index == NO_COMPONENT else self.components[index]
+
+    def __repr__(self) -> str:
+        return (
+            f"ComponentTable(inputs={len(self.indices)}, components={len(self.components)}, "
+            f"errors={len(self.errors)})"
+        )
+
+    def counts(self) -> List[int]:
+        """Return the number of inputs per component, aligned with ``components``."""
+        counts = [0] * len(self.components)
+        for index in self.indices:
+            if index != NO_COMPONENT:
+                counts[index] += 1
+        return counts
+
+    def to_list(self) -> List[Optional[Union[str, ValueError]]]:
+        """Expand back to one entry per input, like ``ps_components_from_purls``.
+
+        Failed inputs map to their ValueError if one was recorded, else None.
+        """
+        components = self.components
+        errors = self.errors
+        return [
+            components[index] if index != NO_COMPONENT else errors.get(position)
+            for position, index in enumerate(self.indices)
+        ]
+
+
+def ps_component_table_from_purls(
+    purls: Iterable[str],
+    errors: str = ERRORS_RAISE,
+    resolver: Optional[Callable[[str], str]] = None,
+) -> ComponentTable:
+    """Resolve many PURLs into a deduplicated component table.
+
+    Args:
+        purls: Iterable of PackageURL strings to parse
+        errors: Error policy: ``'raise'`` propagates the first ValueError;
+            with ``'skip'`` and ``'return'`` failed inputs get index -1, and
+            ``'return'`` also records the ValueError in ``errors``
+        resolver: Single-PURL resolver to use instead of
+            ``ps_component_from_purl``, e.g. a ``ComponentCache``
+
+    Returns:
+        ComponentTable with one index per input
+
+    Raises:
+        ValueError: If the error policy is unknown, or on the first invalid
+            PURL when the policy is ``'raise'``
+    """
+    _check_error_policy(errors)
+
+    resolve = ps_component_from_purl if resolver is None else resolver
+    raise_errors = errors == ERRORS_RAISE
+    keep_errors = errors == ERRORS_RETURN
+    index_of: Dict[str, int] = {}
+    components: List[str] = []
+    indices = array('i')
+    append_index = indices.append
+    error_map: Dict[int, ValueError] = {}
+
+    for position, purl in enumerate(purls):
+        try:
+            component = resolve(purl)
+        except ValueError as e:
+            if raise_errors:
+                raise
+            if keep_errors:
+                error_map[position] = e
+            append_index(NO_COMPONENT)
+            continue
+
+        index = index_of.get(component)
+        if index is None:
+            index = index_of[component] = len(components)
+            components.append(component)
+        append_index(index)
+
+    return ComponentTable(components, indices, error_map)
@@ -47,6 +47,14 @@ setup(
             "flake8>=3.8",
             "mypy>=0.800",
         ],
+        "arrow": [
+            "pyarrow>=10.0",
+        ],
+    },
+    entry_points={
+        "console_scripts": [
+            "particular-purl-parse=particular_purl_parse.cli:main",
+        ],
     },
     keywords="purl, packageurl, parsing, python",
     package_data={
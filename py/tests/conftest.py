@@ -0,0 +1,15 @@
+"""
+Fixtures shared by the test modules.
+"""
+
+import pytest
+from particular_purl_parse import core
+
+
+@pytest.fixture
+def restore_rules():
+    """Restore the rule dispatch table after the test."""
+    saved = dict(core._RULES)
+    yield
+    core._RULES.clear()
+    core._RULES.update(saved)
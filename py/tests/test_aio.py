@@ -0,0 +1,98 @@
+"""
+Tests for the asyncio-friendly resolver.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from particular_purl_parse import aio
+from particular_purl_parse.aio import aiter_components_from_purls, ps_components_from_purls_async
+from particular_purl_parse.core import ps_components_from_purls
+
+
+def _collect(purls, **kwargs):
+    async def run():
+        return [result async for result in aiter_components_from_purls(purls, **kwargs)]
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def purls(sample_oci_purls, sample_rpm_purls, sample_regular_purls):
+    """A corpus spanning several small chunks."""
+    return (sample_oci_purls + sample_rpm_purls + sample_regular_purls) * 5
+
+
+class TestAiterComponentsFromPurls:
+    """Test cases for aiter_components_from_purls."""
+
+    def test_inline_matches_batch(self, purls):
+        """Test that cooperative inline resolution keeps input order."""
+        assert _collect(purls, chunksize=4) == ps_components_from_purls(purls)
+
+    def test_executor_matches_batch(self, purls):
+        """Test that executor resolution keeps input order."""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = _collect(purls, chunksize=4, executor=executor, max_pending=1)
+        assert result == ps_components_from_purls(purls)
+
+    def test_async_iterable_input(self):
+        """Test that async iterables are accepted."""
+        async def source():
+            for i in range(10):
+                yield f"pkg:npm/pkg{i}@1.0.0"
+
+        assert _collect(source(), chunksize=3) == [f"pkg{i}" for i in range(10)]
+
+    def test_yields_to_event_loop(self, purls):
+        """Test that other tasks run between chunks."""
+        ticks = []
+
+        async def run():
+            async def ticker():
+                while True:
+                    ticks.append(len(results))
+                    await asyncio.sleep(0)
+
+            results = []
+            task = asyncio.ensure_future(ticker())
+            async for result in aiter_components_from_purls(purls, chunksize=3):
+                results.append(result)
+            task.cancel()
+            return results
+
+        asyncio.run(run())
+        assert len(set(ticks)) > 2
+
+    def test_error_policies(self, invalid_purls):
+        """Test that error policies behave like the batch API."""
+        purls = ["pkg:npm/lodash@4.17.21"] + invalid_purls
+        assert _collect(purls, errors="skip", chunksize=2) == ["lodash"]
+        assert len(_collect(purls, errors="return", chunksize=2)) == len(purls)
+        with pytest.raises(ValueError):
+            _collect(purls, chunksize=2)
+
+    def test_invalid_sizes(self):
+        """Test that non-positive sizes are rejected."""
+        with pytest.raises(ValueError, match="chunksize"):
+            _collect(["pkg:npm/lodash@4.17.21"], chunksize=0)
+        with pytest.raises(ValueError, match="max_pending"):
+            _collect(["pkg:npm/lodash@4.17.21"], max_pending=0)
+
+
+class TestPsComponentsFromPurlsAsync:
+    """Test cases for ps_components_from_purls_async."""
+
+    def test_small_input_resolved_inline(self, monkeypatch, sample_regular_purls):
+        """Test that small sequences skip the async iterator."""
+        def fail(*args, **kwargs):
+            raise AssertionError("async iterator used for a small input")
+
+        monkeypatch.setattr(aio, "aiter_components_from_purls", fail)
+        result = asyncio.run(ps_components_from_purls_async(sample_regular_purls))
+        assert result == ["lodash", "requests", "spring-core"]
+
+    def test_large_input(self, purls):
+        """Test that large inputs are collected in order."""
+        result = asyncio.run(ps_components_from_purls_async(purls, chunksize=4))
+        assert result == ps_components_from_purls(purls)
@@ -0,0 +1,65 @@
+"""
+Tests for the batch PURL parsing API.
+"""
+
+import pytest
+from particular_purl_parse.core import ps_component_from_purl, ps_components_from_purls
+
+
+class TestPsComponentsFromPurls:
+    """Test cases for the ps_components_from_purls batch function."""
+
+    def test_results_in_input_order(self, sample_oci_purls, sample_rpm_purls, sample_regular_purls):
+        """Test that batch results match single calls, in input order."""
+        purls = sample_rpm_purls + sample_oci_purls + sample_regular_purls
+        result = ps_components_from_purls(purls)
+        assert result == [ps_component_from_purl(purl) for purl in purls]
+
+    def test_accepts_any_iterable(self):
+        """Test that a generator input is consumed correctly."""
+        purls = (f"pkg:npm/pkg{i}@1.0.0" for i in range(5))
+        result = ps_components_from_purls(purls)
+        assert result == [f"pkg{i}" for i in range(5)]
+
+    def test_empty_input(self):
+        """Test that an empty iterable yields an empty list."""
+        assert ps_components_from_purls([]) == []
+
+    def test_raise_policy(self):
+        """Test that the default policy propagates the first error."""
+        purls = ["pkg:npm/lodash@4.17.21", "pkg:oci/nginx@1.21.0"]
+        with pytest.raises(ValueError, match="Missing repository_url in OCI PURL"):
+            ps_components_from_purls(purls)
+
+    def test_skip_policy(self, invalid_purls):
+        """Test that the skip policy drops invalid PURLs."""
+        purls = ["pkg:npm/lodash@4.17.21"] + invalid_purls + ["pkg:pypi/requests@2.28.0"]
+        result = ps_components_from_purls(purls, errors="skip")
+        assert result == ["lodash", "requests"]
+
+    def test_return_policy(self, invalid_purls):
+        """Test that the return policy keeps ValueErrors in place."""
+        purls = ["pkg:npm/lodash@4.17.21"] + invalid_purls
+        result = ps_components_from_purls(purls, errors="return")
+        assert len(result) == len(purls)
+        assert result[0] == "lodash"
+        assert all(isinstance(item, ValueError) for item in result[1:])
+        assert str(result[-1]) == "Invalid repository_url in OCI PURL: insufficient path components"
+
+    def test_return_policy_error_messages_match_single_call(self, invalid_purls):
+        """Test that returned errors carry the same messages as single calls."""
+        result = ps_components_from_purls(invalid_purls, errors="return")
+        for purl, error in zip(invalid_purls, result):
+            with pytest.raises(ValueError) as excinfo:
+                ps_component_from_purl(purl)
+            assert str(error) == str(excinfo.value)
+
+    def test_non_string_items(self):
+        """Test that non-string items are handled by the error policy."""
+        result = ps_components_from_purls([None, 123, "pkg:npm/lodash@4.17.21"], errors="skip")
+        assert result == ["lodash"]
+
+    def test_invalid_policy(self):
+        """Test that an unknown error policy is rejected."""
+        with pytest.raises(ValueError, match="Invalid errors policy"):
+            ps_components_from_purls(["pkg:npm/lodash@4.17.21"], errors="ignore")
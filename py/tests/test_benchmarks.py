@@ -0,0 +1,87 @@
+"""
+Smoke tests for the benchmark suite.
+"""
+
+import json
+
+from benchmarks import bench_core
+from benchmarks.corpus import generate_corpus, generate_respelled_corpus
+
+
+class TestCorpus:
+    """Test cases for the synthetic corpus generator."""
+
+    def test_reproducible(self):
+        """Test that the same seed yields the same corpus."""
+        assert generate_corpus(200, seed=3) == generate_corpus(200, seed=3)
+        assert generate_corpus(200, seed=3) != generate_corpus(200, seed=4)
+
+    def test_mix(self):
+        """Test that a custom mix restricts the categories."""
+        corpus = generate_corpus(50, mix={"oci": 1.0})
+        assert all(purl.startswith("pkg:oci/") for purl in corpus)
+
+    def test_respelled(self):
+        """Test that a respelled corpus is reproducible and duplicate-heavy."""
+        corpus = generate_respelled_corpus(500, unique=20, seed=1)
+        assert corpus == generate_respelled_corpus(500, unique=20, seed=1)
+        assert len(set(corpus)) > 20
+
+
+class TestBenchCore:
+    """Test cases for the benchmark runner."""
+
+    def test_run_and_compare(self, tmp_path, capsys):
+        """Test that a run writes JSON results that compare cleanly with themselves."""
+        output = tmp_path / "results.json"
+        assert bench_core.main(["--size", "200", "--repeat", "1", "--output", str(output)]) == 0
+        results = json.loads(output.read_text(encoding="utf-8"))
+        assert set(results["benchmarks"]) == set(bench_core.BENCHMARKS)
+        assert set(results["benchmarks"]["single"]["latency_ns"]) == {"p50", "p90", "p99", "max"}
+        assert bench_core.main(["--compare", str(output), str(output)]) == 0
+
+    def test_compare_flags_regressions(self):
+        """Test that a throughput drop beyond the threshold is reported."""
+        base = {"benchmarks": {"batch": {"throughput_per_second": 1000.0, "peak_memory_bytes": 10}}}
+        new = {"benchmarks": {"batch": {"throughput_per_second": 800.0, "peak_memory_bytes": 10}}}
+        lines = bench_core.compare(base, new, threshold=0.1)
+        assert lines[0].startswith("REGRESSION batch")
+
+
+class TestBenchInput:
+    """Test cases for the input reader benchmark."""
+
+    def test_run_suite(self, tmp_path):
+        """Test that both readers see the whole corpus and report figures."""
+        from benchmarks import bench_input
+
+        results = bench_input.run_suite(300, seed=0, resolve=True, directory=str(tmp_path))
+        assert set(results["readers"]) == set(bench_input.READERS)
+        counts = {result["count"] for result in results["readers"].values()}
+        assert counts == {300}
+
+
+class TestBenchThreads:
+    """Test cases for the thread scaling benchmark."""
+
+    def test_run_suite(self):
+        """Test that every resolver reports each thread count."""
+        from benchmarks import bench_threads
+
+        results = bench_threads.run_suite(200, seed=0, threads=(1, 3), repeat=1)
+        assert set(results["resolvers"]) == set(bench_threads.RESOLVERS)
+        for runs in results["resolvers"].values():
+            assert set(runs) == {"1", "3"}
+            assert runs["1"]["speedup"] == 1.0
+
+
+class TestBenchDedupe:
+    """Test cases for the deduplication benchmark."""
+
+    def test_run_suite(self):
+        """Test that every resolver is timed and keys collapse spellings."""
+        from benchmarks import bench_dedupe
+
+        results = bench_dedupe.run_suite(500, unique=20, seed=0, repeat=1)
+        assert set(results["resolvers"]) == set(bench_dedupe.RESOLVERS)
+        assert results["meta"]["distinct_keys"] < results["meta"]["distinct_strings"]
@@ -0,0 +1,196 @@
+"""
+Tests for the LRU component cache.
+"""
+
+import sys
+import threading
+
+import pytest
+from benchmarks.corpus import generate_corpus
+from particular_purl_parse.cache import CacheInfo, ComponentCache, SharedComponentCache
+from particular_purl_parse.core import ps_component_from_purl, ps_components_from_purls
+
+
+class TestComponentCache:
+    """Test cases for ComponentCache."""
+
+    def test_resolves_like_ps_component_from_purl(self):
+        """Test that cached results match the uncached resolver."""
+        cache = ComponentCache()
+        assert cache.resolve("pkg:oci/nginx@1.21.0?repository_url=docker.io/library") == "library/nginx"
+        assert cache("pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx") == "nginx/nginx"
+
+    def test_hits_and_misses(self):
+        """Test that repeated lookups are counted as hits."""
+        cache = ComponentCache()
+        for _ in range(3):
+            cache.resolve("pkg:npm/lodash@4.17.21")
+        assert cache.cache_info() == CacheInfo(hits=2, misses=1, evictions=0, maxsize=65536, currsize=1)
+
+    def test_eviction_is_lru(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ComponentCache(maxsize=2)
+        cache.resolve("pkg:npm/a@1")
+        cache.resolve("pkg:npm/b@1")
+        cache.resolve("pkg:npm/a@1")
+        cache.resolve("pkg:npm/c@1")
+        info = cache.cache_info()
+        assert info.evictions == 1
+        assert info.currsize == 2
+        cache.resolve("pkg:npm/a@1")
+        assert cache.cache_info().hits == 2
+        cache.resolve("pkg:npm/b@1")
+        assert cache.cache_info().misses == 4
+
+    def test_negative_entries(self):
+        """Test that failures are cached and re-raised with the same message."""
+        cache = ComponentCache()
+        purl = "pkg:oci/nginx@1.21.0"
+        for _ in range(3):
+            with pytest.raises(ValueError, match="Missing repository_url in OCI PURL"):
+                cache.resolve(purl)
+        info = cache.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
+
+    def test_invalid_inputs_are_not_cached(self):
+        """Test that non-string inputs raise without being stored."""
+        cache = ComponentCache()
+        for purl in (None, "", 123, ["pkg:npm/a@1"]):
+            with pytest.raises(ValueError, match="PURL must be a non-empty string"):
+                cache.resolve(purl)
+        assert len(cache) == 0
+
+    def test_unbounded(self):
+        """Test that maxsize=None never evicts."""
+        cache = ComponentCache(maxsize=None)
+        for i in range(100):
+            cache.resolve(f"pkg:npm/pkg{i}@1")
+        assert cache.cache_info().evictions == 0
+        assert len(cache) == 100
+
+    def test_cache_clear(self):
+        """Test that clearing drops entries and counters."""
+        cache = ComponentCache()
+        cache.resolve("pkg:npm/lodash@4.17.21")
+        cache.cache_clear()
+        assert cache.cache_info() == CacheInfo(0, 0, 0, 65536, 0)
+
+    @pytest.mark.parametrize("maxsize", [0, -1, 1.5])
+    def test_invalid_maxsize(self, maxsize):
+        """Test that invalid sizes are rejected."""
+        with pytest.raises(ValueError, match="Cache maxsize"):
+            ComponentCache(maxsize=maxsize)
+
+    def test_batch_resolver(self):
+        """Test that the cache plugs into the batch API."""
+        cache = ComponentCache()
+        purls = ["pkg:npm/lodash@4.17.21", "pkg:oci/nginx@1.21.0"] * 3
+        result = ps_components_from_purls(purls, errors="return", resolver=cache)
+        assert result[::2] == ["lodash"] * 3
+        assert all(isinstance(item, ValueError) for item in result[1::2])
+        assert cache.cache_info().misses == 2
+        assert cache.cache_info().hits == 4
+
+
+def _outcome(resolve, purl):
+    try:
+        return resolve(purl)
+    except ValueError as e:
+        return ("error", str(e))
+
+
+class TestSharedComponentCache:
+    """Test cases for SharedComponentCache."""
+
+    def test_resolves_like_ps_component_from_purl(self):
+        """Test that cached results and failures match the uncached resolver."""
+        cache = SharedComponentCache()
+        for _ in range(2):
+            assert cache.resolve("pkg:oci/nginx@1.21.0?repository_url=docker.io/library") == "library/nginx"
+            assert cache("pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx") == "nginx/nginx"
+            with pytest.raises(ValueError, match="Missing repository_url in OCI PURL"):
+                cache.resolve("pkg:oci/nginx@1.21.0")
+        assert cache.cache_info() == CacheInfo(hits=3, misses=3, evictions=0, maxsize=65536, currsize=3)
+
+    def test_invalid_inputs_are_not_cached(self):
+        """Test that non-string inputs raise without being stored."""
+        cache = SharedComponentCache()
+        for purl in (None, "", 123):
+            with pytest.raises(ValueError, match="PURL must be a non-empty string"):
+                cache.resolve(purl)
+        assert len(cache) == 0
+
+    def test_shards(self):
+        """Test that the shard count is a power of two no larger than maxsize."""
+        assert SharedComponentCache(shards=5).shards == 8
+        assert SharedComponentCache(maxsize=3, shards=16).shards == 2
+        assert SharedComponentCache(maxsize=None, shards=1).shards == 1
+
+    def test_maxsize_is_respected(self):
+        """Test that the total size never exceeds maxsize."""
+        cache = SharedComponentCache(maxsize=10, shards=4)
+        for i in range(100):
+            cache.resolve(f"pkg:npm/pkg{i}@1")
+        info = cache.cache_info()
+        assert info.currsize <= 10
+        assert info.evictions == 100 - info.currsize
+
+    def test_cache_clear(self):
+        """Test that clearing drops entries and counters."""
+        cache = SharedComponentCache()
+        cache.resolve("pkg:npm/lodash@4.17.21")
+        cache.cache_clear()
+        assert cache.cache_info() == CacheInfo(0, 0, 0, 65536, 0)
+
+    @pytest.mark.parametrize("maxsize,shards", [(0, 16), (-1, 16), (1.5, 16), (16, 0), (16, 2.0)])
+    def test_invalid_arguments(self, maxsize, shards):
+        """Test that invalid sizes and shard counts are rejected."""
+        with pytest.raises(ValueError, match="Cache (maxsize|shards)"):
+            SharedComponentCache(maxsize=maxsize, shards=shards)
+
+    @pytest.mark.parametrize("maxsize", [None, 64])
+    def test_concurrent_stress(self, maxsize):
+        """Test that threads sharing a cache get correct results and consistent counters."""
+        corpus = generate_corpus(300, seed=7)
+        expected = {purl: _outcome(ps_component_from_purl, purl) for purl in corpus}
+        cache = SharedComponentCache(maxsize=maxsize, shards=4)
+        threads_count = 8
+        rounds = 5
+        barrier = threading.Barrier(threads_count)
+        failures = []
+
+        def worker(offset):
+            barrier.wait()
+            for i in range(rounds * len(corpus)):
+                purl = corpus[(i * (offset + 1) + offset) % len(corpus)]
+                try:
+                    result = _outcome(cache.resolve, purl)
+                    if result != expected[purl]:
+                        failures.append((purl, result))
+                except Exception as e:  # pragma: no cover - reported below
+                    failures.append((purl, e))
+
+        threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(threads_count)]
+        # Switch threads as often as possible to provoke races
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert failures == []
+        info = cache.cache_info()
+        assert info.hits + info.misses == threads_count * rounds * len(corpus)
+        assert info.currsize == len(cache)
+        # Concurrent misses on one PURL store it twice, which does not grow the cache
+        assert info.misses - info.evictions >= info.currsize
+        if maxsize is not None:
+            assert info.currsize <= maxsize
+        else:
+            assert info.currsize == len(set(corpus))
+
@@ -0,0 +1,108 @@
+"""
+Tests for canonical PURL keys and deduplicated batch resolution.
+"""
+
+import pytest
+from benchmarks.corpus import generate_corpus, generate_respelled_corpus
+from particular_purl_parse.cache import ComponentCache
+from particular_purl_parse.canonical import canonical_purl_key
+from particular_purl_parse.core import ps_component_from_purl, ps_components_from_purls
+
+
+def _outcome(purl):
+    try:
+        return ps_component_from_purl(purl)
+    except ValueError:
+        return ValueError
+
+
+class TestCanonicalPurlKey:
+    """Test cases for canonical_purl_key."""
+
+    @pytest.mark.parametrize(
+        "first,second",
+        [
+            ("pkg:rpm/redhat/nginx@1.0?rpmmod=x&arch=y", "pkg:rpm/redhat/nginx@1.0?arch=y&rpmmod=x"),
+            ("pkg:RPM/redhat/nginx@1.0", "pkg:rpm/redhat/nginx@1.0"),
+            ("pkg:rpm/redhat/nginx@1.0?ARCH=y", "pkg:rpm/redhat/nginx@1.0?arch=y"),
+            ("pkg:rpm/redhat/nginx@1.0?arch=y&epoch=", "pkg:rpm/redhat/nginx@1.0?arch=y"),
+            ("pkg:rpm/redhat/nginx@1.0?epoch=", "pkg:rpm/redhat/nginx@1.0"),
+            ("pkg:npm/a%2fb@1.0", "pkg:npm/a%2Fb@1.0"),
+            ("pkg:npm/%61b@1%2E0", "pkg:npm/ab@1.0"),
+            (
+                "pkg:oci/nginx?repository_url=docker.io%2flibrary",
+                "pkg:oci/nginx?repository_url=docker.io/library",
+            ),
+        ],
+    )
+    def test_equivalent_spellings(self, first, second):
+        """Test that equivalent spellings share a key."""
+        assert canonical_purl_key(first) == canonical_purl_key(second)
+
+    @pytest.mark.parametrize(
+        "first,second",
+        [
+            ("pkg:npm/x%401", "pkg:npm/x@1"),
+            ("pkg:npm/a%2Fb@1.0", "pkg:npm/a/b@1.0"),
+            ("pkg:rpm/redhat/nginx?rpmmod=a&rpmmod=b", "pkg:rpm/redhat/nginx?rpmmod=b&rpmmod=a"),
+            ("pkg:rpm/redhat/nginx@1.0", "pkg:rpm/redhat/nginx@1.1"),
+            ("pkg:npm/lodash#lib", "pkg:npm/lodash#src"),
+        ],
+    )
+    def test_distinct_purls(self, first, second):
+        """Test that PURLs with different meanings keep different keys."""
+        assert canonical_purl_key(first) != canonical_purl_key(second)
+
+    @pytest.mark.parametrize("purl", ["nginx@1.0", "pkg:nginx", "pkg:npm/a?arch", "pkg:npm/a%%2f", ""])
+    def test_own_key(self, purl):
+        """Test that unsplittable strings, and text with stray %, are kept as they are."""
+        assert canonical_purl_key(purl) == purl
+
+    def test_key_resolves_like_purl(self):
+        """Test that every PURL resolves like its key on a respelled corpus."""
+        for purl in generate_respelled_corpus(2000, unique=200, seed=4):
+            assert _outcome(canonical_purl_key(purl)) == _outcome(purl)
+
+
+class TestDedupe:
+    """Test cases for ps_components_from_purls(dedupe=True)."""
+
+    @pytest.mark.parametrize("errors", ["return", "skip"])
+    def test_matches_plain_resolution(self, errors):
+        """Test that deduplicated results match resolving every input."""
+        corpus = generate_respelled_corpus(3000, unique=300, seed=1) + generate_corpus(500, seed=2)
+        plain = ps_components_from_purls(corpus, errors=errors)
+        deduped = ps_components_from_purls(corpus, errors=errors, dedupe=True)
+        assert [_outcome if isinstance(r, ValueError) else r for r in deduped] == [
+            _outcome if isinstance(r, ValueError) else r for r in plain
+        ]
+
+    def test_parses_each_key_once(self):
+        """Test that equivalent spellings are resolved once."""
+        cache = ComponentCache()
+        purls = [
+            "pkg:rpm/redhat/nginx@1.0?rpmmod=x&arch=y",
+            "pkg:RPM/redhat/nginx@1.0?arch=y&rpmmod=x",
+            "pkg:rpm/redhat/nginx@1.0?arch=y&rpmmod=x",
+            "pkg:rpm/redhat/nginx@1.0?rpmmod=x&arch=y",
+        ]
+        assert ps_components_from_purls(purls, resolver=cache, dedupe=True) == ["x/nginx"] * 4
+        assert cache.cache_info().misses == 1
+
+    def test_raise_policy(self):
+        """Test that the first invalid input in order is raised."""
+        purls = ["pkg:npm/lodash", "pkg:oci/nginx", "nginx@1.0"]
+        with pytest.raises(ValueError, match="Missing repository_url"):
+            ps_components_from_purls(purls, dedupe=True)
+
+    def test_non_string_inputs(self):
+        """Test that non-string inputs fail as usual."""
+        result = ps_components_from_purls([None, "pkg:npm/lodash", ["x"]], errors="return", dedupe=True)
+        assert isinstance(result[0], ValueError)
+        assert result[1] == "lodash"
+        assert isinstance(result[2], ValueError)
+
+    def test_intern(self):
+        """Test that dedupe combines with interning."""
+        result = ps_components_from_purls(["pkg:npm/lodash", "pkg:NPM/lodash"], dedupe=True, intern=True)
+        assert result[0] is result[1]
@@ -0,0 +1,278 @@
+"""
+Tests for the command line interface.
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from particular_purl_parse.cli import main
+
+
+@pytest.fixture
+def purl_file(tmp_path):
+    """An input file with valid, invalid and blank lines."""
+    path = tmp_path / "purls.txt"
+    path.write_text(
+        "pkg:oci/nginx@1.21.0?repository_url=docker.io/library\n"
+        "\n"
+        "pkg:oci/nginx@1.21.0\r\n"
+        "pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+class TestResolveCommand:
+    """Test cases for the resolve subcommand."""
+
+    def test_tsv_output(self, purl_file, capsys):
+        """Test the default purl<TAB>component output."""
+        assert main(["resolve", str(purl_file)]) == 0
+        assert capsys.readouterr().out.splitlines() == [
+            "pkg:oci/nginx@1.21.0?repository_url=docker.io/library\tlibrary/nginx",
+            "pkg:oci/nginx@1.21.0\t\tMissing repository_url in OCI PURL",
+            "pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx\tnginx/nginx",
+        ]
+
+    def test_jsonl_output(self, purl_file, capsys):
+        """Test JSON lines output."""
+        assert main(["resolve", "--format", "jsonl", str(purl_file)]) == 0
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert records == [
+            {"purl": "pkg:oci/nginx@1.21.0?repository_url=docker.io/library", "component": "library/nginx"},
+            {"purl": "pkg:oci/nginx@1.21.0", "error": "Missing repository_url in OCI PURL"},
+            {"purl": "pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx", "component": "nginx/nginx"},
+        ]
+
+    def test_error_output_file(self, purl_file, tmp_path, capsys):
+        """Test that errors can be routed to a separate file."""
+        errors = tmp_path / "errors.tsv"
+        output = tmp_path / "out.tsv"
+        assert main(["resolve", "-o", str(output), "--error-output", str(errors), str(purl_file)]) == 0
+        assert capsys.readouterr().out == ""
+        assert len(output.read_text(encoding="utf-8").splitlines()) == 2
+        assert errors.read_text(encoding="utf-8") == "pkg:oci/nginx@1.21.0\t\tMissing repository_url in OCI PURL\n"
+
+    def test_skip_errors(self, purl_file, capsys):
+        """Test that failed PURLs can be dropped."""
+        assert main(["resolve", "--skip-errors", str(purl_file)]) == 0
+        assert len(capsys.readouterr().out.splitlines()) == 2
+
+    def test_reads_stdin(self, monkeypatch, capsys):
+        """Test that PURLs are read from stdin by default."""
+        monkeypatch.setattr("sys.stdin", io.StringIO("pkg:npm/lodash@4.17.21\npkg:pypi/requests@2.28.0\n"))
+        assert main(["resolve"]) == 0
+        assert capsys.readouterr().out == "pkg:npm/lodash@4.17.21\tlodash\npkg:pypi/requests@2.28.0\trequests\n"
+
+    def test_multiple_inputs_small_batches(self, purl_file, capsys):
+        """Test that multiple files stream through in order across batches."""
+        assert main(["resolve", "--batch-size", "1", "--cache-size", "2", str(purl_file), str(purl_file)]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 6
+        assert lines[:3] == lines[3:]
+
+    def test_workers(self, purl_file, capsys):
+        """Test that multiprocess resolution gives the same output."""
+        assert main(["resolve", str(purl_file)]) == 0
+        serial = capsys.readouterr().out
+        assert main(["resolve", "--workers", "2", "--batch-size", "1", str(purl_file)]) == 0
+        assert capsys.readouterr().out == serial
+
+    def test_invalid_batch_size(self, capsys):
+        """Test that argument validation rejects bad sizes."""
+        with pytest.raises(SystemExit):
+            main(["resolve", "--batch-size", "0"])
+        assert "must be a positive integer" in capsys.readouterr().err
+
+
+class TestArgumentChecks:
+    """Test cases for rejected option combinations."""
+
+    @pytest.mark.parametrize("options", [
+        ["--workers", "2"],
+        ["--store", "store.sqlite"],
+    ])
+    def test_cache_size_needs_in_process_resolution(self, purl_file, capsys, options):
+        """Test that --cache-size is rejected where it would be ignored."""
+        with pytest.raises(SystemExit):
+            main(["resolve", "--cache-size", "10", *options, str(purl_file)])
+        assert "--cache-size cannot be combined" in capsys.readouterr().err
+
+
+class TestBrokenPipe:
+    """Test cases for a downstream reader that closes the pipe early."""
+
+    def test_exits_quietly(self, tmp_path):
+        """Test that closing stdout early exits with status 1 and no traceback."""
+        path = tmp_path / "purls.txt"
+        path.write_text("pkg:npm/lodash@4.17.21\n" * 200000, encoding="utf-8")
+        process = subprocess.Popen(
+            [sys.executable, "-m", "particular_purl_parse", "resolve", str(path)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        )
+        assert process.stdout.readline() == b"pkg:npm/lodash@4.17.21\tlodash\n"
+        process.stdout.close()
+        stderr = process.stderr.read()
+        process.stderr.close()
+        assert process.wait(timeout=30) == 1
+        assert stderr == b""
+
+
+class TestStoreOption:
+    """Test cases for the --store option."""
+
+    @pytest.mark.parametrize("workers", ["1", "2"])
+    def test_store_reuses_results(self, purl_file, tmp_path, capsys, workers):
+        """Test that a rerun with --store produces the same output from the store."""
+        store = tmp_path / "store.sqlite"
+        args = ["resolve", "--store", str(store), "--workers", workers, "--batch-size", "2", str(purl_file)]
+        assert main(args) == 0
+        first = capsys.readouterr().out
+        assert main(args) == 0
+        assert capsys.readouterr().out == first
+        assert first.splitlines()[1] == "pkg:oci/nginx@1.21.0\t\tMissing repository_url in OCI PURL"
+        assert store.exists()
+
+
+class TestProfileOptions:
+    """Test cases for the --profile options."""
+
+    def test_profile_report_and_stacks(self, purl_file, tmp_path, capsys):
+        """Test that profiling writes a report and stacks without changing the output."""
+        assert main(["resolve", str(purl_file)]) == 0
+        expected = capsys.readouterr().out
+
+        report = tmp_path / "profile.txt"
+        stacks = tmp_path / "stacks.txt"
+        args = ["resolve", "--profile", str(report), "--profile-stacks", str(stacks), str(purl_file)]
+        assert main(args) == 0
+        assert capsys.readouterr().out == expected
+        assert report.read_text(encoding="utf-8").startswith("Profile: ")
+        assert stacks.exists()
+
+    def test_profile_stacks_only(self, purl_file, tmp_path, capsys):
+        """Test that --profile-stacks alone writes no report."""
+        stacks = tmp_path / "stacks.txt"
+        assert main(["resolve", "--profile-stacks", str(stacks), str(purl_file)]) == 0
+        assert capsys.readouterr().err == ""
+        assert stacks.exists()
+
+    def test_profile_memory_only(self, purl_file, capsys):
+        """Test that --profile-memory alone reports to stderr."""
+        assert main(["resolve", "--profile-memory", str(purl_file)]) == 0
+        assert "Traced memory" in capsys.readouterr().err
+
+    def test_profile_to_stderr(self, purl_file, capsys):
+        """Test that --profile - writes the report to stderr."""
+        assert main(["resolve", "--profile", "-", "--profile-memory", str(purl_file)]) == 0
+        err = capsys.readouterr().err
+        assert "Profile: " in err
+        assert "Traced memory" in err
+
+
+class TestShardCommands:
+    """Test cases for the shard and merge subcommands."""
+
+    @pytest.mark.parametrize("workers", ["1", "2"])
+    def test_shard_and_merge_match_resolve(self, purl_file, tmp_path, capsys, workers):
+        """Test that one process per shard plus merge gives the resolve output."""
+        assert main(["resolve", str(purl_file)]) == 0
+        expected = capsys.readouterr().out
+
+        parts = str(tmp_path / "parts")
+        for shard in ("0", "1", "2"):
+            args = ["shard", "-d", parts, "--shards", "3", "--shard", shard, "--workers", workers, str(purl_file)]
+            assert main(args) == 0
+        assert main(["merge", parts]) == 0
+        assert capsys.readouterr().out == expected
+
+    def test_merge_incomplete_job(self, purl_file, tmp_path, capsys):
+        """Test that merge reports missing shards and exits non-zero."""
+        parts = str(tmp_path / "parts")
+        assert main(["shard", "-d", parts, "--shards", "2", "--shard", "1", str(purl_file)]) == 0
+        assert main(["merge", parts]) == 1
+        assert "Missing shards 0 of 2" in capsys.readouterr().err
+
+    def test_shard_out_of_range(self, purl_file, tmp_path, capsys):
+        """Test that an owned shard beyond --shards is rejected."""
+        assert main(["shard", "-d", str(tmp_path), "--shards", "2", "--shard", "2", str(purl_file)]) == 2
+        assert "out of range" in capsys.readouterr().err
+
+
+class TestDiffCommand:
+    """Test cases for the diff subcommand."""
+
+    @pytest.fixture
+    def snapshots(self, tmp_path):
+        """Old and new PURL lists where an RPM moved to another module."""
+        old = tmp_path / "old.txt"
+        old.write_text(
+            "pkg:rpm/redhat/nginx@1.20.0?rpmmod=nginx:1.20\npkg:npm/lodash@4.17.20\ninvalid\n",
+            encoding="utf-8",
+        )
+        new = tmp_path / "new.txt"
+        new.write_text("pkg:rpm/redhat/nginx@1.22.0?rpmmod=nginx:1.22\npkg:npm/lodash@4.17.21\n", encoding="utf-8")
+        return str(old), str(new)
+
+    def test_tsv(self, snapshots, capsys):
+        """Test the tab-separated records and the summary on stderr."""
+        assert main(["diff", *snapshots]) == 0
+        captured = capsys.readouterr()
+        assert captured.out.splitlines() == [
+            "removed\tnginx:1.20/nginx\t1\t0",
+            "added\tnginx:1.22/nginx\t0\t1",
+            "changed\trpm/redhat/nginx\t1\t1\tnginx:1.20/nginx\tnginx:1.22/nginx",
+        ]
+        assert "old: 3 PURLs (1 failed), 2 components" in captured.err
+        assert "1 added, 1 removed, 1 changed packages" in captured.err
+
+    def test_jsonl_and_exit_code(self, snapshots, capsys):
+        """Test JSON lines output and --exit-code with and without differences."""
+        assert main(["diff", "--format", "jsonl", "--exit-code", *snapshots]) == 1
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert records[0] == {
+            "change": "removed",
+            "key": "nginx:1.20/nginx",
+            "old_count": 1,
+            "new_count": 0,
+            "old_components": [],
+            "new_components": [],
+        }
+        assert main(["diff", "--exit-code", snapshots[0], snapshots[0]]) == 0
+        assert capsys.readouterr().out == ""
+
+    def test_sbom(self, tmp_path, capsys):
+        """Test diffing the PURLs of two CycloneDX documents."""
+        old = tmp_path / "old.cdx.json"
+        old.write_text(json.dumps({"components": [{"purl": "pkg:npm/lodash@4.17.20"}]}), encoding="utf-8")
+        new = tmp_path / "new.cdx.json"
+        new.write_text(json.dumps({"components": [{"purl": "pkg:npm/left-pad@1.3.0"}]}), encoding="utf-8")
+        assert main(["diff", "--sbom", str(old), str(new)]) == 0
+        assert capsys.readouterr().out == "removed\tlodash\t1\t0\nadded\tleft-pad\t0\t1\n"
+
+
+class TestServeCommand:
+    """Test cases for the serve subcommand."""
+
+    def test_serve_until_interrupted(self, monkeypatch, capsys):
+        """Test that serve binds, reports its URL and stops on Ctrl-C."""
+        from particular_purl_parse import instrumentation
+        from particular_purl_parse.server import ResolverServer
+
+        def interrupt(self, poll_interval=0.5):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(ResolverServer, "serve_forever", interrupt)
+        previous = instrumentation.get_recorder()
+        try:
+            assert main(["serve", "--port", "0", "--workers", "1", "--metrics"]) == 0
+            assert isinstance(instrumentation.get_recorder(), instrumentation.MetricsRecorder)
+        finally:
+            instrumentation.set_recorder(previous)
+        assert capsys.readouterr().err.startswith("Serving on http://127.0.0.1:")
@@ -0,0 +1,116 @@
+"""
+Tests for columnar batch output.
+"""
+
+import pytest
+from particular_purl_parse.columnar import (
+    ERROR_CODE_NAMES,
+    ComponentColumns,
+    _bitmap,
+    ps_component_columns_from_purls,
+)
+from particular_purl_parse.core import ps_components_from_purls
+
+
+@pytest.fixture
+def mixed_purls():
+    """PURLs covering every branch and error code."""
+    return [
+        "pkg:oci/nginx@1.21.0?repository_url=registry.io/library/nginx",
+        "pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx",
+        "pkg:npm/lodash@4.17.21",
+        "",
+        "invalid-purl",
+        "pkg:oci/nginx@1.21.0",
+        "pkg:oci/nginx@1.21.0?repository_url=registry.io",
+        "pkg:npm/caf%C3%A9@1.0.0",
+    ]
+
+
+class TestPsComponentColumnsFromPurls:
+    """Test cases for ps_component_columns_from_purls."""
+
+    def test_columns(self, mixed_purls):
+        """Test every column for a mixed batch."""
+        columns = ps_component_columns_from_purls(mixed_purls)
+        assert len(columns) == 8
+        assert bytes(columns.data) == "library/nginxnginx/nginxlodashcafé".encode("utf-8")
+        assert list(columns.offsets) == [0, 13, 24, 30, 30, 30, 30, 30, 35]
+        assert columns.types == ["oci", "rpm", "npm"]
+        assert list(columns.type_codes) == [0, 1, 2, -1, -1, 0, 0, 2]
+        assert list(columns.prefix_sources) == [0, 1, 2, -1, -1, -1, -1, 2]
+        assert list(columns.error_codes) == [0, 0, 0, 1, 2, 3, 4, 0]
+        assert columns.offsets.itemsize == 4
+        assert columns.error_codes.itemsize == 1
+
+    def test_matches_batch_results(self, mixed_purls):
+        """Test that decoded rows match ps_components_from_purls."""
+        columns = ps_component_columns_from_purls(mixed_purls)
+        expected = ps_components_from_purls(mixed_purls, errors="return")
+        decoded = [columns[row] for row in range(len(columns))]
+        assert decoded == [None if isinstance(item, ValueError) else item for item in expected]
+        assert columns[-1] == "café"
+
+    def test_error_counts(self, mixed_purls):
+        """Test per-error-code row counts."""
+        counts = ps_component_columns_from_purls(mixed_purls).error_counts()
+        assert counts == dict(zip(ERROR_CODE_NAMES, [4, 1, 1, 1, 1, 0]))
+
+    def test_validity_bitmap(self, mixed_purls):
+        """Test the LSB-first Arrow validity bitmap."""
+        assert ps_component_columns_from_purls(mixed_purls).validity_bitmap() == bytes([0b10000111])
+
+    def test_empty(self):
+        """Test an empty batch."""
+        columns = ps_component_columns_from_purls([])
+        assert isinstance(columns, ComponentColumns)
+        assert len(columns) == 0
+        assert list(columns.offsets) == [0]
+        assert columns.validity_bitmap() == b""
+
+    def test_buffers_are_zero_copy(self, mixed_purls):
+        """Test that columns expose the buffer protocol."""
+        columns = ps_component_columns_from_purls(mixed_purls)
+        assert memoryview(columns.offsets).format == "i"
+        assert memoryview(columns.data).nbytes == 35
+
+
+class TestBitmap:
+    """Test cases for bitmap packing."""
+
+    @pytest.mark.parametrize(
+        "flags,expected",
+        [
+            ([], b""),
+            ([True], b"\x01"),
+            ([False] * 7 + [True], b"\x80"),
+            ([True] * 9, b"\xff\x01"),
+        ],
+    )
+    def test_bitmap(self, flags, expected):
+        """Test LSB-first packing with partial final bytes."""
+        assert _bitmap(flags) == expected
+
+
+class TestArrow:
+    """Test cases for the optional pyarrow conversion."""
+
+    def test_to_arrow(self, mixed_purls):
+        """Test the RecordBatch built over the column buffers."""
+        pa = pytest.importorskip("pyarrow")
+        batch = ps_component_columns_from_purls(mixed_purls).to_arrow()
+        assert batch.schema.names == ["component", "type", "prefix_source", "error_code"]
+        assert batch.column(0).type == pa.string()
+        assert batch.column(0).to_pylist() == [
+            "library/nginx", "nginx/nginx", "lodash", None, None, None, None, "café"
+        ]
+        assert batch.column(1).to_pylist() == ["oci", "rpm", "npm", None, None, "oci", "oci", "npm"]
+        assert batch.column(3).to_pylist() == [0, 0, 0, 1, 2, 3, 4, 0]
+
+    def test_to_arrow_without_pyarrow(self, mixed_purls, monkeypatch):
+        """Test the ImportError when pyarrow is missing."""
+        import sys
+
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        with pytest.raises(ImportError, match="requires pyarrow"):
+            ps_component_columns_from_purls(mixed_purls).to_arrow()
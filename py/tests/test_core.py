@@ -3,7 +3,7 @@ Tests for the core PURL parsing functionality.
 """
 
 import pytest
-from particular_purl_parse.core import ps_component_from_purl, _ps_component_oci
+from particular_purl_parse.core import ps_component_from_purl, _ps_component_oci, _scan_purl
 from packageurl import PackageURL
 
 
@@ -185,4 +185,102 @@ class TestEdgeCases:
         """Test with Unicode characters in package name."""
         purl = "pkg:oci/测试包@1.0.0?repository_url=docker.io/library"
         result = ps_component_from_purl(purl)
-        assert result == "library/测试包" 
\ No newline at end of file
+        assert result == "library/测试包" 
+
+
+class TestScanPurl:
+    """Test cases for the _scan_purl fast-path scanner."""
+
+    @pytest.mark.parametrize("purl", [
+        "pkg:oci/nginx@1.21.0?repository_url=docker.io/library",
+        "pkg:OCI/NGINX@1.21.0?repository_url=docker.io/library&arch=amd64",
+        "pkg:oci/nginx?repository_url=docker.io%2Flibrary",
+        "pkg:oci/nginx@sha256%3Aabc?repository_url=quay.io/team/project",
+        "pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx&arch=x86_64",
+        "pkg:rpm/redhat/nginx@1.21.0?RPMMOD=nginx",
+        "pkg:rpm/redhat/nginx@1.21.0?rpmmod=&arch=x86_64",
+        "pkg:rpm/redhat/nginx@1.21.0?rpmmod=%20",
+        "pkg:npm/lodash@4.17.21#src/lodash.js",
+        "pkg:pypi/Django_Rest@1.0",
+        "pkg:maven/org.springframework/Spring-Core@5.3.0",
+        "pkg:generic/my%2Fpackage@1.0",
+        "pkg:generic/caf%C3%A9@1.0",
+        "pkg:oci/测试包@1.0.0?repository_url=docker.io/library",
+        "pkg:golang/github.com/Gorilla//mux@v1.8.0",
+        "pkg:github/Package-URL/purl-spec@244fd47",
+        "pkg:cpan/Perl-Version/Foo@1.0",
+        "pkg:maven/org%2Eapache%2ECommons/io@2.0",
+        "pkg:composer/Caf%C3%89/lib@1.0",
+        "pkg:cpan/Ω?rpmmod=x/y/z&RPMMOD=%20",
+        "pkg:oci/nginx?repository_url=docker.io%2Flib&Repository_Url=%20",
+        "pkg:rpm/redhat/nginx@1.21.0?rpmmod=a&rpmmod=%20&arch=x86_64",
+        "pkg:rpm/redhat/nginx@1.21.0?rpmmod=a&rpmmod=",
+        "pkg:rpm/redhat/nginx@1.21.0?rpmmod=a&RPMMOD=b",
+    ])
+    def test_matches_packageurl(self, purl):
+        """Test that scanned fields match a full PackageURL parse."""
+        parsed = PackageURL.from_string(purl)
+        expected = (
+            parsed.type,
+            parsed.namespace,
+            parsed.name,
+            parsed.qualifiers.get("rpmmod"),
+            parsed.qualifiers.get("repository_url"),
+        )
+        assert _scan_purl(purl) == expected
+
+    @pytest.mark.parametrize("ptype", [
+        "bitbucket", "github", "pypi", "gitlab", "composer", "luarocks", "oci", "npm",
+        "alpm", "apk", "bitnami", "hex", "pub", "qpkg", "cpan", "hackage", "mlflow",
+        "m", "flow", "c", "an", "pan", "maven", "golang", "rpm", "deb", "nuget", "generic",
+    ])
+    def test_type_normalization_matches_installed_packageurl(self, ptype):
+        """Test every type-specific normalization against the installed packageurl-python."""
+        checked = 0
+        for spelled in (ptype, ptype.upper()):
+            for path in ("Name", "My_Pkg", "Ns/Name", "My_Ns/Sub/My_Pkg", "Caf%C3%89/x.Y-z"):
+                for qualifiers in ("", "?rpmmod=Mod", "?repository_url=Reg.io/Lib/x&rpmmod=a&RPMMOD=%20"):
+                    purl = f"pkg:{spelled}/{path}@1.0{qualifiers}"
+                    fields = _scan_purl(purl)
+                    if fields is None:
+                        continue
+                    parsed = PackageURL.from_string(purl)
+                    assert fields == (
+                        parsed.type,
+                        parsed.namespace,
+                        parsed.name,
+                        parsed.qualifiers.get("rpmmod"),
+                        parsed.qualifiers.get("repository_url"),
+                    ), purl
+                    checked += 1
+        assert checked or ptype in ("pub", "mlflow", "m", "flow")
+
+    @pytest.mark.parametrize("purl", [
+        "invalid-purl",
+        "pkg://npm/lodash@4.17.21",
+        "pkg:npm/@angular/core@14.0.0",
+        "pkg:npm/lodash@4.17.21?arch",
+        "pkg:npm/lodash@4.17.21?1arch=x86",
+        "pkg:npm/lodash/",
+        "pkg:npm/ lodash",
+        "pkg:npm/lodash\t",
+        "pkg:generic/host:8080/name",
+        "pkg:1type/name",
+        "pkg:pub/Flutter-Lib@1.0",
+        "pkg:mlflow/Model@1.0",
+    ])
+    def test_falls_back_for_odd_inputs(self, purl):
+        """Test that inputs outside the simple grammar are left to PackageURL."""
+        assert _scan_purl(purl) is None
+
+    def test_fallback_inputs_resolve_like_packageurl(self):
+        """Test that fallback inputs still resolve through ps_component_from_purl."""
+        assert ps_component_from_purl("pkg:npm/@angular/core@14.0.0") == "core"
+        assert ps_component_from_purl("pkg:npm/lodash/") == "lodash"
+        with pytest.raises(ValueError, match="Invalid PURL format"):
+            ps_component_from_purl("pkg:npm/lodash@4.17.21?arch")
+
+    def test_percent_encoded_repository_url(self):
+        """Test that an encoded repository_url is decoded before splitting."""
+        purl = "pkg:oci/nginx@1.21.0?repository_url=docker.io%2Flibrary"
+        assert ps_component_from_purl(purl) == "library/nginx"
@@ -0,0 +1,105 @@
+"""
+Tests for the snapshot diff.
+"""
+
+import pytest
+from particular_purl_parse.diff import (
+    CHANGE_ADDED,
+    CHANGE_CHANGED,
+    CHANGE_REMOVED,
+    ComponentDiff,
+    DiffRecord,
+    diff_components,
+)
+
+
+OLD = [
+    "pkg:rpm/redhat/nginx@1.20.0?rpmmod=nginx:1.20",
+    "pkg:rpm/redhat/nginx@1.20.1?rpmmod=nginx:1.20",
+    "pkg:npm/lodash@4.17.20",
+    "pkg:oci/redis@7.0?repository_url=docker.io/library",
+    "pkg:oci/nginx@1.21.0",
+    "invalid",
+]
+NEW = [
+    "pkg:rpm/redhat/nginx@1.22.0?rpmmod=nginx:1.22",
+    "pkg:npm/lodash@4.17.21",
+    "pkg:npm/lodash@4.17.21",
+    "pkg:pypi/requests@2.31.0",
+]
+
+
+class TestDiffComponents:
+    """Test cases for diff_components."""
+
+    def test_records(self):
+        """Test removed, added and changed records and their counts."""
+        diff = diff_components(OLD, NEW)
+        assert list(diff.records()) == [
+            DiffRecord(CHANGE_REMOVED, "library/redis", 1, 0),
+            DiffRecord(CHANGE_REMOVED, "nginx:1.20/nginx", 2, 0),
+            DiffRecord(CHANGE_ADDED, "nginx:1.22/nginx", 0, 1),
+            DiffRecord(CHANGE_ADDED, "requests", 0, 1),
+            DiffRecord(CHANGE_CHANGED, "rpm/redhat/nginx", 2, 1, ("nginx:1.20/nginx",), ("nginx:1.22/nginx",)),
+        ]
+
+    def test_summary(self):
+        """Test that the summary counts PURLs, errors, components and changes."""
+        assert diff_components(OLD, NEW).summary() == {
+            "old_purls": 6,
+            "old_errors": 2,
+            "old_components": 3,
+            "new_purls": 4,
+            "new_errors": 0,
+            "new_components": 3,
+            "added": 2,
+            "removed": 2,
+            "changed": 1,
+            "unchanged": 1,
+            "resolutions": 9,
+        }
+
+    def test_identical_snapshots(self):
+        """Test that equal snapshots in another order have no differences."""
+        diff = diff_components(OLD, list(reversed(OLD)))
+        assert list(diff.records()) == []
+        assert diff.summary()["resolutions"] == len(OLD)
+
+    def test_resolves_each_purl_once(self):
+        """Test that PURLs repeated within and across snapshots are parsed once."""
+        purls = [f"pkg:npm/package-{i % 50}@1.0.{i % 7}" for i in range(5000)]
+        diff = diff_components(purls, reversed(purls))
+        assert diff.summary()["resolutions"] == len(set(purls))
+
+    def test_bounded_cache_resolves_evicted_purls_again(self):
+        """Test that a bounded cache parses PURLs again once they are evicted."""
+        purls = [f"pkg:npm/package-{i}@1.0.0" for i in range(100)]
+        diff = diff_components(purls, reversed(purls), cache_size=10)
+        assert diff.summary()["resolutions"] > len(purls)
+
+    def test_interleaving_keeps_small_cache_effective(self):
+        """Test that long snapshots in the same order share a cache smaller than either."""
+        old = [f"pkg:npm/package-{i}@1.0.0" for i in range(10000)]
+        new = old[:5000] + [f"pkg:npm/extra-{i}@1.0.0" for i in range(10)] + old[5000:]
+        diff = diff_components(old, new, cache_size=4096)
+        assert diff.summary()["resolutions"] == 10010
+        assert [record.key for record in diff.records()] == sorted(f"extra-{i}" for i in range(10))
+
+    def test_incremental(self):
+        """Test that snapshots can be added in several calls, e.g. one per file."""
+        diff = ComponentDiff()
+        diff.add_old(OLD[:3])
+        diff.add_old(OLD[3:])
+        diff.add_new(NEW)
+        assert list(diff.records()) == list(diff_components(OLD, NEW).records())
+
+    def test_non_string_inputs_are_errors(self):
+        """Test that empty and non-string inputs count as errors."""
+        diff = diff_components(["", None, 42], [])
+        assert diff.summary()["old_errors"] == 3
+
+    @pytest.mark.parametrize("cache_size", [0, -1, 1.5])
+    def test_invalid_cache_size(self, cache_size):
+        """Test that a cache size that is not a positive integer is rejected."""
+        with pytest.raises(ValueError, match="cache_size must be a positive integer"):
+            ComponentDiff(cache_size)
@@ -0,0 +1,93 @@
+"""
+Tests for the import cost of the package.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative ``python -X importtime`` budget for ``import particular_purl_parse``,
+# in microseconds. The eager imports of packageurl and asyncio alone used to
+# take longer than this; the best of several runs is compared to limit noise.
+IMPORT_TIME_BUDGET_US = 100000
+IMPORT_TIME_RUNS = 3
+
+HEAVY_MODULES = ["packageurl", "asyncio", "concurrent.futures", "multiprocessing", "json", "threading"]
+
+
+def _run(code):
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _cumulative_import_time(stderr, module):
+    for line in stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    raise AssertionError(f"{module} not found in importtime output")
+
+
+class TestColdImport:
+    """Test cases for what importing the package loads."""
+
+    def test_heavy_modules_not_imported(self):
+        """Test that the package import leaves optional heavy modules unloaded."""
+        code = (
+            "import sys, particular_purl_parse\n"
+            f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        assert _run(code).stdout.strip() == ""
+
+    def test_packageurl_loaded_on_fallback(self):
+        """Test that packageurl is imported only once a PURL needs it."""
+        code = (
+            "import sys\n"
+            "from particular_purl_parse import ps_component_from_purl\n"
+            "ps_component_from_purl('pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx')\n"
+            "print('packageurl' in sys.modules)\n"
+            "ps_component_from_purl('pkg:pub/flutter@3.0.0')\n"
+            "print('packageurl' in sys.modules)"
+        )
+        assert _run(code).stdout.split() == ["False", "True"]
+
+    def test_cli_import(self):
+        """Test that the CLI module does not load the parallel or SBOM machinery."""
+        code = (
+            "import sys, particular_purl_parse.cli\n"
+            "print(' '.join(m for m in ['packageurl', 'concurrent.futures', 'particular_purl_parse.sbom'] "
+            "if m in sys.modules))"
+        )
+        assert _run(code).stdout.strip() == ""
+
+    @pytest.mark.parametrize("name", ["ComponentCache", "ParallelResolver", "iter_sbom_purls", "recording"])
+    def test_lazy_attributes(self, name):
+        """Test that lazily exported names resolve on access."""
+        import particular_purl_parse
+
+        assert getattr(particular_purl_parse, name).__name__ == name
+        assert name in dir(particular_purl_parse)
+
+    def test_unknown_attribute(self):
+        """Test that unknown names still raise AttributeError."""
+        import particular_purl_parse
+
+        with pytest.raises(AttributeError, match="no_such_name"):
+            particular_purl_parse.no_such_name
+
+
+class TestImportTimeBudget:
+    """Test case for the import-time budget."""
+
+    def test_import_time_budget(self):
+        """Test that the package import stays within its importtime budget."""
+        best = min(
+            _cumulative_import_time(_run("import particular_purl_parse").stderr, "particular_purl_parse")
+            for _ in range(IMPORT_TIME_RUNS)
+        )
+        assert best <= IMPORT_TIME_BUDGET_US, f"import took {best} us, budget {IMPORT_TIME_BUDGET_US} us"
@@ -0,0 +1,152 @@
+"""
+Tests for the reverse component index.
+"""
+
+import pytest
+from benchmarks.corpus import generate_corpus
+from particular_purl_parse.core import ps_component_from_purl
+from particular_purl_parse.index import FIELDS, ComponentIndex, ps_component_index_from_purls
+
+
+PURLS = [
+    "pkg:oci/nginx@1.21.0?repository_url=docker.io/library",
+    "pkg:rpm/fedora/python@3.9.0?rpmmod=python39",
+    "pkg:oci/nginx@1.22.0?repository_url=docker.io/library",
+    "pkg:oci/redis@7.0?repository_url=docker.io/library",
+    "pkg:npm/lodash@4.17.21",
+    "pkg:oci/nginx@1.21.0",
+    "pkg:rpm/redhat/python@3.9.1?rpmmod=python39",
+]
+
+
+class TestComponentIndex:
+    """Test cases for ComponentIndex."""
+
+    def test_ids_are_input_positions(self):
+        """Test that a batch on an empty index gets its positions as ids."""
+        index = ps_component_index_from_purls(PURLS, errors="return")
+        assert list(index.ids("library/nginx")) == [0, 2]
+        assert list(index.ids("python39/python")) == [1, 6]
+        assert index.purls("library/nginx") == [PURLS[0], PURLS[2]]
+        assert index.count("lodash") == 1
+        assert index.ids("missing").typecode == "i"
+        assert len(index.ids("missing")) == 0
+        assert "library/redis" in index
+        assert "missing" not in index
+
+    def test_components_and_facets(self):
+        """Test component listing and per-facet counts."""
+        index = ps_component_index_from_purls(PURLS, errors="skip")
+        assert index.components() == ["library/nginx", "python39/python", "library/redis", "lodash"]
+        assert index.counts() == {"library/nginx": 2, "python39/python": 2, "library/redis": 1, "lodash": 1}
+        assert index.counts("type") == {"oci": 3, "rpm": 2, "npm": 1}
+        assert index.counts("prefix") == {"library": 3, "python39": 2}
+        assert index.counts("prefix_source") == {"oci_repository": 3, "rpmmod": 2, "none": 1}
+        assert index.values("type") == ["oci", "rpm", "npm"]
+
+    def test_query_intersects(self):
+        """Test that queries return ids matching every given value."""
+        index = ps_component_index_from_purls(PURLS, errors="skip")
+        assert list(index.query(type="oci", prefix="library")) == [0, 2, 3]
+        assert list(index.query(component="library/nginx", type="oci")) == [0, 2]
+        assert list(index.query(type="rpm", prefix="library")) == []
+        assert list(index.query(prefix_source="none")) == [4]
+        with pytest.raises(ValueError, match="at least one"):
+            index.query()
+
+    def test_failures(self):
+        """Test that failed PURLs take an id without postings."""
+        index = ps_component_index_from_purls(PURLS, errors="return")
+        assert list(index.failed_ids()) == [5]
+        assert "Missing repository_url" in str(index.errors[5])
+        assert index.component(5) is None
+        assert index.purl(5) == PURLS[5]
+        assert len(index) == len(PURLS)
+        assert ps_component_index_from_purls(PURLS, errors="skip").errors == {}
+
+    def test_raise_policy(self):
+        """Test that the raise policy stops at the first failure."""
+        index = ComponentIndex()
+        with pytest.raises(ValueError, match="Missing repository_url"):
+            index.add_many(PURLS)
+        assert len(index) == 5
+        with pytest.raises(ValueError, match="PURL must be a non-empty string"):
+            index.add("")
+        assert len(index) == 5
+
+    def test_incremental_add_and_remove(self):
+        """Test that adding and removing keeps postings exact and ids unique."""
+        index = ComponentIndex()
+        assert index.add_many(PURLS[:3]) == range(0, 3)
+        assert index.add("pkg:oci/nginx@2.0?repository_url=docker.io/library") == 3
+        assert list(index.ids("library/nginx")) == [0, 2, 3]
+
+        index.remove(2)
+        assert list(index.ids("library/nginx")) == [0, 3]
+        assert index.purl(2) is None
+        assert index.component(2) is None
+        assert len(index) == 3
+        assert index.counts("type") == {"oci": 2, "rpm": 1}
+
+        index.remove(1)
+        assert "python39/python" not in index
+        assert index.components() == ["library/nginx"]
+        assert "prefix" in FIELDS and index.values("prefix") == ["library"]
+        assert index.add("pkg:npm/lodash@4.17.21") == 4
+
+    def test_remove_failed_and_unknown(self):
+        """Test removing failed ids and rejecting unknown or removed ids."""
+        index = ps_component_index_from_purls(["pkg:oci/nginx", None], errors="return")
+        index.remove(1)
+        index.remove(0)
+        assert list(index.failed_ids()) == []
+        assert index.errors == {}
+        for purl_id in (0, 2, -1):
+            with pytest.raises(ValueError, match="Unknown PURL id"):
+                index.remove(purl_id)
+
+    def test_remove_many(self):
+        """Test that removing a batch leaves the same index as removing one at a time."""
+        purls = [f"pkg:npm/package-{i % 7}@1.0.{i}" for i in range(100)] + PURLS
+        batch = ps_component_index_from_purls(purls, errors="return")
+        single = ps_component_index_from_purls(purls, errors="return")
+        removed = list(range(0, 100, 3)) + [len(purls) - 1, len(purls) - 2]
+        batch.remove_many(reversed(removed))
+        for purl_id in removed:
+            single.remove(purl_id)
+
+        assert len(batch) == len(single) == len(purls) - len(removed)
+        assert batch.errors == single.errors
+        for field in FIELDS:
+            assert batch.counts(field) == single.counts(field)
+            for value in batch.values(field):
+                assert batch.query(**{field: value}) == single.query(**{field: value})
+        assert list(batch.failed_ids()) == list(single.failed_ids())
+
+    def test_remove_many_rejects_invalid_ids(self):
+        """Test that a batch with an unknown, removed or repeated id removes nothing."""
+        index = ps_component_index_from_purls(PURLS[:3])
+        index.remove(1)
+        for purl_ids in ([0, 1], [0, 3], [2, 0, 2]):
+            with pytest.raises(ValueError, match="Unknown PURL id|more than once"):
+                index.remove_many(purl_ids)
+        assert len(index) == 2
+        assert list(index.ids("library/nginx")) == [0, 2]
+
+    def test_unknown_field(self):
+        """Test that unknown facet fields are rejected."""
+        index = ComponentIndex()
+        with pytest.raises(ValueError, match="Unknown field"):
+            index.counts("version")
+
+    def test_matches_resolution(self):
+        """Test that the index agrees with ps_component_from_purl on a corpus."""
+        corpus = generate_corpus(2000, seed=11)
+        index = ps_component_index_from_purls(corpus, errors="skip")
+        expected = {}
+        for position, purl in enumerate(corpus):
+            try:
+                expected.setdefault(ps_component_from_purl(purl), []).append(position)
+            except ValueError:
+                pass
+        assert {component: list(index.ids(component)) for component in index.components()} == expected
@@ -0,0 +1,181 @@
+"""
+Tests for the opt-in instrumentation of ps_component_from_purl.
+"""
+
+import json
+import threading
+
+import pytest
+from particular_purl_parse import core
+from particular_purl_parse.cache import ComponentCache
+from particular_purl_parse.core import ps_component_from_purl, ps_components_from_purls
+from particular_purl_parse.instrumentation import (
+    MetricsRecorder,
+    Recorder,
+    get_recorder,
+    recording,
+    set_recorder,
+)
+from particular_purl_parse.rules import oci_repository_rule, register_rule
+
+
+@pytest.fixture(autouse=True)
+def no_recorder():
+    """Make sure no test leaves a recorder installed."""
+    yield
+    set_recorder(None)
+
+
+class TestRecording:
+    """Test cases for the recorder installation API."""
+
+    def test_disabled_by_default(self):
+        """Test that no recorder is installed and the hook is unset."""
+        assert get_recorder() is None
+        assert core._instrumented_resolve is None
+
+    def test_recording_context(self):
+        """Test that recording installs and restores recorders."""
+        outer = MetricsRecorder()
+        set_recorder(outer)
+        with recording() as inner:
+            assert get_recorder() is inner
+            assert isinstance(inner, MetricsRecorder)
+        assert get_recorder() is outer
+        assert set_recorder(None) is outer
+        assert core._instrumented_resolve is None
+
+    def test_results_unchanged(self):
+        """Test that instrumented calls return and raise as usual."""
+        purls = [
+            "pkg:oci/nginx@1.21.0?repository_url=registry.io/library/nginx",
+            "pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx",
+            "pkg:npm/lodash@4.17.21",
+            "pkg:oci/nginx@1.21.0",
+            "invalid-purl",
+        ]
+        expected = [str(result) for result in ps_components_from_purls(purls, errors="return")]
+        with recording():
+            actual = [str(result) for result in ps_components_from_purls(purls, errors="return")]
+        assert actual == expected
+
+    def test_base_recorder_discards(self):
+        """Test that the base Recorder can be installed as a no-op."""
+        with recording(Recorder()):
+            assert ps_component_from_purl("pkg:npm/lodash@4.17.21") == "lodash"
+
+
+class TestCounters:
+    """Test cases for branch and error counters."""
+
+    def test_branches(self):
+        """Test per-branch counters and fast path/fallback split."""
+        with recording() as recorder:
+            ps_component_from_purl("pkg:oci/nginx@1.21.0?repository_url=registry.io/library/nginx")
+            ps_component_from_purl("pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx")
+            ps_component_from_purl("pkg:npm/lodash@4.17.21")
+            ps_component_from_purl("pkg:pub/flutter@3.0.0")
+        counters = recorder.snapshot()["counters"]
+        assert counters["purls_total"] == 4
+        assert counters["branch_oci"] == 1
+        assert counters["branch_rpmmod"] == 1
+        assert counters["branch_name"] == 2
+        assert counters["parse_fast_path"] == 3
+        assert counters["parse_fallback"] == 1
+
+    @pytest.mark.parametrize(
+        "purl,counter",
+        [
+            ("", "error_invalid_input"),
+            ("invalid-purl", "error_invalid_format"),
+            ("pkg:oci/nginx@1.21.0", "error_missing_repository_url"),
+            ("pkg:oci/nginx@1.21.0?repository_url=registry.io", "error_invalid_repository_url"),
+        ],
+    )
+    def test_error_classes(self, purl, counter):
+        """Test that each failure is counted under its error class."""
+        with recording() as recorder:
+            with pytest.raises(ValueError):
+                ps_component_from_purl(purl)
+        assert recorder.counter(counter) == 1
+        assert recorder.counter("purls_total") == 1
+
+    def test_error_class_of_replaced_rule(self, restore_rules):
+        """Test that failures of a replaced oci rule are counted under the error it raises."""
+        def strict_rule(fields):
+            raise ValueError("unsupported registry")
+
+        register_rule("oci", strict_rule, replace=True)
+        with recording() as recorder:
+            for purl in ("pkg:oci/nginx@1.21.0", "pkg:oci/nginx@1.21.0?repository_url=docker.io/library"):
+                with pytest.raises(ValueError):
+                    ps_component_from_purl(purl)
+        assert recorder.counter("error_rule_failed") == 2
+        assert recorder.counter("error_missing_repository_url") == 0
+
+        register_rule("oci", oci_repository_rule(2), replace=True)
+        with recording() as recorder:
+            with pytest.raises(ValueError):
+                ps_component_from_purl("pkg:oci/nginx@1.21.0?repository_url=docker.io/library")
+        assert recorder.counter("error_invalid_repository_url") == 1
+
+    def test_cache_misses_only(self):
+        """Test that cache hits do not reach the instrumented resolver."""
+        cache = ComponentCache()
+        with recording() as recorder:
+            ps_components_from_purls(["pkg:npm/lodash@4.17.21"] * 5, resolver=cache)
+        assert recorder.counter("purls_total") == 1
+
+    def test_thread_safety(self):
+        """Test that counts from several threads add up."""
+        def work():
+            ps_components_from_purls(["pkg:npm/lodash@4.17.21"] * 500)
+
+        with recording() as recorder:
+            threads = [threading.Thread(target=work) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert recorder.counter("branch_name") == 2000
+
+
+class TestHistograms:
+    """Test cases for stage timings."""
+
+    def test_stage_timings(self):
+        """Test that scan, fallback and component stages are timed."""
+        with recording() as recorder:
+            ps_component_from_purl("pkg:npm/lodash@4.17.21")
+            ps_component_from_purl("pkg:pub/flutter@3.0.0")
+        histograms = recorder.snapshot()["histograms"]
+        assert histograms["scan_seconds"]["count"] == 2
+        assert histograms["packageurl_seconds"]["count"] == 1
+        assert histograms["component_seconds"]["count"] == 2
+        assert histograms["packageurl_seconds"]["sum"] > 0
+
+    def test_cumulative_buckets(self):
+        """Test Prometheus-style cumulative bucket counts."""
+        recorder = MetricsRecorder(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            recorder.observe("latency", value)
+        histogram = recorder.snapshot()["histograms"]["latency"]
+        assert histogram["count"] == 4
+        assert histogram["sum"] == pytest.approx(2.65)
+        assert histogram["buckets"] == [(0.1, 2), (1.0, 3), ("+Inf", 4)]
+        json.dumps(recorder.snapshot())
+
+    def test_invalid_buckets(self):
+        """Test that unsorted or empty buckets are rejected."""
+        with pytest.raises(ValueError, match="strictly ascending"):
+            MetricsRecorder(buckets=(1.0, 0.5))
+        with pytest.raises(ValueError, match="strictly ascending"):
+            MetricsRecorder(buckets=())
+
+    def test_reset(self):
+        """Test that reset clears everything."""
+        recorder = MetricsRecorder()
+        recorder.increment("a")
+        recorder.observe("b", 0.1)
+        recorder.reset()
+        assert recorder.snapshot() == {"counters": {}, "histograms": {}}
@@ -24,6 +24,7 @@ class TestPackageIntegration:
         """Test that __all__ exports are correct."""
         from particular_purl_parse import __all__
         assert "ps_component_from_purl" in __all__
+        assert "ps_components_from_purls" in __all__
 
     def test_real_world_oci_examples(self):
         """Test with real-world OCI PURL examples."""
@@ -0,0 +1,24 @@
+"""
+Tests for the shared output line formats.
+"""
+
+import json
+
+from particular_purl_parse.output import format_line
+
+
+class TestFormatLine:
+    """Test cases for format_line."""
+
+    def test_tsv(self):
+        """Test TSV lines for resolved and failed PURLs."""
+        assert format_line("pkg:npm/a@1", "a", False) == "pkg:npm/a@1\ta\n"
+        assert format_line("bad", ValueError("Invalid PURL"), False) == "bad\t\tInvalid PURL\n"
+
+    def test_jsonl(self):
+        """Test JSON lines for resolved and failed PURLs, keeping non-ASCII text."""
+        assert json.loads(format_line("pkg:npm/a@1", "a", True)) == {"purl": "pkg:npm/a@1", "component": "a"}
+        line = format_line("pkg:generic/café", ValueError("Ω"), True)
+        assert line.endswith("\n")
+        assert "café" in line
+        assert json.loads(line) == {"purl": "pkg:generic/café", "error": "Ω"}
@@ -0,0 +1,75 @@
+"""
+Tests for the multiprocess batch resolver.
+"""
+
+import pytest
+from particular_purl_parse.core import ps_components_from_purls
+from particular_purl_parse.parallel import ParallelResolver
+
+
+@pytest.fixture
+def mixed_purls(sample_oci_purls, sample_rpm_purls, sample_regular_purls, invalid_purls):
+    """A mixed corpus spanning several chunks."""
+    return (sample_oci_purls + sample_rpm_purls + sample_regular_purls + invalid_purls) * 7
+
+
+class TestParallelResolver:
+    """Test cases for ParallelResolver."""
+
+    def test_matches_serial_batch(self, mixed_purls):
+        """Test that parallel results match the serial batch API in order."""
+        with ParallelResolver(workers=2, chunksize=4) as resolver:
+            result = resolver.resolve(mixed_purls, errors="skip")
+        assert result == ps_components_from_purls(mixed_purls, errors="skip")
+
+    def test_return_policy(self, mixed_purls):
+        """Test that errors come back in place with the return policy."""
+        with ParallelResolver(workers=2, chunksize=4) as resolver:
+            result = resolver.resolve(mixed_purls, errors="return")
+        expected = ps_components_from_purls(mixed_purls, errors="return")
+        assert [str(item) for item in result] == [str(item) for item in expected]
+        assert [type(item) for item in result] == [type(item) for item in expected]
+
+    def test_raise_policy(self, mixed_purls):
+        """Test that a worker error propagates to the caller."""
+        with ParallelResolver(workers=2, chunksize=4) as resolver:
+            with pytest.raises(ValueError):
+                resolver.resolve(mixed_purls)
+
+    def test_pool_is_reused(self, sample_regular_purls):
+        """Test that the worker pool survives across calls."""
+        purls = sample_regular_purls * 4
+        with ParallelResolver(workers=2, chunksize=2) as resolver:
+            resolver.resolve(purls)
+            pool = resolver._pool
+            resolver.resolve(purls)
+            assert resolver._pool is pool
+        assert resolver._pool is None
+
+    def test_small_input_resolved_inline(self, sample_regular_purls):
+        """Test that a single chunk does not start the pool."""
+        resolver = ParallelResolver(workers=2, chunksize=100)
+        assert resolver.resolve(sample_regular_purls) == ["lodash", "requests", "spring-core"]
+        assert resolver._pool is None
+
+    def test_iter_resolve_consumes_generator(self):
+        """Test that lazy resolution works on generator input."""
+        purls = (f"pkg:npm/pkg{i}@1.0.0" for i in range(50))
+        with ParallelResolver(workers=2, chunksize=7) as resolver:
+            result = list(resolver.iter_resolve(purls))
+        assert result == [f"pkg{i}" for i in range(50)]
+
+    def test_empty_input(self):
+        """Test that empty input yields no results."""
+        assert ParallelResolver(workers=1).resolve([]) == []
+
+    @pytest.mark.parametrize("kwargs", [{"workers": 0}, {"chunksize": 0}])
+    def test_invalid_settings(self, kwargs):
+        """Test that non-positive settings are rejected."""
+        with pytest.raises(ValueError, match="must be a positive integer"):
+            ParallelResolver(**kwargs)
+
+    def test_invalid_policy(self):
+        """Test that an unknown error policy is rejected."""
+        with pytest.raises(ValueError, match="Invalid errors policy"):
+            ParallelResolver(workers=1).resolve(["pkg:npm/lodash@4.17.21"], errors="ignore")
@@ -0,0 +1,128 @@
+"""
+Tests for the sampling profiler.
+"""
+
+import io
+import threading
+import tracemalloc
+
+import pytest
+from particular_purl_parse import ps_components_from_purls
+from particular_purl_parse.cli import main
+from particular_purl_parse.profiling import STAGE_OTHER, STAGE_PARSE, STAGE_RULE, STAGES, Profiler
+
+
+PURLS = [
+    "pkg:oci/nginx@1.21.0?repository_url=docker.io/library",
+    "pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx",
+    "pkg:npm/%40scope/lodash@4.17.21",
+    "pkg:maven/org.apache/commons-lang3@3.12.0",
+] * 2000
+
+
+def _busy_profile(purls=PURLS, samples=20, **kwargs):
+    profiler = Profiler(interval=0.0005, **kwargs)
+    with profiler:
+        while sum(profiler.stage_samples.values()) < samples:
+            ps_components_from_purls(purls)
+    return profiler
+
+
+class TestProfiler:
+    """Test cases for Profiler."""
+
+    def test_attributes_samples_to_stages(self):
+        """Test that resolving PURLs is sampled in the parse and rule stages."""
+        profiler = _busy_profile()
+        assert profiler.elapsed > 0
+        assert set(profiler.stage_samples) <= set(STAGES)
+        assert profiler.stage_samples[STAGE_PARSE] > 0
+        assert profiler.stage_samples[STAGE_PARSE] + profiler.stage_samples[STAGE_RULE] > (
+            profiler.stage_samples[STAGE_OTHER]
+        )
+        seconds = profiler.stage_seconds()
+        assert list(seconds) == list(STAGES)
+        assert sum(seconds.values()) == pytest.approx(profiler.cpu_time)
+
+    def test_parse_dominates_file_pipeline(self, tmp_path):
+        """Test that a resolve run reading and writing real files is mostly spent parsing."""
+        source = tmp_path / "purls.txt"
+        source.write_text(
+            "".join(
+                f"pkg:rpm/redhat/package-{i}@1.{i % 10}.0-1.el9?arch=x86_64&rpmmod=module-{i % 7}:1\n"
+                f"pkg:oci/image-{i}@sha256%3A{i:064x}?repository_url=quay.io/org-{i % 5}&tag=v{i}\n"
+                f"pkg:maven/org.example.group{i % 9}/artifact-{i}@2.{i}.0?type=jar\n"
+                for i in range(20000)
+            ),
+            encoding="utf-8",
+        )
+        with Profiler() as profiler:
+            assert main(["resolve", str(source), "-o", str(tmp_path / "components.tsv")]) == 0
+        samples = profiler.stage_samples
+        assert sum(samples.values()) >= 20
+        assert samples[STAGE_PARSE] == max(samples.values())
+        assert samples[STAGE_PARSE] > sum(samples.values()) / 2
+
+    def test_write_collapsed(self):
+        """Test that collapsed stacks have one frame;frame count line per stack."""
+        profiler = _busy_profile()
+        stream = io.StringIO()
+        profiler.write_collapsed(stream)
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == len(profiler.samples)
+        total = 0
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            assert ";" in stack
+            total += int(count)
+        assert total == sum(profiler.samples.values())
+        assert any("core:_scan_purl" in line for line in lines)
+
+    def test_report(self):
+        """Test that the report lists every stage and the hottest frames."""
+        report = _busy_profile().report(top=3)
+        for stage in STAGES:
+            assert f"\n{stage} " in report
+        assert "Hottest frames (self time):" in report
+        assert "Traced memory" not in report
+
+    def test_memory(self):
+        """Test that memory profiling traces allocations and stops tracemalloc again."""
+        assert not tracemalloc.is_tracing()
+        profiler = _busy_profile(PURLS[:200], samples=1, memory=True)
+        assert not tracemalloc.is_tracing()
+        assert profiler.peak_memory > 0
+        assert list(profiler.stage_memory()) == list(STAGES)
+        assert "Traced memory" in profiler.report()
+
+    def test_idle(self):
+        """Test a profiler stopped before taking any sample."""
+        profiler = Profiler(interval=60)
+        profiler.start()
+        profiler.stop()
+        assert profiler.stage_seconds() == dict.fromkeys(STAGES, 0.0)
+        assert profiler.report().startswith("Profile: ")
+        profiler.stop()
+
+    def test_invalid(self):
+        """Test that a non-positive interval and a double start are rejected."""
+        with pytest.raises(ValueError, match="interval must be positive"):
+            Profiler(interval=0)
+        with Profiler(interval=60) as profiler:
+            with pytest.raises(ValueError, match="already running"):
+                profiler.start()
+
+    def test_main_thread_only(self):
+        """Test that starting outside the main thread is rejected."""
+        errors = []
+
+        def start():
+            try:
+                Profiler().start()
+            except ValueError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=start)
+        thread.start()
+        thread.join()
+        assert "main thread" in str(errors[0])
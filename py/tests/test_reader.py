@@ -0,0 +1,69 @@
+"""
+Tests for the memory-mapped PURL reader.
+"""
+
+import pytest
+from particular_purl_parse.cli import _iter_input_purls, main
+from particular_purl_parse.reader import iter_mmap_purls
+
+
+@pytest.fixture
+def purl_file(tmp_path):
+    """A file mixing line endings, blank lines, whitespace and bad UTF-8."""
+    path = tmp_path / "purls.txt"
+    path.write_bytes(
+        b"pkg:npm/lodash@4.17.21\n"
+        b"\n"
+        b"  pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx  \r\n"
+        b"pkg:generic/caf\xc3\xa9@1.0\n"
+        b"pkg:generic/bad\xff@1.0\n"
+        b"   \n"
+        b"pkg:oci/nginx@1.21.0"
+    )
+    return path
+
+
+class TestIterMmapPurls:
+    """Test cases for iter_mmap_purls."""
+
+    def test_matches_line_reader(self, purl_file):
+        """Test that the mmap reader yields the same PURLs as line-by-line reading."""
+        assert list(iter_mmap_purls(purl_file)) == list(_iter_input_purls([str(purl_file)]))
+        assert list(iter_mmap_purls(purl_file))[2] == "pkg:generic/café@1.0"
+
+    @pytest.mark.parametrize("window_size", [1, 3, 16, 64, 1 << 20])
+    def test_window_sizes(self, purl_file, window_size):
+        """Test that records are never split across windows."""
+        assert list(iter_mmap_purls(purl_file, window_size=window_size)) == list(iter_mmap_purls(purl_file))
+
+    def test_multibyte_at_window_boundary(self, tmp_path):
+        """Test that multi-byte characters are not cut at window ends."""
+        path = tmp_path / "utf8.txt"
+        lines = [f"pkg:generic/{'é' * i}@1.0" for i in range(1, 40)]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        for window_size in (5, 7, 13):
+            assert list(iter_mmap_purls(path, window_size=window_size)) == lines
+
+    def test_empty_file(self, tmp_path):
+        """Test that empty files yield nothing."""
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        assert list(iter_mmap_purls(path)) == []
+
+    def test_invalid_window_size(self, purl_file):
+        """Test that the window size must be positive."""
+        with pytest.raises(ValueError, match="window_size"):
+            list(iter_mmap_purls(purl_file, window_size=0))
+
+    def test_early_close(self, purl_file):
+        """Test that abandoning the iterator releases the mapping."""
+        iterator = iter_mmap_purls(purl_file, window_size=8)
+        assert next(iterator) == "pkg:npm/lodash@4.17.21"
+        iterator.close()
+
+    def test_cli_mmap(self, purl_file, capsys):
+        """Test that resolve --mmap writes the same output as line mode."""
+        assert main(["resolve", str(purl_file)]) == 0
+        expected = capsys.readouterr().out
+        assert main(["resolve", "--mmap", str(purl_file)]) == 0
+        assert capsys.readouterr().out == expected
@@ -0,0 +1,87 @@
+"""
+Tests for structured component records.
+"""
+
+import pickle
+
+import pytest
+from particular_purl_parse.core import ps_component_from_purl
+from particular_purl_parse.records import (
+    PREFIX_NONE,
+    PREFIX_OCI_REPOSITORY,
+    PREFIX_RPMMOD,
+    PurlComponent,
+    ps_component_record_from_purl,
+    ps_component_records_from_purls,
+)
+
+
+class TestPsComponentRecordFromPurl:
+    """Test cases for ps_component_record_from_purl."""
+
+    def test_oci_record(self):
+        """Test that OCI records carry the repository prefix."""
+        record = ps_component_record_from_purl("pkg:oci/nginx@1.21.0?repository_url=docker.io/library")
+        assert record.type == "oci"
+        assert record.prefix_source == PREFIX_OCI_REPOSITORY
+        assert record.prefix == "library"
+        assert record.name == "nginx"
+        assert str(record) == "library/nginx"
+
+    def test_rpmmod_record(self):
+        """Test that RPM module records carry the rpmmod prefix."""
+        record = ps_component_record_from_purl("pkg:rpm/fedora/python@3.9.0?rpmmod=python39")
+        assert record == PurlComponent("rpm", PREFIX_RPMMOD, "python39", "python")
+        assert record.component == "python39/python"
+
+    def test_plain_record(self):
+        """Test that plain records have no prefix and reuse the name string."""
+        record = ps_component_record_from_purl("pkg:npm/lodash@4.17.21")
+        assert record.prefix_source == PREFIX_NONE
+        assert record.prefix is None
+        assert record.component is record.name
+
+    def test_component_is_cached(self):
+        """Test that the component string is built once."""
+        record = ps_component_record_from_purl("pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx")
+        assert record.component is record.component
+
+    def test_matches_ps_component_from_purl(self, sample_oci_purls, sample_rpm_purls, sample_regular_purls):
+        """Test that records stringify to the same components."""
+        for purl in sample_oci_purls + sample_rpm_purls + sample_regular_purls:
+            assert str(ps_component_record_from_purl(purl)) == ps_component_from_purl(purl)
+
+    def test_same_errors(self, invalid_purls):
+        """Test that errors match ps_component_from_purl."""
+        for purl in invalid_purls:
+            with pytest.raises(ValueError) as expected:
+                ps_component_from_purl(purl)
+            with pytest.raises(ValueError, match=str(expected.value).replace("[", "\\[")):
+                ps_component_record_from_purl(purl)
+
+    def test_immutable(self):
+        """Test that record attributes cannot be reassigned or extended."""
+        record = ps_component_record_from_purl("pkg:npm/lodash@4.17.21")
+        with pytest.raises(AttributeError):
+            record.name = "other"
+        with pytest.raises(AttributeError):
+            record.extra = 1
+
+    def test_hashable_and_picklable(self):
+        """Test that records work as dict keys and survive pickling."""
+        record = ps_component_record_from_purl("pkg:oci/nginx@1.21.0?repository_url=docker.io/library")
+        copy = pickle.loads(pickle.dumps(record))
+        assert copy == record
+        assert {record: 1}[copy] == 1
+
+
+class TestPsComponentRecordsFromPurls:
+    """Test cases for ps_component_records_from_purls."""
+
+    def test_batch(self, invalid_purls):
+        """Test that the batch API applies the error policy."""
+        purls = ["pkg:npm/lodash@4.17.21"] + invalid_purls
+        records = ps_component_records_from_purls(purls, errors="return")
+        assert records[0] == PurlComponent("npm", PREFIX_NONE, None, "lodash")
+        assert all(isinstance(item, ValueError) for item in records[1:])
+        assert len(ps_component_records_from_purls(purls, errors="skip")) == 1
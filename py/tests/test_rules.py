@@ -0,0 +1,160 @@
+"""
+Tests for the per-type component rule registry.
+"""
+
+import pytest
+from particular_purl_parse import core
+from particular_purl_parse.columnar import ERROR_CODE_NAMES, ps_component_columns_from_purls
+from particular_purl_parse.core import ps_component_from_purl
+from particular_purl_parse.records import ps_component_record_from_purl
+from particular_purl_parse.rules import (
+    InvalidRepositoryURLError,
+    MissingRepositoryURLError,
+    get_rule,
+    namespace_rule,
+    oci_repository_rule,
+    register_rule,
+    registered_rules,
+    unregister_rule,
+)
+
+
+# Restore the dispatch table after each test
+pytestmark = pytest.mark.usefixtures("restore_rules")
+
+
+class TestRegistry:
+    """Test cases for registering and looking up rules."""
+
+    def test_builtin_rules(self):
+        """Test that only oci is registered out of the box."""
+        assert list(registered_rules()) == ["oci"]
+        assert get_rule("npm") is core._rpmmod_rule
+        assert get_rule("OCI") is core._oci_rule
+
+    def test_register_and_unregister(self):
+        """Test registering a rule for a new type and removing it."""
+        register_rule("Maven", namespace_rule)
+        assert ps_component_from_purl("pkg:maven/org.springframework/spring-core@5.3.0") == (
+            "org.springframework/spring-core"
+        )
+        assert unregister_rule("maven") is namespace_rule
+        assert ps_component_from_purl("pkg:maven/org.springframework/spring-core@5.3.0") == "spring-core"
+        assert unregister_rule("maven") is None
+
+    def test_duplicate_registration(self):
+        """Test that replacing a rule must be explicit."""
+        with pytest.raises(ValueError, match="already registered"):
+            register_rule("oci", namespace_rule)
+        register_rule("oci", oci_repository_rule(0), replace=True)
+        assert ps_component_from_purl("pkg:oci/nginx@1.21.0?repository_url=docker.io/library") == (
+            "docker.io/nginx"
+        )
+
+    @pytest.mark.parametrize("ptype", ["", None])
+    def test_invalid_type(self, ptype):
+        """Test that the type must be a non-empty string."""
+        with pytest.raises(ValueError, match="non-empty string"):
+            register_rule(ptype, namespace_rule)
+
+    def test_custom_rule(self):
+        """Test a user-defined rule with its own prefix source and errors."""
+        def golang_rule(fields):
+            namespace = fields[1]
+            if not namespace or "/" not in namespace:
+                raise ValueError("golang PURL needs a module path namespace")
+            return "module_host", namespace.split("/", 1)[0]
+
+        register_rule("golang", golang_rule)
+        assert ps_component_from_purl("pkg:golang/github.com/gorilla/mux@v1.8.0") == "github.com/mux"
+        record = ps_component_record_from_purl("pkg:golang/github.com/gorilla/mux@v1.8.0")
+        assert record.prefix_source == "module_host"
+        with pytest.raises(ValueError, match="module path namespace"):
+            ps_component_from_purl("pkg:golang/mux@v1.8.0")
+
+
+class TestBuiltinRuleFactories:
+    """Test cases for the shipped rule building blocks."""
+
+    @pytest.mark.parametrize(
+        "purl,expected",
+        [
+            ("pkg:golang/github.com/gorilla/mux@v1.8.0", "github.com/gorilla/mux"),
+            ("pkg:golang/mux@v1.8.0", "mux"),
+            ("pkg:golang/mux@v1.8.0?rpmmod=go", "go/mux"),
+            ("pkg:golang/github.com/gorilla/mux%2Fv2@v2.0.0", "github.com/gorilla/mux/v2"),
+        ],
+    )
+    def test_namespace_rule(self, purl, expected):
+        """Test namespace prefixes, with the rpmmod default without a namespace."""
+        register_rule("golang", namespace_rule)
+        assert ps_component_from_purl(purl) == expected
+
+    def test_namespace_rule_record(self):
+        """Test the namespace prefix source on records."""
+        register_rule("maven", namespace_rule)
+        record = ps_component_record_from_purl("pkg:maven/org.apache.commons/commons-io@2.0")
+        assert (record.prefix_source, record.prefix, record.name) == (
+            "namespace", "org.apache.commons", "commons-io"
+        )
+
+    def test_oci_repository_segment(self):
+        """Test a different repository_url segment index for OCI."""
+        register_rule("oci", oci_repository_rule(2), replace=True)
+        purl = "pkg:oci/nginx@1.21.0?repository_url=registry.io/team/project"
+        assert ps_component_from_purl(purl) == "project/nginx"
+        with pytest.raises(InvalidRepositoryURLError, match="insufficient path components"):
+            ps_component_from_purl("pkg:oci/nginx@1.21.0?repository_url=docker.io/library")
+        with pytest.raises(MissingRepositoryURLError, match="Missing repository_url"):
+            ps_component_from_purl("pkg:oci/nginx@1.21.0")
+
+    def test_oci_default_segment_is_builtin(self):
+        """Test that segment 1 reuses the built-in rule."""
+        assert oci_repository_rule() is get_rule("oci")
+        with pytest.raises(ValueError, match="non-negative"):
+            oci_repository_rule(-1)
+
+    def test_columnar_prefix_sources(self):
+        """Test that columnar output encodes registered rule sources."""
+        register_rule("maven", namespace_rule)
+        register_rule("golang", lambda fields: ("custom", "go"))
+        columns = ps_component_columns_from_purls([
+            "pkg:maven/org.example/lib@1.0",
+            "pkg:golang/github.com/gorilla/mux@v1.8.0",
+            "pkg:golang/github.com/gorilla/mux@v1.8.0",
+        ])
+        assert columns.prefix_source_names[3:] == ["namespace", "custom"]
+        assert list(columns.prefix_sources) == [3, 4, 4]
+        assert [columns[row] for row in range(3)] == ["org.example/lib", "go/mux", "go/mux"]
+
+    def test_columnar_rule_errors(self):
+        """Test that columnar error codes come from the error a rule raises."""
+        def oci_rule(fields):
+            raise ValueError("unsupported registry")
+
+        register_rule("oci", oci_rule, replace=True)
+        register_rule("conan", lambda fields: core._oci_prefix(fields[4]))
+        columns = ps_component_columns_from_purls([
+            "pkg:oci/nginx",
+            "pkg:conan/zlib@1.2",
+            "pkg:conan/zlib@1.2?repository_url=center",
+        ])
+        assert [ERROR_CODE_NAMES[code] for code in columns.error_codes] == [
+            "rule_failed", "missing_repository_url", "invalid_repository_url"
+        ]
+
+    def test_instrumentation_branches(self):
+        """Test that registered rules show up in the instrumentation counters."""
+        from particular_purl_parse.instrumentation import recording
+
+        def failing_rule(fields):
+            raise ValueError("unsupported")
+
+        register_rule("maven", namespace_rule)
+        register_rule("golang", failing_rule)
+        with recording() as recorder:
+            ps_component_from_purl("pkg:maven/org.example/lib@1.0")
+            with pytest.raises(ValueError):
+                ps_component_from_purl("pkg:golang/mux@v1.8.0")
+        assert recorder.counter("branch_namespace") == 1
+        assert recorder.counter("error_rule_failed") == 1
@@ -0,0 +1,171 @@
+"""
+Tests for streaming SBOM ingestion.
+"""
+
+import io
+import json
+
+import pytest
+from particular_purl_parse import sbom
+from particular_purl_parse.cli import main
+from particular_purl_parse.sbom import _iter_json_events, _reader, iter_sbom_components, iter_sbom_purls
+
+
+CYCLONEDX = {
+    "bomFormat": "CycloneDX",
+    "specVersion": "1.5",
+    "metadata": {"component": {"name": "product", "purl": "pkg:oci/product@1.0"}},
+    "components": [
+        {
+            "name": "nginx",
+            "purl": "pkg:oci/nginx@1.21.0?repository_url=docker.io/library",
+            "components": [{"name": "openssl", "purl": "pkg:rpm/redhat/openssl@3.0.7?rpmmod=openssl"}],
+        },
+        {"name": "no-purl", "hashes": [{"alg": "SHA-256", "content": "00"}]},
+        {"name": "broken", "purl": "pkg:oci/broken@1.0"},
+        {"name": "lodash", "purl": "pkg:npm/lodash@4.17.21", "properties": [{"name": "purl", "value": "x"}]},
+    ],
+    "dependencies": [{"ref": "nginx", "dependsOn": ["openssl"]}],
+}
+
+SPDX = {
+    "spdxVersion": "SPDX-2.3",
+    "packages": [
+        {
+            "name": "nginx",
+            "externalRefs": [
+                {"referenceCategory": "SECURITY", "referenceType": "cpe23Type", "referenceLocator": "cpe:2.3:a:nginx"},
+                {
+                    "referenceLocator": "pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx",
+                    "referenceCategory": "PACKAGE-MANAGER",
+                    "referenceType": "purl",
+                },
+            ],
+        },
+        {"name": "requests", "externalRefs": [
+            {"referenceCategory": "PACKAGE-MANAGER", "referenceType": "purl", "referenceLocator": "pkg:pypi/requests@2.28.0"},
+        ]},
+    ],
+    "relationships": [{"spdxElementId": "SPDXRef-DOCUMENT", "relationshipType": "DESCRIBES"}],
+}
+
+
+def _rebuild(events):
+    """Rebuild a Python value from parser events."""
+    stack, keys, root = [], [], []
+
+    def add(value):
+        if not stack:
+            root.append(value)
+        elif isinstance(stack[-1], list):
+            stack[-1].append(value)
+        else:
+            stack[-1][keys[-1]] = value
+
+    for event, value in events:
+        if event in ("start_map", "start_array"):
+            container = {} if event == "start_map" else []
+            add(container)
+            stack.append(container)
+            keys.append(None)
+        elif event in ("end_map", "end_array"):
+            stack.pop()
+            keys.pop()
+        elif event == "map_key":
+            keys[-1] = value
+        else:
+            add(value)
+    return root[0]
+
+
+class TestJsonEvents:
+    """Test cases for the incremental JSON parser."""
+
+    @pytest.mark.parametrize("read_size", [1, 3, 64, 65536])
+    @pytest.mark.parametrize("document", [
+        CYCLONEDX,
+        SPDX,
+        [1, -2.5e3, 0, True, False, None, "", "x\"\\é😀", {"k\n": [[], {}]}, 12345678901234567890],
+        "just a string",
+        42,
+    ])
+    def test_roundtrip(self, monkeypatch, read_size, document):
+        """Test that events rebuild the document at every chunk boundary."""
+        monkeypatch.setattr(sbom, "READ_SIZE", read_size)
+        for text in (json.dumps(document), json.dumps(document, indent=2, ensure_ascii=False)):
+            assert _rebuild(_iter_json_events(_reader(io.StringIO(text)))) == document
+            assert _rebuild(_iter_json_events(_reader(io.BytesIO(text.encode("utf-8"))))) == document
+
+    @pytest.mark.parametrize("text", ["", "{", "[1,]", '{"a" 1}', "[1 2]", '{"a":1}}', "tru", '"abc', "[01]", "[1]x"])
+    def test_invalid_json(self, text):
+        """Test that malformed documents raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid JSON"):
+            list(_iter_json_events(_reader(io.StringIO(text))))
+
+
+class TestIterSbomPurls:
+    """Test cases for iter_sbom_purls."""
+
+    def test_cyclonedx(self):
+        """Test that component PURLs are found, including nested ones."""
+        assert list(iter_sbom_purls(io.StringIO(json.dumps(CYCLONEDX)))) == [
+            "pkg:oci/nginx@1.21.0?repository_url=docker.io/library",
+            "pkg:rpm/redhat/openssl@3.0.7?rpmmod=openssl",
+            "pkg:oci/broken@1.0",
+            "pkg:npm/lodash@4.17.21",
+        ]
+
+    def test_spdx(self):
+        """Test that only purl externalRefs are returned."""
+        assert list(iter_sbom_purls(io.StringIO(json.dumps(SPDX)))) == [
+            "pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx",
+            "pkg:pypi/requests@2.28.0",
+        ]
+
+    def test_path_source(self, tmp_path):
+        """Test reading a document from a path, with a UTF-8 BOM."""
+        path = tmp_path / "bom.json"
+        path.write_bytes(b"\xef\xbb\xbf" + json.dumps(SPDX).encode("utf-8"))
+        assert len(list(iter_sbom_purls(path))) == 2
+        assert len(list(iter_sbom_purls(str(path)))) == 2
+
+    @pytest.mark.parametrize("document", [CYCLONEDX, SPDX])
+    def test_large_elements_are_tokenized(self, monkeypatch, document):
+        """Test that elements over the size limit give the same PURLs."""
+        text = json.dumps(document)
+        expected = list(iter_sbom_purls(io.StringIO(text)))
+        monkeypatch.setattr(sbom, "MAX_ELEMENT_SIZE", 1)
+        monkeypatch.setattr(sbom, "READ_SIZE", 8)
+        assert list(iter_sbom_purls(io.StringIO(text))) == expected
+
+
+class TestIterSbomComponents:
+    """Test cases for iter_sbom_components."""
+
+    def test_return_policy(self):
+        """Test that errors are returned in place."""
+        pairs = list(iter_sbom_components(io.StringIO(json.dumps(CYCLONEDX)), errors="return"))
+        assert pairs[0] == ("pkg:oci/nginx@1.21.0?repository_url=docker.io/library", "library/nginx")
+        assert pairs[1] == ("pkg:rpm/redhat/openssl@3.0.7?rpmmod=openssl", "openssl/openssl")
+        assert isinstance(pairs[2][1], ValueError)
+        assert pairs[3] == ("pkg:npm/lodash@4.17.21", "lodash")
+
+    def test_skip_policy(self):
+        """Test that failed PURLs are dropped."""
+        pairs = list(iter_sbom_components(io.StringIO(json.dumps(CYCLONEDX)), errors="skip"))
+        assert [component for _, component in pairs] == ["library/nginx", "openssl/openssl", "lodash"]
+
+    def test_raise_policy(self):
+        """Test that the first failed PURL raises."""
+        with pytest.raises(ValueError, match="Missing repository_url in OCI PURL"):
+            list(iter_sbom_components(io.StringIO(json.dumps(CYCLONEDX))))
+
+    def test_sbom_command(self, tmp_path, capsys):
+        """Test the sbom CLI subcommand."""
+        path = tmp_path / "spdx.json"
+        path.write_text(json.dumps(SPDX), encoding="utf-8")
+        assert main(["sbom", str(path)]) == 0
+        assert capsys.readouterr().out == (
+            "pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx\tnginx/nginx\n"
+            "pkg:pypi/requests@2.28.0\trequests\n"
+        )
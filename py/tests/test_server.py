@@ -0,0 +1,216 @@
+"""
+Tests for the HTTP resolver service, against localhost only.
+"""
+
+import http.client
+import json
+import socket
+import threading
+from urllib.parse import quote
+
+import pytest
+from particular_purl_parse.core import ps_components_from_purls
+from particular_purl_parse.instrumentation import recording
+from particular_purl_parse.output import format_line
+from particular_purl_parse.server import ResolverServer, _ResolverHandler
+
+
+@pytest.fixture
+def server():
+    """Run a ResolverServer on a free localhost port."""
+    server = ResolverServer(("127.0.0.1", 0), workers=2, max_concurrency=4, chunksize=2)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def connection(server):
+    """Open a keep-alive connection to the server."""
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    yield connection
+    connection.close()
+
+
+def _request(connection, method, path, body=None, headers=None):
+    connection.request(method, path, body=body, headers=headers or {})
+    response = connection.getresponse()
+    return response, response.read()
+
+
+class TestResolverServer:
+    """Test cases for ResolverServer."""
+
+    def test_single(self, connection):
+        """Test resolving one PURL, including failures."""
+        purl = "pkg:oci/nginx@1.21.0?repository_url=docker.io/library"
+        response, body = _request(connection, "GET", f"/resolve?purl={quote(purl)}")
+        assert response.status == 200
+        assert json.loads(body) == {"purl": purl, "component": "library/nginx"}
+
+        response, body = _request(connection, "GET", f"/resolve?purl={quote('pkg:oci/nginx')}")
+        assert response.status == 422
+        assert "Missing repository_url" in json.loads(body)["error"]
+
+        response, _ = _request(connection, "GET", "/resolve")
+        assert response.status == 400
+
+    def test_batch_newline_body(self, connection):
+        """Test a newline-delimited batch streamed back as JSON lines in order."""
+        purls = ["pkg:npm/lodash@4.17.21", "", "pkg:oci/nginx", "pkg:rpm/redhat/nginx?rpmmod=nginx", "pkg:pypi/requests"]
+        response, body = _request(connection, "POST", "/resolve", "\r\n".join(purls).encode())
+        assert response.status == 200
+        assert response.getheader("Content-Type") == "application/x-ndjson"
+        assert response.getheader("Transfer-Encoding") == "chunked"
+        lines = [json.loads(line) for line in body.decode().splitlines()]
+        assert [line["purl"] for line in lines] == [purl for purl in purls if purl]
+        assert lines[0]["component"] == "lodash"
+        assert "error" in lines[1]
+        assert lines[2]["component"] == "nginx/nginx"
+        assert lines[3]["component"] == "requests"
+
+    def test_batch_json_body(self, connection):
+        """Test a JSON array batch, with lines formatted as resolve --format jsonl writes them."""
+        purls = ["pkg:npm/lodash@4.17.21", "", "pkg:oci/测试"]
+        response, data = _request(
+            connection, "POST", "/resolve", json.dumps(purls), {"Content-Type": "application/json; charset=utf-8"}
+        )
+        assert response.status == 200
+        lines = [json.loads(line) for line in data.decode().splitlines()]
+        assert lines[0] == {"purl": "pkg:npm/lodash@4.17.21", "component": "lodash"}
+        assert lines[1] == {"purl": "", "error": "PURL must be a non-empty string"}
+        results = ps_components_from_purls(purls, errors="return")
+        assert data.decode() == "".join(format_line(purl, result, True) for purl, result in zip(purls, results))
+
+    @pytest.mark.parametrize("body", ["[", '{"purl": "pkg:npm/a"}', '["pkg:npm/a", 42]', '[null]'])
+    def test_invalid_json_body(self, connection, body):
+        """Test that bodies other than a JSON array of strings are rejected."""
+        response, data = _request(connection, "POST", "/resolve", body, {"Content-Type": "application/json"})
+        assert response.status == 400
+        assert "error" in json.loads(data)
+
+    def test_body_timeout_while_streaming(self, server, monkeypatch):
+        """Test that a body stalling mid-stream ends the response early and visibly."""
+        monkeypatch.setattr(_ResolverHandler, "timeout", 0.5)
+        host, port = server.server_address[:2]
+        with socket.create_connection((host, port), timeout=10) as client:
+            body = b"pkg:npm/lodash@4.17.21\n" * 4
+            client.sendall(
+                b"POST /resolve HTTP/1.1\r\nHost: test\r\nContent-Length: %d\r\n\r\n" % (len(body) + 100) + body
+            )
+            response = http.client.HTTPResponse(client)
+            response.begin()
+            assert response.status == 200
+            with pytest.raises(http.client.IncompleteRead) as excinfo:
+                response.read()
+        lines = [json.loads(line) for line in excinfo.value.partial.decode().splitlines()]
+        assert lines[:4] == [{"purl": "pkg:npm/lodash@4.17.21", "component": "lodash"}] * 4
+        assert lines[4:] == [{"error": "Timed out reading the request body"}]
+
+    def test_json_body_timeout(self, server, monkeypatch):
+        """Test that a JSON body that stops arriving gets 408."""
+        monkeypatch.setattr(_ResolverHandler, "timeout", 0.5)
+        host, port = server.server_address[:2]
+        with socket.create_connection((host, port), timeout=10) as client:
+            client.sendall(
+                b"POST /resolve HTTP/1.1\r\nHost: test\r\nContent-Type: application/json\r\n"
+                b"Content-Length: 100\r\n\r\n[\"pkg:npm/a\""
+            )
+            response = http.client.HTTPResponse(client)
+            response.begin()
+            assert response.status == 408
+            assert response.will_close
+
+    def test_keep_alive(self, connection):
+        """Test that many requests share one connection."""
+        for _ in range(3):
+            _request(connection, "POST", "/resolve", b"pkg:npm/lodash\n")
+            response, _ = _request(connection, "GET", "/health")
+            assert response.status == 200
+        assert not response.will_close
+
+    def test_body_too_large(self, server, connection):
+        """Test that oversized bodies are rejected without being read."""
+        server.max_body_size = 10
+        response, _ = _request(connection, "POST", "/resolve", b"pkg:npm/lodash@4.17.21\n")
+        assert response.status == 413
+
+    def test_concurrency_limit(self, server, connection):
+        """Test that requests beyond the limit get 503 with Retry-After."""
+        for _ in range(server.max_concurrency):
+            server.slots.acquire()
+        try:
+            response, _ = _request(connection, "POST", "/resolve", b"pkg:npm/lodash\n")
+            assert response.status == 503
+            assert response.getheader("Retry-After") == "1"
+            response, _ = _request(connection, "GET", "/health")
+            assert response.status == 200
+        finally:
+            for _ in range(server.max_concurrency):
+                server.slots.release()
+        response, _ = _request(connection, "POST", "/resolve", b"pkg:npm/lodash\n")
+        assert response.status == 200
+        assert server.metrics()["server"]["requests_rejected"] == 1
+
+    def test_concurrent_clients(self, server):
+        """Test that parallel clients all get complete, ordered responses."""
+        purls = [f"pkg:npm/pkg{i}@1" for i in range(50)]
+        body = "\n".join(purls).encode()
+        failures = []
+
+        def client():
+            host, port = server.server_address[:2]
+            connection = http.client.HTTPConnection(host, port, timeout=10)
+            try:
+                for _ in range(5):
+                    response, data = _request(connection, "POST", "/resolve", body)
+                    components = [json.loads(line).get("component") for line in data.decode().splitlines()]
+                    if response.status not in (200, 503) or (
+                        response.status == 200 and components != [f"pkg{i}" for i in range(50)]
+                    ):
+                        failures.append((response.status, data[:100]))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=client) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert failures == []
+        assert server.metrics()["server"]["requests_in_progress"] == 0
+
+    def test_metrics(self, connection):
+        """Test server, cache and resolution metrics."""
+        with recording():
+            _request(connection, "POST", "/resolve", b"pkg:npm/lodash\npkg:oci/nginx\npkg:npm/lodash\n")
+            response, body = _request(connection, "GET", "/metrics")
+        metrics = json.loads(body)
+        assert response.status == 200
+        assert metrics["server"]["purls_total"] == 3
+        assert metrics["server"]["purl_errors_total"] == 1
+        assert metrics["server"]["requests_total"] == 1
+        assert metrics["cache"]["hits"] == 1
+        assert metrics["resolution"]["counters"]["purls_total"] == 2
+
+        _, body = _request(connection, "GET", "/metrics")
+        assert json.loads(body)["resolution"] is None
+
+    def test_unknown_path(self, connection):
+        """Test 404 for unknown paths, keeping the connection usable."""
+        response, _ = _request(connection, "GET", "/nope")
+        assert response.status == 404
+        response, _ = _request(connection, "POST", "/nope", b"x")
+        assert response.status == 404
+        response, body = _request(connection, "GET", "/health")
+        assert json.loads(body) == {"status": "ok"}
+
+    @pytest.mark.parametrize("option", ["workers", "max_concurrency", "max_body_size", "chunksize"])
+    def test_invalid_options(self, option):
+        """Test that non-positive sizes are rejected before binding."""
+        with pytest.raises(ValueError, match=option):
+            ResolverServer(("127.0.0.1", 0), **{option: 0})
@@ -0,0 +1,175 @@
+"""
+Tests for sharded part files and their merge.
+"""
+
+import io
+import json
+import os
+import zlib
+
+import pytest
+from particular_purl_parse import ps_components_from_purls
+from particular_purl_parse.shards import (
+    ShardWriter,
+    manifest_file_name,
+    merge_shards,
+    part_file_name,
+    read_manifests,
+    shard_of_purl,
+)
+
+
+PURLS = [
+    "pkg:oci/nginx@1.21.0?repository_url=docker.io/library",
+    "pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx",
+    "pkg:oci/nginx@1.21.0",
+    "pkg:npm/%40scope/lodash@4.17.21",
+    "invalid",
+    "pkg:maven/org.apache/commons-lang3@3.12.0",
+    "pkg:pypi/requests@2.31.0",
+    "pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx",
+] * 5
+ERRORS = 10
+
+
+def _write(directory, shards, owned=None, **kwargs):
+    results = ps_components_from_purls(PURLS, errors="return")
+    with ShardWriter(str(directory), shards, owned, **kwargs) as writer:
+        writer.write(
+            (position, purl, result)
+            for position, (purl, result) in enumerate(zip(PURLS, results))
+            if writer.owns(purl)
+        )
+    return writer
+
+
+def _expected(jsonl=False, errors=True):
+    lines = []
+    for purl, result in zip(PURLS, ps_components_from_purls(PURLS, errors="return")):
+        if isinstance(result, ValueError):
+            if not errors:
+                continue
+            payload = {"purl": purl, "error": str(result)}
+            text = f"{purl}\t\t{result}\n"
+        else:
+            payload = {"purl": purl, "component": result}
+            text = f"{purl}\t{result}\n"
+        lines.append(json.dumps(payload) + "\n" if jsonl else text)
+    return "".join(lines)
+
+
+class TestShardOfPurl:
+    """Test cases for shard_of_purl."""
+
+    def test_stable(self):
+        """Test that shards are CRC-32 based and fixed across runs."""
+        assert shard_of_purl("pkg:npm/lodash@4.17.21", 1) == 0
+        assert shard_of_purl("pkg:npm/lodash@4.17.21", 1000) == zlib.crc32(b"pkg:npm/lodash@4.17.21") % 1000
+        shards = {shard_of_purl(purl, 4) for purl in PURLS}
+        assert shards <= {0, 1, 2, 3}
+        assert len(shards) > 1
+
+
+class TestShardWriter:
+    """Test cases for ShardWriter."""
+
+    def test_writes_parts_and_manifests(self, tmp_path):
+        """Test that every shard gets a part and a manifest with its counts and checksum."""
+        _write(tmp_path, 3)
+        manifests = read_manifests(str(tmp_path))
+        assert [manifest["shard"] for manifest in manifests] == [0, 1, 2]
+        assert sum(manifest["purls"] for manifest in manifests) == len(PURLS)
+        assert sum(manifest["errors"] for manifest in manifests) == ERRORS
+        for manifest in manifests:
+            assert manifest["file"] == part_file_name(manifest["shard"], 3)
+            assert manifest["resolved"] + manifest["errors"] == manifest["purls"] == manifest["records"]
+            data = (tmp_path / manifest["file"]).read_bytes()
+            assert len(data) == manifest["bytes"]
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    def test_skip_errors(self, tmp_path):
+        """Test that skipped errors are counted but not written."""
+        _write(tmp_path, 2, skip_errors=True)
+        manifests = read_manifests(str(tmp_path))
+        assert sum(manifest["records"] for manifest in manifests) == len(PURLS) - ERRORS
+        assert sum(manifest["errors"] for manifest in manifests) == ERRORS
+
+    def test_rejects_foreign_and_unordered_records(self, tmp_path):
+        """Test that records of other shards and decreasing positions are rejected."""
+        purl = PURLS[0]
+        shard = shard_of_purl(purl, 2)
+        writer = ShardWriter(str(tmp_path), 2, [1 - shard])
+        with pytest.raises(ValueError, match="not written here"):
+            writer.write([(0, purl, "nginx")])
+        writer.abort()
+
+        with pytest.raises(ValueError, match="Position 3 after 5"):
+            with ShardWriter(str(tmp_path), 2) as writer:
+                writer.write([(5, purl, "nginx"), (3, purl, "nginx")])
+        assert os.listdir(tmp_path) == []
+
+    def test_invalid_arguments(self, tmp_path):
+        """Test that bad shard counts, owned shards and formats are rejected."""
+        with pytest.raises(ValueError, match="shards must be positive"):
+            ShardWriter(str(tmp_path), 0)
+        with pytest.raises(ValueError, match="out of range"):
+            ShardWriter(str(tmp_path), 2, [2])
+        with pytest.raises(ValueError, match="Unknown format"):
+            ShardWriter(str(tmp_path), 2, format="csv")
+
+
+class TestMergeShards:
+    """Test cases for merge_shards."""
+
+    @pytest.mark.parametrize("format", ["tsv", "jsonl"])
+    def test_merge_restores_input_order(self, tmp_path, format):
+        """Test that parts written separately merge into the single-process output."""
+        for shard in range(4):
+            _write(tmp_path, 4, [shard], format=format)
+        output = io.StringIO()
+        totals = merge_shards(str(tmp_path), output)
+        assert output.getvalue() == _expected(jsonl=format == "jsonl")
+        assert totals == {"shards": 4, "records": len(PURLS), "purls": len(PURLS), "resolved": len(PURLS) - ERRORS, "errors": ERRORS}
+
+    def test_error_output_and_skip(self, tmp_path):
+        """Test that errors can go to their own stream or be dropped."""
+        _write(tmp_path, 2)
+        output, errors = io.StringIO(), io.StringIO()
+        merge_shards(str(tmp_path), output, errors)
+        assert output.getvalue() == _expected(errors=False)
+        assert errors.getvalue().count("\n") == ERRORS
+
+        output = io.StringIO()
+        merge_shards(str(tmp_path), output, skip_errors=True)
+        assert output.getvalue() == _expected(errors=False)
+
+    def test_missing_shard(self, tmp_path):
+        """Test that an incomplete job is rejected before writing anything."""
+        _write(tmp_path, 3, [0, 2])
+        output = io.StringIO()
+        with pytest.raises(ValueError, match="Missing shards 1 of 3"):
+            merge_shards(str(tmp_path), output)
+        assert output.getvalue() == ""
+
+    def test_no_manifests(self, tmp_path):
+        """Test that a directory without manifests is rejected."""
+        with pytest.raises(ValueError, match="No shard manifests"):
+            merge_shards(str(tmp_path), io.StringIO())
+
+    def test_inconsistent_manifests(self, tmp_path):
+        """Test that parts of jobs with different shard counts are not mixed."""
+        _write(tmp_path, 2)
+        manifest = json.loads((tmp_path / manifest_file_name(0, 2)).read_text(encoding="utf-8"))
+        manifest.update(shard=2, shards=3)
+        (tmp_path / manifest_file_name(2, 3)).write_text(json.dumps(manifest), encoding="utf-8")
+        with pytest.raises(ValueError, match="disagree on shards"):
+            merge_shards(str(tmp_path), io.StringIO())
+
+    def test_corrupt_part(self, tmp_path):
+        """Test that a part changed after its manifest was written is detected."""
+        _write(tmp_path, 2)
+        path = tmp_path / part_file_name(1, 2)
+        data = path.read_bytes()
+        path.write_bytes(data.replace(b"nginx", b"nginX", 1))
+        with pytest.raises(ValueError, match="does not match its manifest"):
+            merge_shards(str(tmp_path), io.StringIO())
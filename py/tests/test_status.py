@@ -0,0 +1,243 @@
+"""
+Tests for status-code validation of PURLs.
+"""
+
+import pytest
+from benchmarks.corpus import generate_corpus
+from particular_purl_parse import core, status
+from particular_purl_parse.core import ps_component_from_purl, ps_components_from_purls
+from particular_purl_parse.rules import (
+    MissingRepositoryURLError,
+    RuleError,
+    namespace_rule,
+    oci_repository_rule,
+    register_rule,
+)
+from particular_purl_parse.status import (
+    STATUS_INVALID_FORMAT,
+    STATUS_INVALID_INPUT,
+    STATUS_INVALID_REPOSITORY_URL,
+    STATUS_MISSING_REPOSITORY_URL,
+    STATUS_NAMES,
+    STATUS_OK,
+    STATUS_RULE_FAILED,
+    ps_component_batch_from_purls,
+    ps_purl_status,
+    ps_purl_statuses,
+)
+
+
+class TestPsPurlStatus:
+    """Test cases for ps_purl_status."""
+
+    @pytest.mark.parametrize(
+        "purl,status",
+        [
+            ("pkg:oci/nginx@1.21.0?repository_url=docker.io/library", STATUS_OK),
+            ("pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx", STATUS_OK),
+            ("pkg:npm/@angular/core@14.0.0", STATUS_OK),
+            ("", STATUS_INVALID_INPUT),
+            (None, STATUS_INVALID_INPUT),
+            (123, STATUS_INVALID_INPUT),
+            ("invalid-purl", STATUS_INVALID_FORMAT),
+            ("pkg:npm/lodash@4.17.21?arch", STATUS_INVALID_FORMAT),
+            ("pkg:oci/nginx@1.21.0", STATUS_MISSING_REPOSITORY_URL),
+            ("pkg:oci/nginx@1.21.0?repository_url=", STATUS_MISSING_REPOSITORY_URL),
+            ("pkg:oci/nginx@1.21.0?repository_url=docker.io", STATUS_INVALID_REPOSITORY_URL),
+        ],
+    )
+    def test_status(self, purl, status):
+        """Test the status code for each outcome."""
+        assert ps_purl_status(purl) == status
+
+    @pytest.mark.parametrize(
+        "purl",
+        [
+            "pkg:oci/nginx@1.21.0?repository_url=docker.io/library",
+            "pkg:oci/nginx@1.21.0?repository_url=docker.io",
+            "pkg:oci/nginx@1.21.0?repository_url=docker.io%2F",
+            "pkg:oci/nginx@1.21.0",
+            "pkg:rpm/redhat/nginx@1.21.0?rpmmod=&arch=x86_64",
+            "pkg:pub/flutter@3.0.0",
+            "pkg:generic/my%2Fpackage@1.0",
+            "pkg://npm/lodash@4.17.21",
+        ],
+    )
+    def test_agrees_with_resolution(self, purl):
+        """Test that status OK exactly when ps_component_from_purl succeeds."""
+        try:
+            ps_component_from_purl(purl)
+            resolved = True
+        except ValueError:
+            resolved = False
+        assert (ps_purl_status(purl) == STATUS_OK) is resolved
+
+    def test_registered_rules(self, restore_rules):
+        """Test that registered rules are honoured."""
+        def failing_rule(fields):
+            raise ValueError("unsupported")
+
+        register_rule("maven", namespace_rule)
+        register_rule("golang", failing_rule)
+        register_rule("oci", oci_repository_rule(2), replace=True)
+        assert ps_purl_status("pkg:maven/org.example/lib@1.0") == STATUS_OK
+        assert ps_purl_status("pkg:golang/github.com/gorilla/mux") == STATUS_RULE_FAILED
+        assert ps_purl_status("pkg:oci/nginx?repository_url=docker.io/library") == STATUS_INVALID_REPOSITORY_URL
+        assert ps_purl_status("pkg:oci/nginx?repository_url=docker.io/library/nginx") == STATUS_OK
+
+    def test_replaced_oci_rule_reports_its_own_errors(self, restore_rules):
+        """Test that the status of a replaced oci rule comes from the error it raises."""
+        def strict_rule(fields):
+            raise ValueError("unsupported registry")
+
+        register_rule("oci", oci_repository_rule(2), replace=True)
+        assert ps_purl_status("pkg:oci/nginx") == STATUS_MISSING_REPOSITORY_URL
+        register_rule("oci", strict_rule, replace=True)
+        assert ps_purl_status("pkg:oci/nginx") == STATUS_RULE_FAILED
+        assert ps_purl_status("pkg:oci/nginx?repository_url=docker.io") == STATUS_RULE_FAILED
+        batch = ps_component_batch_from_purls(["pkg:oci/nginx?repository_url=docker.io/library"])
+        assert list(batch.errors()) == [(0, STATUS_RULE_FAILED)]
+
+    def test_rule_error_status(self, restore_rules):
+        """Test that rules for other types choose their status with RuleError subclasses."""
+        def conan_rule(fields):
+            if not fields[4]:
+                raise MissingRepositoryURLError("conan needs a remote")
+            raise RuleError("unsupported remote")
+
+        register_rule("conan", conan_rule)
+        assert ps_purl_status("pkg:conan/zlib@1.2") == STATUS_MISSING_REPOSITORY_URL
+        assert ps_purl_status("pkg:conan/zlib@1.2?repository_url=a/b") == STATUS_RULE_FAILED
+
+    @pytest.mark.parametrize("repository_url", [None, "", "docker.io", "docker.io/", "a/b", "a/b/c", "/a", "//"])
+    def test_inline_oci_rule_matches_core(self, repository_url):
+        """Test that the inline check of the built-in oci rule agrees with core._oci_prefix."""
+        try:
+            expected = core._oci_prefix(repository_url)
+        except ValueError as e:
+            expected = status._error_status(e)
+        assert status._oci_prefix_or_status(repository_url) == expected
+
+    def test_no_exceptions_on_fast_path(self, monkeypatch):
+        """Test that scanned PURLs are classified without calling the full parser."""
+        def fail(purl):
+            raise AssertionError("full parse")
+
+        monkeypatch.setattr(core, "_parse_purl_fields", fail)
+        assert ps_purl_status("pkg:oci/nginx@1.21.0") == STATUS_MISSING_REPOSITORY_URL
+        assert ps_purl_status("pkg:npm/lodash@4.17.21") == STATUS_OK
+
+
+class TestPsPurlStatuses:
+    """Test cases for ps_purl_statuses."""
+
+    def test_batch(self):
+        """Test one compact status code per input."""
+        statuses = ps_purl_statuses([
+            "pkg:npm/lodash@4.17.21",
+            "",
+            "invalid-purl",
+            "pkg:oci/nginx@1.21.0",
+            "pkg:oci/nginx@1.21.0?repository_url=docker.io",
+        ])
+        assert statuses.typecode == "b"
+        assert list(statuses) == [0, 1, 2, 3, 4]
+        assert [STATUS_NAMES[status] for status in statuses][3] == "missing_repository_url"
+
+    def test_empty(self):
+        """Test an empty batch."""
+        assert len(ps_purl_statuses([])) == 0
+
+
+class TestPsComponentBatchFromPurls:
+    """Test cases for ps_component_batch_from_purls."""
+
+    PURLS = [
+        "pkg:oci/nginx@1.21.0?repository_url=docker.io/library",
+        "nginx@1.21.0",
+        "pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx",
+        "pkg:oci/nginx@1.21.0",
+        None,
+        "pkg:/nginx",
+        "pkg:oci/nginx@1.21.0?repository_url=docker.io",
+    ]
+
+    def test_components_and_error_codes(self):
+        """Test components with None gaps and parallel offset/code arrays."""
+        batch = ps_component_batch_from_purls(self.PURLS)
+        assert batch.components == ["library/nginx", None, "nginx/nginx", None, None, None, None]
+        assert batch.error_offsets.typecode == "i"
+        assert batch.error_codes.typecode == "b"
+        assert list(batch.errors()) == [
+            (1, STATUS_INVALID_FORMAT),
+            (3, STATUS_MISSING_REPOSITORY_URL),
+            (4, STATUS_INVALID_INPUT),
+            (5, STATUS_INVALID_FORMAT),
+            (6, STATUS_INVALID_REPOSITORY_URL),
+        ]
+        assert len(batch) == len(self.PURLS)
+
+    def test_summary(self):
+        """Test that the summary counts every status name."""
+        summary = ps_component_batch_from_purls(self.PURLS).summary()
+        assert summary == {
+            "total": 7,
+            "ok": 2,
+            "invalid_input": 1,
+            "invalid_format": 2,
+            "missing_repository_url": 1,
+            "invalid_repository_url": 1,
+            "rule_failed": 0,
+        }
+
+    def test_report(self):
+        """Test the text report, with and without the inputs."""
+        batch = ps_component_batch_from_purls(self.PURLS)
+        report = batch.report(self.PURLS, examples=1)
+        assert report.splitlines()[:3] == [
+            "7 PURLs: 2 resolved, 5 failed (71.4%)",
+            "  invalid_input: 1",
+            "    #4: None",
+        ]
+        assert "    #1: 'nginx@1.21.0'" in report
+        assert "#5" not in report
+        assert "    #5" in batch.report()
+        assert ps_component_batch_from_purls([]).report() == "0 PURLs: 0 resolved, 0 failed (0.0%)"
+
+    def test_matches_batch_api(self):
+        """Test agreement with ps_components_from_purls and ps_purl_status on a corpus."""
+        corpus = generate_corpus(3000, seed=5) + self.PURLS
+        batch = ps_component_batch_from_purls(corpus)
+        results = ps_components_from_purls(corpus, errors="return")
+        assert batch.components == [result if isinstance(result, str) else None for result in results]
+        assert dict(batch.errors()) == {
+            offset: ps_purl_status(purl) for offset, purl in enumerate(corpus) if ps_purl_status(purl)
+        }
+
+    def test_custom_rules(self, restore_rules):
+        """Test that registered rules build components and report rule failures."""
+        def failing_rule(fields):
+            raise ValueError("unsupported")
+
+        register_rule("maven", namespace_rule)
+        register_rule("golang", failing_rule)
+        batch = ps_component_batch_from_purls(["pkg:maven/org.example/lib@1.0", "pkg:golang/github.com/gorilla/mux"])
+        assert batch.components == ["org.example/lib", None]
+        assert list(batch.errors()) == [(1, STATUS_RULE_FAILED)]
+
+    def test_single_call_still_raises(self):
+        """Test that ps_component_from_purl keeps raising ValueError."""
+        with pytest.raises(ValueError, match="Invalid PURL format"):
+            ps_component_from_purl("nginx@1.21.0")
+
+    @pytest.mark.parametrize(
+        "purl",
+        ["nginx", "PKG:npm/a", " pkg:npm/a", "pkg:/a", "pkg:a", "pkg:///a", "pkg:npm/a", "pkg://npm/a", "pkg: npm/a"],
+    )
+    def test_precheck_agrees_with_packageurl(self, purl):
+        """Test that PURLs rejected before parsing are rejected by packageurl too."""
+        from packageurl import PackageURL
+
+        if status._lacks_scheme_or_type(purl):
+            with pytest.raises(ValueError):
+                PackageURL.from_string(purl)
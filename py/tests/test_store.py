@@ -0,0 +1,222 @@
+"""
+Tests for the persistent component store.
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+from importlib import metadata
+
+import pytest
+from particular_purl_parse.core import ps_components_from_purls
+from particular_purl_parse.rules import namespace_rule, oci_repository_rule, register_rule
+from particular_purl_parse.store import ComponentStore, extraction_fingerprint
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    """Path of a fresh store database."""
+    return tmp_path / "components.sqlite"
+
+
+@pytest.fixture
+def mixed_purls():
+    """Valid, invalid and repeated PURLs."""
+    return [
+        "pkg:oci/nginx@1.21.0?repository_url=docker.io/library",
+        "pkg:oci/nginx@1.21.0",
+        "pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx",
+        "pkg:npm/lodash@4.17.21",
+        "pkg:npm/lodash@4.17.21",
+    ]
+
+
+class TestComponentStore:
+    """Test cases for ComponentStore."""
+
+    def test_resolve_many_matches_batch(self, store_path, mixed_purls):
+        """Test that results equal ps_components_from_purls for every policy."""
+        with ComponentStore(store_path) as store:
+            for errors in ("return", "skip"):
+                expected = ps_components_from_purls(mixed_purls, errors=errors)
+                actual = store.resolve_many(mixed_purls, errors=errors)
+                assert [str(item) for item in actual] == [str(item) for item in expected]
+                assert [type(item) for item in actual] == [type(item) for item in expected]
+
+    def test_raise_policy(self, store_path, mixed_purls):
+        """Test that the default policy raises the first error."""
+        with ComponentStore(store_path) as store:
+            with pytest.raises(ValueError, match="Missing repository_url"):
+                store.resolve_many(mixed_purls)
+            assert store.resolve_many(mixed_purls[2:]) == ["nginx/nginx", "lodash", "lodash"]
+
+    def test_only_new_purls_are_parsed(self, store_path, mixed_purls, monkeypatch):
+        """Test that a second run reads everything from disk."""
+        with ComponentStore(store_path) as store:
+            store.resolve_many(mixed_purls, errors="return")
+            assert (store.hits, store.misses) == (0, 5)
+            assert len(store) == 4
+
+        def fail(*args, **kwargs):
+            raise AssertionError("should not parse")
+
+        monkeypatch.setattr("particular_purl_parse.store.ps_components_from_purls", fail)
+        with ComponentStore(store_path) as store:
+            results = store.resolve_many(mixed_purls, errors="return")
+            assert store.hits == 5
+        assert results[0] == "library/nginx"
+        assert isinstance(results[1], ValueError)
+        assert str(results[1]) == "Missing repository_url in OCI PURL"
+
+    def test_resolve_missing(self, store_path):
+        """Test a custom batch resolver for the misses."""
+        calls = []
+
+        def resolve_missing(purls):
+            calls.append(purls)
+            return ps_components_from_purls(purls, errors="return")
+
+        with ComponentStore(store_path) as store:
+            purls = ["pkg:npm/a@1", "pkg:npm/b@1", "pkg:npm/a@1"]
+            assert store.resolve_many(purls, resolve_missing=resolve_missing) == ["a", "b", "a"]
+            store.resolve_many(purls, resolve_missing=resolve_missing)
+        assert calls == [["pkg:npm/a@1", "pkg:npm/b@1"]]
+
+    def test_bulk_lookup_and_store(self, store_path):
+        """Test bulk lookups beyond one SQL chunk."""
+        purls = [f"pkg:npm/package-{i}@1.0" for i in range(1200)]
+        with ComponentStore(store_path) as store:
+            assert store.lookup_many(purls) == {}
+            store.store_many((purl, purl[8:-4]) for purl in purls)
+            found = store.lookup_many(purls + ["pkg:npm/other@1.0", "", None])
+        assert len(found) == 1200
+        assert found["pkg:npm/package-1199@1.0"] == "package-1199"
+
+    def test_invalid_inputs_are_not_stored(self, store_path):
+        """Test that non-string or empty inputs are resolved but never stored."""
+        with ComponentStore(store_path) as store:
+            results = store.resolve_many(["", None, "pkg:npm/a@1"], errors="return")
+            assert [str(item) for item in results] == [
+                "PURL must be a non-empty string", "PURL must be a non-empty string", "a"
+            ]
+            assert len(store) == 1
+
+    def test_invalid_policy(self, store_path):
+        """Test that unknown error policies are rejected."""
+        with ComponentStore(store_path) as store:
+            with pytest.raises(ValueError, match="Invalid errors policy"):
+                store.resolve_many([], errors="ignore")
+
+    def test_concurrent_reader(self, store_path, mixed_purls):
+        """Test that a second connection reads while the first is open."""
+        with ComponentStore(store_path) as writer, ComponentStore(store_path) as reader:
+            writer.resolve_many(mixed_purls, errors="return")
+            assert len(reader.lookup_many(mixed_purls)) == 4
+        journal = sqlite3.connect(str(store_path)).execute("PRAGMA journal_mode").fetchone()[0]
+        assert journal == "wal"
+
+
+class TestInvalidation:
+    """Test cases for fingerprint-based invalidation."""
+
+    def test_fingerprint_is_stable(self):
+        """Test that the fingerprint does not change between calls."""
+        assert extraction_fingerprint() == extraction_fingerprint()
+
+    def test_rule_changes_invalidate(self, store_path, restore_rules):
+        """Test that registering rules changes the fingerprint and isolates entries."""
+        purl = "pkg:maven/org.example/lib@1.0"
+        with ComponentStore(store_path) as store:
+            assert store.resolve_many([purl]) == ["lib"]
+            before = store.fingerprint
+
+        register_rule("maven", namespace_rule)
+        with ComponentStore(store_path) as store:
+            assert store.fingerprint != before
+            assert store.resolve_many([purl]) == ["org.example/lib"]
+            assert store.misses == 1
+            assert store.prune() == 1
+            assert len(store) == 1
+
+    def test_rule_parameters_change_fingerprint(self, restore_rules):
+        """Test that parameterized rules are told apart by their closure values."""
+        register_rule("oci", oci_repository_rule(2), replace=True)
+        second = extraction_fingerprint()
+        register_rule("oci", oci_repository_rule(3), replace=True)
+        assert extraction_fingerprint() != second
+        register_rule("oci", oci_repository_rule(2), replace=True)
+        assert extraction_fingerprint() == second
+
+    def test_rule_edits_change_fingerprint(self, restore_rules):
+        """Test that editing the body of a registered rule changes the fingerprint."""
+
+        def rule(fields):
+            return "namespace", fields[1]
+
+        def edited(fields):
+            return "namespace", fields[1].upper()
+
+        register_rule("maven", rule)
+        before = extraction_fingerprint()
+        rule.__code__ = edited.__code__
+        assert extraction_fingerprint() != before
+
+    def test_nested_code_changes_fingerprint(self, restore_rules):
+        """Test that the constants and nested functions of a rule are covered."""
+
+        def build(suffix):
+            def rule(fields):
+                def prefix(namespace):
+                    return namespace + suffix
+
+                return "namespace", prefix(fields[1])
+
+            return rule
+
+        register_rule("maven", build("-a"))
+        before = extraction_fingerprint()
+        register_rule("maven", build("-b"), replace=True)
+        assert extraction_fingerprint() != before
+
+    def test_fingerprint_ignores_hash_seed(self):
+        """Test that set constants of a rule do not make the fingerprint vary between runs."""
+        script = (
+            "from particular_purl_parse.rules import register_rule\n"
+            "from particular_purl_parse.store import extraction_fingerprint\n"
+            "register_rule('maven', lambda fields: ('none', None) if fields[1] in {'a', 'b', 'c', 'd'} "
+            "else ('namespace', fields[1]))\n"
+            "print(extraction_fingerprint())\n"
+        )
+        fingerprints = set()
+        for seed in ("1", "2", "3"):
+            env = {**os.environ, "PYTHONHASHSEED": seed, "PYTHONPATH": os.pathsep.join(sys.path)}
+            fingerprints.add(
+                subprocess.run(
+                    [sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True
+                ).stdout
+            )
+        assert len(fingerprints) == 1
+
+    def test_dependency_version_invalidates(self, store_path, monkeypatch):
+        """Test that another packageurl-python version changes the fingerprint and isolates entries."""
+        with ComponentStore(store_path) as store:
+            store.resolve_many(["pkg:npm/a@1"])
+            before = store.fingerprint
+
+        version = metadata.version
+        monkeypatch.setattr(
+            metadata, "version", lambda name: "999.0" if name == "packageurl-python" else version(name)
+        )
+        with ComponentStore(store_path) as store:
+            assert store.fingerprint != before
+            assert store.resolve_many(["pkg:npm/a@1"]) == ["a"]
+            assert store.misses == 1
+
+    def test_explicit_fingerprint_and_clear(self, store_path):
+        """Test opening a store under a given fingerprint and clearing it."""
+        with ComponentStore(store_path, fingerprint="v1") as store:
+            store.resolve_many(["pkg:npm/a@1"])
+            assert len(store) == 1
+            store.clear()
+            assert len(store) == 0
@@ -0,0 +1,83 @@
+"""
+Tests for deduplicated component tables and interning.
+"""
+
+import pytest
+from particular_purl_parse.core import ps_components_from_purls
+from particular_purl_parse.parallel import ParallelResolver
+from particular_purl_parse.table import NO_COMPONENT, ComponentTable, ps_component_table_from_purls
+
+
+@pytest.fixture
+def repeated_purls():
+    """PURLs where several inputs resolve to the same component."""
+    return [
+        "pkg:rpm/redhat/nginx@1.20.0?rpmmod=nginx",
+        "pkg:npm/lodash@4.17.21",
+        "pkg:rpm/redhat/nginx@1.21.0?rpmmod=nginx&arch=x86_64",
+        "pkg:oci/nginx@1.21.0",
+        "pkg:npm/lodash@4.17.20",
+        "pkg:rpm/centos/nginx@1.22.0?rpmmod=nginx",
+    ]
+
+
+class TestPsComponentTableFromPurls:
+    """Test cases for ps_component_table_from_purls."""
+
+    def test_deduplicates(self, repeated_purls):
+        """Test that each component is stored once, with per-input indices."""
+        table = ps_component_table_from_purls(repeated_purls, errors="skip")
+        assert table.components == ["nginx/nginx", "lodash"]
+        assert list(table.indices) == [0, 1, 0, NO_COMPONENT, 1, 0]
+        assert table.indices.typecode == "i"
+        assert table.errors == {}
+        assert len(table) == 6
+        assert table[2] == "nginx/nginx"
+        assert table[3] is None
+
+    def test_counts(self, repeated_purls):
+        """Test per-component counts on the integer indices."""
+        assert ps_component_table_from_purls(repeated_purls, errors="skip").counts() == [3, 2]
+
+    def test_return_policy(self, repeated_purls):
+        """Test that errors are recorded by input position."""
+        table = ps_component_table_from_purls(repeated_purls, errors="return")
+        assert list(table.errors) == [3]
+        assert str(table.errors[3]) == "Missing repository_url in OCI PURL"
+        expanded = table.to_list()
+        expected = ps_components_from_purls(repeated_purls, errors="return")
+        assert [str(item) for item in expanded] == [str(item) for item in expected]
+
+    def test_raise_policy(self, repeated_purls):
+        """Test that the default policy raises on the first error."""
+        with pytest.raises(ValueError, match="Missing repository_url"):
+            ps_component_table_from_purls(repeated_purls)
+
+    def test_empty(self):
+        """Test an empty input."""
+        table = ps_component_table_from_purls([])
+        assert isinstance(table, ComponentTable)
+        assert len(table) == 0
+        assert table.components == []
+
+
+class TestInterning:
+    """Test cases for the intern option of the batch paths."""
+
+    def test_batch_interns_components(self, repeated_purls):
+        """Test that equal components share one object, across calls too."""
+        first = ps_components_from_purls(repeated_purls, errors="skip", intern=True)
+        second = ps_components_from_purls(repeated_purls[:1], intern=True)
+        assert first[0] is first[2] is first[4] is second[0]
+
+    def test_errors_are_untouched(self, repeated_purls):
+        """Test that interning leaves returned errors in place."""
+        result = ps_components_from_purls(repeated_purls, errors="return", intern=True)
+        assert isinstance(result[3], ValueError)
+
+    def test_parallel_interns_across_chunks(self, repeated_purls):
+        """Test that results from different worker chunks are shared."""
+        purls = [purl for purl in repeated_purls if "oci" not in purl] * 3
+        with ParallelResolver(workers=2, chunksize=2) as resolver:
+            result = resolver.resolve(purls, intern=True)
+        assert len({id(component) for component in result}) == 2